@@ -1,34 +1,62 @@
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 from typing import List, Dict, Any, Optional
+import asyncio
 import json
 
+from app.core.record_store import get_record_store
+
 router = APIRouter()
 
+class RecordSlice(BaseModel):
+    """Selects stored records to analyze instead of sending them in the request."""
+    record_types: Optional[List[str]] = None
+    source: Optional[str] = None
+    date_from: Optional[str] = None
+    date_to: Optional[str] = None
+    limit: Optional[int] = 1000
+
 class DataSummaryRequest(BaseModel):
-    data: Dict[str, Any]
+    data: Dict[str, Any] = {}
     summary_type: Optional[str] = "general"
     max_length: Optional[int] = 200
+    records: Optional[RecordSlice] = None
 
 class InsightRequest(BaseModel):
     dataset: Dict[str, Any]
     analysis_type: Optional[str] = "trends"
 
 class PatternRequest(BaseModel):
-    data: List[Dict[str, Any]]
+    data: List[Dict[str, Any]] = []
     pattern_type: Optional[str] = "temporal"
+    records: Optional[RecordSlice] = None
 
 class AnalysisResponse(BaseModel):
     result: str
     confidence: float
     metadata: Dict[str, Any]
 
+def load_record_slice(selection: RecordSlice) -> List[Dict[str, Any]]:
+    """Query the selected slice of processed records from the record store."""
+    return get_record_store().query(
+        types=selection.record_types,
+        source=selection.source,
+        date_from=selection.date_from,
+        date_to=selection.date_to,
+        limit=selection.limit,
+    )
+
 @router.post("/summarize", response_model=AnalysisResponse)
 async def summarize_data(request: DataSummaryRequest):
-    """Generate AI-powered summaries of space data."""
+    """Generate AI-powered summaries of space data (sent inline or selected from the record store)."""
     try:
+        data = request.data
+        if request.records is not None:
+            records = await asyncio.to_thread(load_record_slice, request.records)
+            data = {record["id"]: record for record in records}
+        
         # Placeholder implementation - will be replaced with actual AI logic
-        summary = f"This dataset contains {len(request.data)} data points related to space exploration. "
+        summary = f"This dataset contains {len(data)} data points related to space exploration. "
         summary += "Key findings include various metrics and measurements that provide insights into space missions and celestial observations."
         
         return AnalysisResponse(
@@ -36,7 +64,7 @@ async def summarize_data(request: DataSummaryRequest):
             confidence=0.85,
             metadata={
                 "summary_type": request.summary_type,
-                "data_points": len(request.data),
+                "data_points": len(data),
                 "processing_time": "0.5s"
             }
         )
@@ -66,10 +94,14 @@ async def extract_insights(request: InsightRequest):
 
 @router.post("/patterns", response_model=AnalysisResponse)
 async def identify_patterns(request: PatternRequest):
-    """Identify patterns in space data using AI/ML techniques."""
+    """Identify patterns in space data (sent inline or selected from the record store) using AI/ML techniques."""
     try:
+        data = request.data
+        if request.records is not None:
+            data = await asyncio.to_thread(load_record_slice, request.records)
+        
         # Placeholder implementation
-        patterns = f"Analysis of {len(request.data)} data points reveals recurring patterns. "
+        patterns = f"Analysis of {len(data)} data points reveals recurring patterns. "
         patterns += "Temporal analysis shows cyclical trends with peak activity during specific periods. "
         patterns += "Statistical patterns indicate correlations between mission success and various factors."
         
@@ -78,7 +110,7 @@ async def identify_patterns(request: PatternRequest):
             confidence=0.72,
             metadata={
                 "pattern_type": request.pattern_type,
-                "data_points": len(request.data),
+                "data_points": len(data),
                 "patterns_found": 5
             }
         )
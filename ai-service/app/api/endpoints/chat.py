@@ -4,9 +4,11 @@ from typing import List, Dict, Any, Optional, Tuple
 import asyncio
 import json
 import os
-import aiohttp
 from datetime import datetime
 
+from app.core.http_client import get_http_client
+from app.core.record_store import get_record_store
+
 router = APIRouter()
 
 class ChatMessage(BaseModel):
@@ -67,11 +69,11 @@ async def chat_with_trained_model(request: ChatRequest, model_id: str = "space_m
     try:
         # Import training components
         from app.core.model_trainer import SpaceModelTrainer
-        from app.core.vector_embeddings import VectorEmbeddingManager
+        from app.core.retrieval import get_retrieval_service
         
-        # Initialize components
+        # Initialize components (the retrieval service keeps the model and embeddings loaded)
         model_trainer = SpaceModelTrainer()
-        embedding_manager = VectorEmbeddingManager()
+        retrieval = get_retrieval_service()
         
         # Check if model exists
         model_info = model_trainer.load_trained_model(model_id)
@@ -81,10 +83,10 @@ async def chat_with_trained_model(request: ChatRequest, model_id: str = "space_m
         user_message = request.message
         
         # Try vector search first
-        embeddings_loaded = embedding_manager.load_embeddings()
+        embeddings_loaded = await retrieval.refresh()
         
         if embeddings_loaded:
-            similar_docs = embedding_manager.search_similar(user_message, top_k=3)
+            similar_docs = await retrieval.search(user_message, top_k=3)
             
             if similar_docs and similar_docs[0]['similarity'] > 0.3:  # Good similarity threshold
                 best_match = similar_docs[0]
@@ -262,35 +264,63 @@ async def try_real_data_response(user_message: str) -> Optional[Tuple[str, float
         print(f"Real data fetch failed: {e}")
         return None
 
+def load_stored_training_data(group: str, types: List[str], per_type: int = 5) -> Optional[Dict]:
+    """Read the newest records of each type from the record store, if anything has been ingested."""
+    from app.api.endpoints.data_ingestion import calculate_data_quality
+    
+    try:
+        store = get_record_store()
+        total_records = store.count(group=group)
+        if total_records == 0:
+            return None
+        sample_data = [
+            record for record_type in types
+            for record in store.query(group=group, types=[record_type], newest_first=True, limit=per_type)
+        ]
+        return {
+            "total_records": total_records,
+            "sample_data": sample_data,
+            "data_quality_score": calculate_data_quality(sample_data),
+        }
+    except Exception as e:
+        print(f"Record store read failed: {e}")
+        return None
+
 async def fetch_spacex_training_data() -> Optional[Dict]:
-    """Fetch SpaceX data from training endpoint."""
+    """Fetch SpaceX data from the record store, falling back to the training endpoint."""
+    stored = await asyncio.to_thread(load_stored_training_data, "spacex", ["launch", "rocket"])
+    if stored:
+        return stored
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.post(
-                "http://localhost:8001/api/training/ingest-spacex-data",
-                json={"sources": ["spacex"], "data_types": ["launches", "rockets"]}
-            ) as response:
-                if response.status == 200:
-                    return await response.json()
+        session = await get_http_client().session()
+        async with session.post(
+            "http://localhost:8001/api/training/ingest-spacex-data",
+            json={"sources": ["spacex"], "data_types": ["launches", "rockets"]}
+        ) as response:
+            if response.status == 200:
+                return await response.json()
         return None
     except Exception:
         return None
 
 async def fetch_nasa_training_data() -> Optional[Dict]:
-    """Fetch NASA data from training endpoint with fallback."""
+    """Fetch NASA data from the record store, falling back to the training endpoint and mock data."""
+    stored = await asyncio.to_thread(load_stored_training_data, "nasa", ["apod", "neo", "mars_photo", "exoplanet"])
+    if stored:
+        return stored
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.post(
-                "http://localhost:8001/api/training/ingest-nasa-data",
-                json={"sources": ["nasa"], "data_types": ["apod", "neo", "mars"]}
-            ) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    # If we get real data, return it
-                    if data.get("total_records", 0) > 0:
-                        return data
-                    # If no records (API rate limit), return mock data
-                    return get_mock_nasa_data()
+        session = await get_http_client().session()
+        async with session.post(
+            "http://localhost:8001/api/training/ingest-nasa-data",
+            json={"sources": ["nasa"], "data_types": ["apod", "neo", "mars"]}
+        ) as response:
+            if response.status == 200:
+                data = await response.json()
+                # If we get real data, return it
+                if data.get("total_records", 0) > 0:
+                    return data
+                # If no records (API rate limit), return mock data
+                return get_mock_nasa_data()
         return get_mock_nasa_data()
     except Exception:
         return get_mock_nasa_data()
@@ -1,32 +1,82 @@
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, AsyncIterator
 import asyncio
-import aiohttp
 import pandas as pd
-from datetime import datetime
+from collections import deque
+from datetime import datetime, timedelta
 import json
+import math
+import os
+
+from app.core.data_quality import DataQualityProfiler
+from app.core.exoplanet_loader import ExoplanetBulkLoader, exoplanet_records
+from app.core.fanout import fetch_sources
+from app.core.http_client import get_http_client
+from app.core.mars_crawler import MarsPhotoCrawler
+from app.core.normalization import NASA_NORMALIZER, SPACEX_NORMALIZER
+from app.core.pipeline import get_pipeline_stats
+from app.core.techport_crawler import TechPortCrawler
 
 router = APIRouter()
 
 # NASA API Configuration
-NASA_API_KEY = "DEMO_KEY"  # Use DEMO_KEY for testing, get real key from https://api.nasa.gov/
-NASA_BASE_URL = "https://api.nasa.gov"
+NASA_API_KEY = os.getenv("NASA_API_KEY", "DEMO_KEY")  # DEMO_KEY for testing, get real key from https://api.nasa.gov/
+NASA_BASE_URL = os.getenv("NASA_BASE_URL", "https://api.nasa.gov")
 
 # SpaceX API Configuration  
-SPACEX_BASE_URL = "https://api.spacexdata.com/v4"
+SPACEX_BASE_URL = os.getenv("SPACEX_BASE_URL", "https://api.spacexdata.com/v4")
+SPACEX_PAGE_SIZE = int(os.getenv("SPACEX_PAGE_SIZE", 100))
+SPACEX_QUERY_CONCURRENCY = int(os.getenv("SPACEX_QUERY_CONCURRENCY", 4))
+
+# Marks the end of a prefetched /query page
+_PAGE_END = object()
+
+# Server-side projections for the v4 query API: only the fields our record
+# mappers and process_spacex_data read are sent over the wire
+SPACEX_SELECTS = {
+    "launches": ["name", "date_utc", "success", "details", "rocket", "payloads", "flight_number", "upcoming"],
+    "rockets": ["name", "description", "height", "diameter", "mass", "cost_per_launch", "success_rate_pct"],
+    "capsules": ["serial", "status", "type", "reuse_count", "water_landings", "land_landings"],
+    "crew": ["name", "agency", "status", "launches"],
+    "payloads": ["name", "type", "mass_kg", "orbit", "customers", "manufacturers", "norad_ids"],
+    "starlink": [
+        "spaceTrack.EPOCH", "spaceTrack.OBJECT_NAME", "spaceTrack.NORAD_CAT_ID", "spaceTrack.LAUNCH_DATE",
+        "height_km", "velocity_kms", "longitude", "latitude",
+    ],
+}
 
 class DataIngestionRequest(BaseModel):
     sources: List[str]  # ["nasa", "spacex", "faa"]
-    date_range: Optional[Dict[str, str]] = None
+    date_range: Optional[Dict[str, str]] = None  # {"start": "YYYY-MM-DD", "end": "YYYY-MM-DD"}, either optional
     data_types: Optional[List[str]] = None
 
+class TechPortCrawlRequest(BaseModel):
+    max_projects: Optional[int] = None  # None crawls the whole project list
+    resume: bool = True
+    updated_since: Optional[str] = None  # YYYY-MM-DD
+    concurrency: int = 8
+
+class MarsCrawlRequest(BaseModel):
+    rovers: List[str] = ["curiosity"]  # curiosity, opportunity, spirit, perseverance
+    sol_start: int = 1000
+    sol_end: Optional[int] = None  # Inclusive; defaults to sol_start
+    max_photos: Optional[int] = None  # None crawls every photo in range
+    concurrency: int = 8
+
+class ExoplanetLoadRequest(BaseModel):
+    table: str = "pscomppars"  # "pscomppars" (one row per planet) or "ps" (default parameter sets)
+    max_rows: Optional[int] = None  # None loads the whole table
+    chunk_size: int = 2000
+    concurrency: int = 4
+
 class TrainingDataResponse(BaseModel):
     total_records: int
     sources_processed: List[str]
     data_quality_score: float
     ready_for_training: bool
     sample_data: List[Dict[str, Any]]
+    metadata: Optional[Dict[str, Any]] = None  # Per-source status and latency
 
 @router.post("/ingest-nasa-data", response_model=TrainingDataResponse)
 async def ingest_nasa_data(request: DataIngestionRequest):
@@ -35,42 +85,44 @@ async def ingest_nasa_data(request: DataIngestionRequest):
     Sources: APOD, NEO, Mars photos, exoplanets, missions, patents
     """
     try:
-        collected_data = []
+        wanted = request.data_types or []
+        sources = {}
         
         # NASA Astronomy Picture of the Day
-        if "apod" in request.data_types or not request.data_types:
-            apod_data = await fetch_nasa_apod()
-            collected_data.extend(apod_data)
+        if not wanted or "apod" in wanted:
+            sources["NASA APOD"] = fetch_nasa_apod
         
         # NASA Near-Earth Objects
-        if "neo" in request.data_types or not request.data_types:
-            neo_data = await fetch_nasa_neo()
-            collected_data.extend(neo_data)
+        if not wanted or "neo" in wanted:
+            sources["NASA NEO"] = fetch_nasa_neo
             
         # NASA Mars Rover Photos & Data
-        if "mars" in request.data_types or not request.data_types:
-            mars_data = await fetch_nasa_mars_data()
-            collected_data.extend(mars_data)
+        if not wanted or "mars" in wanted:
+            sources["NASA Mars"] = fetch_nasa_mars_data
             
         # NASA Exoplanet Archive
-        if "exoplanets" in request.data_types or not request.data_types:
-            exoplanet_data = await fetch_nasa_exoplanets()
-            collected_data.extend(exoplanet_data)
+        if not wanted or "exoplanets" in wanted:
+            sources["NASA Exoplanets"] = fetch_nasa_exoplanets
             
         # NASA TechPort (Technology Portfolio)
-        if "technology" in request.data_types or not request.data_types:
-            tech_data = await fetch_nasa_techport()
-            collected_data.extend(tech_data)
+        if not wanted or "technology" in wanted:
+            sources["NASA TechPort"] = fetch_nasa_techport
+        
+        # Fetch all selected sources concurrently
+        results, source_reports = await fetch_sources(sources)
+        collected_data = [record for records in results.values() for record in records]
         
         # Process and structure data for training
         processed_data = await process_nasa_data(collected_data)
+        quality = DataQualityProfiler().update(processed_data)
         
         return TrainingDataResponse(
             total_records=len(processed_data),
-            sources_processed=["NASA APOD", "NASA NEO", "NASA Mars", "NASA Exoplanets", "NASA TechPort"],
-            data_quality_score=calculate_data_quality(processed_data),
+            sources_processed=list(sources.keys()),
+            data_quality_score=quality.score,
             ready_for_training=len(processed_data) > 100,
-            sample_data=processed_data[:5]
+            sample_data=processed_data[:5],
+            metadata={"sources": source_reports, "quality": quality.report()}
         )
         
     except Exception as e:
@@ -83,46 +135,112 @@ async def ingest_spacex_data(request: DataIngestionRequest):
     Sources: Launches, rockets, capsules, crew, payloads, Starlink
     """
     try:
-        collected_data = []
-        
-        # SpaceX Launches (historical and upcoming)
-        launches_data = await fetch_spacex_launches()
-        collected_data.extend(launches_data)
-        
-        # SpaceX Rockets and Specifications
-        rockets_data = await fetch_spacex_rockets()
-        collected_data.extend(rockets_data)
-        
-        # SpaceX Capsules and Missions
-        capsules_data = await fetch_spacex_capsules()
-        collected_data.extend(capsules_data)
-        
-        # SpaceX Crew Information
-        crew_data = await fetch_spacex_crew()
-        collected_data.extend(crew_data)
-        
-        # SpaceX Payloads and Customers
-        payloads_data = await fetch_spacex_payloads()
-        collected_data.extend(payloads_data)
+        date_range = request.date_range
+        sources = {
+            # SpaceX Launches (historical and upcoming)
+            "SpaceX Launches": lambda: fetch_spacex_launches(date_range=date_range),
+            # SpaceX Rockets and Specifications
+            "SpaceX Rockets": fetch_spacex_rockets,
+            # SpaceX Capsules and Missions
+            "SpaceX Capsules": fetch_spacex_capsules,
+            # SpaceX Crew Information
+            "SpaceX Crew": fetch_spacex_crew,
+            # SpaceX Payloads and Customers
+            "SpaceX Payloads": fetch_spacex_payloads,
+            # SpaceX Starlink Satellites
+            "SpaceX Starlink": lambda: fetch_spacex_starlink(date_range=date_range),
+        }
         
-        # SpaceX Starlink Satellites
-        starlink_data = await fetch_spacex_starlink()
-        collected_data.extend(starlink_data)
+        # Fetch all sources concurrently
+        results, source_reports = await fetch_sources(sources)
+        collected_data = [record for records in results.values() for record in records]
         
         # Process data for training
         processed_data = await process_spacex_data(collected_data)
+        quality = DataQualityProfiler().update(processed_data)
         
         return TrainingDataResponse(
             total_records=len(processed_data),
-            sources_processed=["SpaceX Launches", "SpaceX Rockets", "SpaceX Capsules", "SpaceX Crew", "SpaceX Payloads", "SpaceX Starlink"],
-            data_quality_score=calculate_data_quality(processed_data),
+            sources_processed=list(sources.keys()),
+            data_quality_score=quality.score,
             ready_for_training=len(processed_data) > 50,
-            sample_data=processed_data[:5]
+            sample_data=processed_data[:5],
+            metadata={"sources": source_reports, "quality": quality.report()}
         )
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"SpaceX data ingestion failed: {str(e)}")
 
+@router.post("/crawl-techport")
+async def crawl_nasa_techport(request: TechPortCrawlRequest):
+    """
+    Crawl the full NASA TechPort portfolio with concurrent detail fetches.
+    Resumes after the last crawled projectId (retrying projects that failed before)
+    and appends to raw/techport_projects.jsonl; resume=false starts over.
+    """
+    try:
+        crawler = TechPortCrawler(NASA_BASE_URL, NASA_API_KEY, concurrency=request.concurrency)
+        result = await crawler.crawl(
+            max_projects=request.max_projects,
+            resume=request.resume,
+            updated_since=request.updated_since,
+            output_file="raw/techport_projects.jsonl"
+        )
+        return {
+            "stats": result["stats"],
+            "sample_data": result["projects"][:5]
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"TechPort crawl failed: {str(e)}")
+
+@router.post("/crawl-mars")
+async def crawl_nasa_mars(request: MarsCrawlRequest):
+    """
+    Crawl Mars rover photos for the given rovers and sol range with concurrent page fetches.
+    Photos are deduplicated by id and appended to raw/mars_photos.jsonl as pages complete.
+    """
+    try:
+        crawler = MarsPhotoCrawler(NASA_BASE_URL, NASA_API_KEY, concurrency=request.concurrency)
+        result = await crawler.crawl(
+            rovers=request.rovers,
+            sol_start=request.sol_start,
+            sol_end=request.sol_end,
+            max_photos=request.max_photos,
+            output_file="raw/mars_photos.jsonl"
+        )
+        return {"stats": result["stats"]}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Mars photo crawl failed: {str(e)}")
+
+@router.post("/load-exoplanets")
+async def load_nasa_exoplanets(request: ExoplanetLoadRequest):
+    """
+    Bulk load an Exoplanet Archive table as parallel CSV chunks.
+    The table is persisted columnar to raw/exoplanets_<table>.parquet (CSV without pyarrow).
+    """
+    try:
+        loader = ExoplanetBulkLoader(chunk_size=request.chunk_size, concurrency=request.concurrency)
+        result = await loader.load(
+            table=request.table,
+            max_rows=request.max_rows,
+            output_file=f"raw/exoplanets_{request.table}.parquet"
+        )
+        return {
+            "stats": result["stats"],
+            "sample_data": exoplanet_records(result["frame"].head(5))
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Exoplanet load failed: {str(e)}")
+
+@router.get("/pipeline-stats")
+async def get_ingestion_pipeline_stats():
+    """Per-stage throughput and queue depth of the running (or last) ingestion pipeline."""
+    stages = get_pipeline_stats()
+    return {
+        "running": bool(stages) and any(stage["running"] for stage in stages),
+        "stages": stages or []
+    }
+
 @router.get("/training-datasets")
 async def get_available_training_datasets():
     """Get information about available training datasets."""
@@ -157,517 +275,367 @@ async def get_available_training_datasets():
     }
 
 # Helper functions for data fetching
-async def fetch_nasa_apod(limit: int = 100) -> List[Dict]:
-    """Fetch NASA Astronomy Picture of the Day data."""
-    async with aiohttp.ClientSession() as session:
-        url = f"{NASA_BASE_URL}/planetary/apod"
-        params = {"api_key": NASA_API_KEY, "count": limit}
-        
-        async with session.get(url, params=params) as response:
-            if response.status == 200:
-                data = await response.json()
-                return [
-                    {
-                        "type": "apod",
-                        "title": item.get("title"),
-                        "explanation": item.get("explanation"),
-                        "date": item.get("date"),
-                        "url": item.get("url"),
-                        "media_type": item.get("media_type"),
-                        "source": "NASA APOD"
-                    }
-                    for item in data
-                ]
+def spacex_date_filter(field: str, date_range: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+    """Build a v4 query filter on ``field`` from a request's ``date_range`` (end date inclusive)."""
+    bounds = {}
+    if date_range and date_range.get("start"):
+        bounds["$gte"] = date_range["start"]
+    if date_range and date_range.get("end"):
+        end = date_range["end"]
+        bounds["$lte"] = f"{end}T23:59:59.999Z" if len(end) == 10 else end
+    return {field: bounds} if bounds else {}
+
+def combine_spacex_filters(*filters: Dict[str, Any]) -> Dict[str, Any]:
+    """AND together the non-empty query filters."""
+    filters = [f for f in filters if f]
+    if len(filters) > 1:
+        return {"$and": filters}
+    return filters[0] if filters else {}
+
+async def iter_spacex_query(
+    collection: str,
+    query: Optional[Dict[str, Any]] = None,
+    sort: Optional[Dict[str, str]] = None,
+    limit: Optional[int] = None,
+) -> AsyncIterator[Dict]:
+    """
+    Page through a SpaceX v4 ``/{collection}/query`` with the collection's field projection.
+
+    Each page's ``docs`` are parsed incrementally off the socket and yielded as
+    they arrive, so no page body is held whole. The first page's pagination
+    fields tell us ``totalPages``; later pages download ``SPACEX_QUERY_CONCURRENCY``
+    at a time while the oldest one is consumed, and are yielded in order.
+    Yields nothing if the first page fails; a later failed page raises so a
+    partial collection is never mistaken for a complete one.
+    """
+    client = get_http_client()
+    url = f"{SPACEX_BASE_URL}/{collection}/query"
+    page_size = min(SPACEX_PAGE_SIZE, limit) if limit else SPACEX_PAGE_SIZE
+
+    def stream_page(page: int, fields: Dict[str, Any]) -> AsyncIterator[Dict]:
+        body = {
+            "query": query or {},
+            "options": {
+                "select": SPACEX_SELECTS[collection],
+                "sort": sort or {"_id": "asc"},  # Stable order across pages
+                "page": page,
+                "limit": page_size
+            }
+        }
+        # Pagination fields are only filled in once the page was read to the end
+        return client.stream_json_items("POST", url, json_body=body, key="docs", idempotent=True, fields=fields)
+
+    yielded = 0
+    first_fields: Dict[str, Any] = {}
+    async for doc in stream_page(1, first_fields):
+        yield doc
+        yielded += 1
+        if limit and yielded >= limit:
+            return
+    if not first_fields:
+        return
+
+    total_pages = first_fields.get("totalPages") or 1
+    if limit:
+        total_pages = min(total_pages, math.ceil(limit / page_size))
+
+    async def prefetch(page: int, queue: asyncio.Queue):
+        fields: Dict[str, Any] = {}
+        try:
+            async for doc in stream_page(page, fields):
+                queue.put_nowait(doc)
+            queue.put_nowait(_PAGE_END if fields else RuntimeError(
+                f"SpaceX {collection} query failed on page {page} of {total_pages}"
+            ))
+        except Exception as e:
+            queue.put_nowait(e)
+
+    in_flight = deque()
+    next_page = 2
+    try:
+        while True:
+            while next_page <= total_pages and len(in_flight) < SPACEX_QUERY_CONCURRENCY:
+                queue = asyncio.Queue()
+                in_flight.append((asyncio.create_task(prefetch(next_page, queue)), queue))
+                next_page += 1
+            if not in_flight:
+                return
+            _, queue = in_flight[0]
+            while True:
+                item = await queue.get()
+                if item is _PAGE_END:
+                    break
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+                yielded += 1
+                if limit and yielded >= limit:
+                    return
+            in_flight.popleft()
+    finally:
+        for task, _ in in_flight:
+            task.cancel()
+
+async def query_spacex_docs(
+    collection: str,
+    query: Optional[Dict[str, Any]] = None,
+    sort: Optional[Dict[str, str]] = None,
+    limit: Optional[int] = None,
+) -> List[Dict]:
+    """Collect every document matched by a SpaceX v4 query."""
+    return [doc async for doc in iter_spacex_query(collection, query, sort, limit)]
+
+async def fetch_nasa_apod(limit: int = 100, since: Optional[str] = None) -> List[Dict]:
+    """
+    Fetch NASA Astronomy Picture of the Day data.
+    With ``since`` (YYYY-MM-DD), fetch only the pictures published after that date;
+    otherwise fetch the ``limit`` most recent days. Both are contiguous date ranges
+    ending today, so the newest date fetched is a watermark meaning "fetched through".
+    """
+    url = f"{NASA_BASE_URL}/planetary/apod"
+    today = datetime.utcnow().date()
+    if since:
+        start_date = (datetime.fromisoformat(since) + timedelta(days=1)).date()
+        if start_date > today:
             return []
+    else:
+        # Not count=N, which returns N random pictures from the whole archive
+        start_date = today - timedelta(days=limit - 1)
+    params = {"api_key": NASA_API_KEY, "start_date": start_date.isoformat()}
+    
+    data = await get_http_client().get_json(url, params=params)
+    if data is None:
+        return []
+    
+    return [
+        {
+            "type": "apod",
+            "id": f"apod_{item.get('date')}",
+            "title": item.get("title"),
+            "explanation": item.get("explanation"),
+            "date": item.get("date"),
+            "url": item.get("url"),
+            "media_type": item.get("media_type"),
+            "source": "NASA APOD"
+        }
+        for item in data
+    ]
 
 async def fetch_nasa_neo() -> List[Dict]:
     """Fetch NASA Near-Earth Objects data."""
-    async with aiohttp.ClientSession() as session:
-        url = f"{NASA_BASE_URL}/neo/rest/v1/neo/browse"
-        params = {"api_key": NASA_API_KEY}
-        
-        async with session.get(url, params=params) as response:
-            if response.status == 200:
-                data = await response.json()
-                neo_objects = data.get("near_earth_objects", [])
-                return [
-                    {
-                        "type": "neo",
-                        "name": obj.get("name"),
-                        "nasa_jpl_url": obj.get("nasa_jpl_url"),
-                        "absolute_magnitude": obj.get("absolute_magnitude_h"),
-                        "estimated_diameter": obj.get("estimated_diameter"),
-                        "potentially_hazardous": obj.get("is_potentially_hazardous_asteroid"),
-                        "orbital_data": obj.get("orbital_data"),
-                        "source": "NASA NEO"
-                    }
-                    for obj in neo_objects
-                ]
-            return []
+    url = f"{NASA_BASE_URL}/neo/rest/v1/neo/browse"
+    params = {"api_key": NASA_API_KEY}
+    
+    data = await get_http_client().get_json(url, params=params)
+    if data is None:
+        return []
+    
+    neo_objects = data.get("near_earth_objects", [])
+    return [
+        {
+            "type": "neo",
+            "name": obj.get("name"),
+            "nasa_jpl_url": obj.get("nasa_jpl_url"),
+            "absolute_magnitude": obj.get("absolute_magnitude_h"),
+            "estimated_diameter": obj.get("estimated_diameter"),
+            "potentially_hazardous": obj.get("is_potentially_hazardous_asteroid"),
+            "orbital_data": obj.get("orbital_data"),
+            "source": "NASA NEO"
+        }
+        for obj in neo_objects
+    ]
 
-async def fetch_spacex_launches() -> List[Dict]:
-    """Fetch SpaceX launch data."""
-    async with aiohttp.ClientSession() as session:
-        url = f"{SPACEX_BASE_URL}/launches"
-        
-        async with session.get(url) as response:
-            if response.status == 200:
-                data = await response.json()
-                return [
-                    {
-                        "type": "launch",
-                        "name": launch.get("name"),
-                        "date_utc": launch.get("date_utc"),
-                        "success": launch.get("success"),
-                        "details": launch.get("details"),
-                        "rocket": launch.get("rocket"),
-                        "payloads": launch.get("payloads"),
-                        "launchpad": launch.get("launchpad"),
-                        "flight_number": launch.get("flight_number"),
-                        "links": launch.get("links"),
-                        "source": "SpaceX API"
-                    }
-                    for launch in data
-                ]
-            return []
+def map_spacex_launch(launch: Dict[str, Any]) -> Dict[str, Any]:
+    """Map a SpaceX launch document to our raw record shape."""
+    return {
+        "type": "launch",
+        "id": launch.get("id"),
+        "name": launch.get("name"),
+        "date_utc": launch.get("date_utc"),
+        "success": launch.get("success"),
+        "details": launch.get("details"),
+        "rocket": launch.get("rocket"),
+        "payloads": launch.get("payloads"),
+        "flight_number": launch.get("flight_number"),
+        "upcoming": launch.get("upcoming"),
+        "source": "SpaceX API"
+    }
+
+async def iter_spacex_launches(
+    since: Optional[str] = None,
+    date_range: Optional[Dict[str, str]] = None
+) -> AsyncIterator[Dict]:
+    """
+    Page through SpaceX launches as records.
+    With ``since`` (ISO date_utc), fetch only newer launches plus any still upcoming.
+    """
+    since_filter = {"$or": [{"date_utc": {"$gt": since}}, {"upcoming": True}]} if since else {}
+    query = combine_spacex_filters(since_filter, spacex_date_filter("date_utc", date_range))
+    async for launch in iter_spacex_query("launches", query=query, sort={"date_utc": "asc"}):
+        yield map_spacex_launch(launch)
+
+async def fetch_spacex_launches(since: Optional[str] = None, date_range: Optional[Dict[str, str]] = None) -> List[Dict]:
+    """
+    Fetch SpaceX launch data.
+    With ``since`` (ISO date_utc), fetch only newer launches plus any still upcoming.
+    """
+    return [record async for record in iter_spacex_launches(since=since, date_range=date_range)]
 
 async def fetch_spacex_rockets() -> List[Dict]:
     """Fetch SpaceX rocket specifications."""
-    async with aiohttp.ClientSession() as session:
-        url = f"{SPACEX_BASE_URL}/rockets"
-        
-        async with session.get(url) as response:
-            if response.status == 200:
-                data = await response.json()
-                return [
-                    {
-                        "type": "rocket",
-                        "name": rocket.get("name"),
-                        "description": rocket.get("description"),
-                        "height": rocket.get("height"),
-                        "diameter": rocket.get("diameter"),
-                        "mass": rocket.get("mass"),
-                        "payload_weights": rocket.get("payload_weights"),
-                        "first_stage": rocket.get("first_stage"),
-                        "second_stage": rocket.get("second_stage"),
-                        "engines": rocket.get("engines"),
-                        "cost_per_launch": rocket.get("cost_per_launch"),
-                        "success_rate_pct": rocket.get("success_rate_pct"),
-                        "source": "SpaceX API"
-                    }
-                    for rocket in data
-                ]
-            return []
+    data = await query_spacex_docs("rockets")
+    
+    return [
+        {
+            "type": "rocket",
+            "name": rocket.get("name"),
+            "description": rocket.get("description"),
+            "height": rocket.get("height"),
+            "diameter": rocket.get("diameter"),
+            "mass": rocket.get("mass"),
+            "cost_per_launch": rocket.get("cost_per_launch"),
+            "success_rate_pct": rocket.get("success_rate_pct"),
+            "source": "SpaceX API"
+        }
+        for rocket in data
+    ]
 
 # Additional helper functions
-async def fetch_nasa_mars_data() -> List[Dict]:
-    """Fetch NASA Mars rover photo data."""
-    async with aiohttp.ClientSession() as session:
-        url = f"{NASA_BASE_URL}/mars-photos/api/v1/rovers/curiosity/photos"
-        params = {
-            "api_key": NASA_API_KEY,
-            "sol": 1000,  # Martian day
-            "page": 1
-        }
-        
-        async with session.get(url, params=params) as response:
-            if response.status == 200:
-                data = await response.json()
-                photos = data.get("photos", [])
-                return [
-                    {
-                        "type": "mars_photo",
-                        "id": photo.get("id"),
-                        "sol": photo.get("sol"),
-                        "camera": photo.get("camera", {}).get("full_name"),
-                        "img_src": photo.get("img_src"),
-                        "earth_date": photo.get("earth_date"),
-                        "rover": photo.get("rover", {}).get("name"),
-                        "rover_status": photo.get("rover", {}).get("status"),
-                        "landing_date": photo.get("rover", {}).get("landing_date"),
-                        "source": "NASA Mars Photos"
-                    }
-                    for photo in photos[:20]  # Limit to 20 photos
-                ]
-            return []
+async def fetch_nasa_mars_data(limit: Optional[int] = 20) -> List[Dict]:
+    """Fetch NASA Mars rover photo data (Curiosity, sol 1000, limited to 20 photos by default)."""
+    crawler = MarsPhotoCrawler(NASA_BASE_URL, NASA_API_KEY)
+    result = await crawler.crawl(["curiosity"], sol_start=1000, max_photos=limit, use_manifest=False)
+    return result["photos"]
 
-async def fetch_nasa_exoplanets() -> List[Dict]:
-    """Fetch NASA Exoplanet Archive data."""
-    async with aiohttp.ClientSession() as session:
-        # Using the NASA Exoplanet Archive API
-        url = "https://exoplanetarchive.ipac.caltech.edu/TAP/sync"
-        params = {
-            "query": "select top 50 pl_name,hostname,disc_year,pl_orbper,pl_rade,pl_masse,st_dist from ps where default_flag=1",
-            "format": "json"
-        }
-        
-        async with session.get(url, params=params) as response:
-            if response.status == 200:
-                data = await response.json()
-                return [
-                    {
-                        "type": "exoplanet",
-                        "planet_name": planet.get("pl_name"),
-                        "host_star": planet.get("hostname"),
-                        "discovery_year": planet.get("disc_year"),
-                        "orbital_period": planet.get("pl_orbper"),
-                        "planet_radius": planet.get("pl_rade"),
-                        "planet_mass": planet.get("pl_masse"),
-                        "stellar_distance": planet.get("st_dist"),
-                        "source": "NASA Exoplanet Archive"
-                    }
-                    for planet in data
-                ]
-            return []
+async def fetch_nasa_exoplanets(limit: Optional[int] = 50) -> List[Dict]:
+    """Fetch NASA Exoplanet Archive data (default parameter sets, 50 planets by default)."""
+    loader = ExoplanetBulkLoader()
+    result = await loader.load(table="ps", max_rows=limit)
+    return exoplanet_records(result["frame"])
 
-async def fetch_nasa_techport() -> List[Dict]:
-    """Fetch NASA TechPort technology data."""
-    async with aiohttp.ClientSession() as session:
-        url = f"{NASA_BASE_URL}/techport/api/projects"
-        params = {"api_key": NASA_API_KEY}
-        
-        async with session.get(url, params=params) as response:
-            if response.status == 200:
-                data = await response.json()
-                projects = data.get("projects", [])
-                
-                # Get detailed info for first 10 projects
-                detailed_projects = []
-                for project in projects[:10]:
-                    project_id = project.get("projectId")
-                    if project_id:
-                        detail_url = f"{NASA_BASE_URL}/techport/api/projects/{project_id}"
-                        async with session.get(detail_url, params=params) as detail_response:
-                            if detail_response.status == 200:
-                                project_detail = await detail_response.json()
-                                project_data = project_detail.get("project", {})
-                                detailed_projects.append({
-                                    "type": "technology",
-                                    "project_id": project_data.get("projectId"),
-                                    "title": project_data.get("title"),
-                                    "description": project_data.get("description"),
-                                    "benefits": project_data.get("benefits"),
-                                    "status": project_data.get("statusDescription"),
-                                    "start_date": project_data.get("startDateString"),
-                                    "end_date": project_data.get("endDateString"),
-                                    "program": project_data.get("program"),
-                                    "source": "NASA TechPort"
-                                })
-                
-                return detailed_projects
-            return []
+async def fetch_nasa_techport(limit: Optional[int] = 10) -> List[Dict]:
+    """Fetch NASA TechPort technology data (details fetched concurrently)."""
+    crawler = TechPortCrawler(NASA_BASE_URL, NASA_API_KEY)
+    result = await crawler.crawl(max_projects=limit, resume=False, checkpoint=False)
+    return result["projects"]
 
 async def fetch_spacex_capsules() -> List[Dict]:
     """Fetch SpaceX Dragon capsule data."""
-    async with aiohttp.ClientSession() as session:
-        url = f"{SPACEX_BASE_URL}/capsules"
-        
-        async with session.get(url) as response:
-            if response.status == 200:
-                data = await response.json()
-                return [
-                    {
-                        "type": "capsule",
-                        "serial": capsule.get("serial"),
-                        "status": capsule.get("status"),
-                        "type": capsule.get("type"),
-                        "reuse_count": capsule.get("reuse_count"),
-                        "water_landings": capsule.get("water_landings"),
-                        "land_landings": capsule.get("land_landings"),
-                        "last_update": capsule.get("last_update"),
-                        "launches": capsule.get("launches"),
-                        "source": "SpaceX API"
-                    }
-                    for capsule in data
-                ]
-            return []
+    data = await query_spacex_docs("capsules")
+    
+    return [
+        {
+            "type": "capsule",
+            "serial": capsule.get("serial"),
+            "status": capsule.get("status"),
+            "capsule_type": capsule.get("type"),
+            "reuse_count": capsule.get("reuse_count"),
+            "water_landings": capsule.get("water_landings"),
+            "land_landings": capsule.get("land_landings"),
+            "source": "SpaceX API"
+        }
+        for capsule in data
+    ]
 
 async def fetch_spacex_crew() -> List[Dict]:
     """Fetch SpaceX crew member data."""
-    async with aiohttp.ClientSession() as session:
-        url = f"{SPACEX_BASE_URL}/crew"
-        
-        async with session.get(url) as response:
-            if response.status == 200:
-                data = await response.json()
-                return [
-                    {
-                        "type": "crew",
-                        "name": crew.get("name"),
-                        "agency": crew.get("agency"),
-                        "image": crew.get("image"),
-                        "wikipedia": crew.get("wikipedia"),
-                        "launches": crew.get("launches"),
-                        "status": crew.get("status"),
-                        "source": "SpaceX API"
-                    }
-                    for crew in data
-                ]
-            return []
+    data = await query_spacex_docs("crew")
+    
+    return [
+        {
+            "type": "crew",
+            "name": crew.get("name"),
+            "agency": crew.get("agency"),
+            "launches": crew.get("launches"),
+            "status": crew.get("status"),
+            "source": "SpaceX API"
+        }
+        for crew in data
+    ]
 
-async def fetch_spacex_payloads() -> List[Dict]:
-    """Fetch SpaceX payload data."""
-    async with aiohttp.ClientSession() as session:
-        url = f"{SPACEX_BASE_URL}/payloads"
-        
-        async with session.get(url) as response:
-            if response.status == 200:
-                data = await response.json()
-                return [
-                    {
-                        "type": "payload",
-                        "name": payload.get("name"),
-                        "type": payload.get("type"),
-                        "mass_kg": payload.get("mass_kg"),
-                        "mass_lbs": payload.get("mass_lbs"),
-                        "orbit": payload.get("orbit"),
-                        "reference_system": payload.get("reference_system"),
-                        "regime": payload.get("regime"),
-                        "longitude": payload.get("longitude"),
-                        "semi_major_axis_km": payload.get("semi_major_axis_km"),
-                        "eccentricity": payload.get("eccentricity"),
-                        "periapsis_km": payload.get("periapsis_km"),
-                        "apoapsis_km": payload.get("apoapsis_km"),
-                        "inclination_deg": payload.get("inclination_deg"),
-                        "period_min": payload.get("period_min"),
-                        "lifespan_years": payload.get("lifespan_years"),
-                        "epoch": payload.get("epoch"),
-                        "mean_motion": payload.get("mean_motion"),
-                        "raan": payload.get("raan"),
-                        "arg_of_pericenter": payload.get("arg_of_pericenter"),
-                        "mean_anomaly": payload.get("mean_anomaly"),
-                        "customers": payload.get("customers"),
-                        "nationalities": payload.get("nationalities"),
-                        "manufacturers": payload.get("manufacturers"),
-                        "norad_ids": payload.get("norad_ids"),
-                        "launch": payload.get("launch"),
-                        "source": "SpaceX API"
-                    }
-                    for payload in data[:50]  # Limit to 50 payloads
-                ]
-            return []
+def map_spacex_payload(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Map a SpaceX payload document to our raw record shape."""
+    return {
+        "type": "payload",
+        "name": payload.get("name"),
+        "payload_type": payload.get("type"),
+        "mass_kg": payload.get("mass_kg"),
+        "orbit": payload.get("orbit"),
+        "customers": payload.get("customers"),
+        "manufacturers": payload.get("manufacturers"),
+        "norad_ids": payload.get("norad_ids"),
+        "source": "SpaceX API"
+    }
 
-async def fetch_spacex_starlink() -> List[Dict]:
-    """Fetch SpaceX Starlink satellite data."""
-    async with aiohttp.ClientSession() as session:
-        url = f"{SPACEX_BASE_URL}/starlink"
-        
-        async with session.get(url) as response:
-            if response.status == 200:
-                data = await response.json()
-                return [
-                    {
-                        "type": "starlink",
-                        "spacetrack_id": satellite.get("spaceTrack", {}).get("OBJECT_ID"),
-                        "object_name": satellite.get("spaceTrack", {}).get("OBJECT_NAME"),
-                        "launch_date": satellite.get("spaceTrack", {}).get("LAUNCH_DATE"),
-                        "decay_date": satellite.get("spaceTrack", {}).get("DECAY_DATE"),
-                        "object_type": satellite.get("spaceTrack", {}).get("OBJECT_TYPE"),
-                        "classification_type": satellite.get("spaceTrack", {}).get("CLASSIFICATION_TYPE"),
-                        "norad_cat_id": satellite.get("spaceTrack", {}).get("NORAD_CAT_ID"),
-                        "element_set_no": satellite.get("spaceTrack", {}).get("ELEMENT_SET_NO"),
-                        "rev_at_epoch": satellite.get("spaceTrack", {}).get("REV_AT_EPOCH"),
-                        "bstar": satellite.get("spaceTrack", {}).get("BSTAR"),
-                        "mean_motion": satellite.get("spaceTrack", {}).get("MEAN_MOTION"),
-                        "eccentricity": satellite.get("spaceTrack", {}).get("ECCENTRICITY"),
-                        "inclination": satellite.get("spaceTrack", {}).get("INCLINATION"),
-                        "ra_of_asc_node": satellite.get("spaceTrack", {}).get("RA_OF_ASC_NODE"),
-                        "arg_of_pericenter": satellite.get("spaceTrack", {}).get("ARG_OF_PERICENTER"),
-                        "mean_anomaly": satellite.get("spaceTrack", {}).get("MEAN_ANOMALY"),
-                        "ephemeris_type": satellite.get("spaceTrack", {}).get("EPHEMERIS_TYPE"),
-                        "launch": satellite.get("launch"),
-                        "longitude": satellite.get("longitude"),
-                        "latitude": satellite.get("latitude"),
-                        "height_km": satellite.get("height_km"),
-                        "velocity_kms": satellite.get("velocity_kms"),
-                        "source": "SpaceX API"
-                    }
-                    for satellite in data[:100]  # Limit to 100 satellites for performance
-                ]
-            return []
+def map_spacex_starlink(satellite: Dict[str, Any]) -> Dict[str, Any]:
+    """Map a SpaceX Starlink document to our raw record shape."""
+    space_track = satellite.get("spaceTrack") or {}
+    return {
+        "type": "starlink",
+        "id": satellite.get("id"),
+        "epoch": space_track.get("EPOCH"),
+        "object_name": space_track.get("OBJECT_NAME"),
+        "norad_cat_id": space_track.get("NORAD_CAT_ID"),
+        "launch_date": space_track.get("LAUNCH_DATE"),
+        "longitude": satellite.get("longitude"),
+        "latitude": satellite.get("latitude"),
+        "height_km": satellite.get("height_km"),
+        "velocity_kms": satellite.get("velocity_kms"),
+        "source": "SpaceX API"
+    }
+
+async def iter_spacex_payloads(limit: Optional[int] = None) -> AsyncIterator[Dict]:
+    """
+    Page through SpaceX payloads as records.
+    Stops requesting pages once ``limit`` payloads are mapped; ``None`` fetches them all.
+    """
+    async for payload in iter_spacex_query("payloads", limit=limit):
+        yield map_spacex_payload(payload)
+
+async def iter_spacex_starlink(
+    limit: Optional[int] = None,
+    since: Optional[str] = None,
+    date_range: Optional[Dict[str, str]] = None
+) -> AsyncIterator[Dict]:
+    """
+    Page through SpaceX Starlink satellites as records.
+    With ``since`` (ISO spaceTrack epoch), fetch only satellites with a newer epoch;
+    ``date_range`` filters on the launch date. Satellites come oldest epoch first,
+    so a ``limit``-capped run ends at its newest epoch and the next run's ``since``
+    continues from there instead of skipping older satellites it never fetched.
+    """
+    since_filter = {"spaceTrack.EPOCH": {"$gt": since}} if since else {}
+    query = combine_spacex_filters(since_filter, spacex_date_filter("spaceTrack.LAUNCH_DATE", date_range))
+    sort = {"spaceTrack.EPOCH": "asc"}
+    async for satellite in iter_spacex_query("starlink", query=query, sort=sort, limit=limit):
+        yield map_spacex_starlink(satellite)
+
+async def fetch_spacex_payloads(limit: Optional[int] = 50) -> List[Dict]:
+    """Fetch SpaceX payload data (limited to 50 payloads by default)."""
+    return [record async for record in iter_spacex_payloads(limit=limit)]
+
+async def fetch_spacex_starlink(
+    limit: Optional[int] = 100,
+    since: Optional[str] = None,
+    date_range: Optional[Dict[str, str]] = None
+) -> List[Dict]:
+    """Fetch SpaceX Starlink satellite data (limited to 100 satellites by default for performance)."""
+    return [record async for record in iter_spacex_starlink(limit=limit, since=since, date_range=date_range)]
 
 async def process_nasa_data(raw_data: List[Dict]) -> List[Dict]:
-    """Process and clean NASA data for training."""
-    processed = []
-    
-    for record in raw_data:
-        # Clean and standardize data
-        cleaned_record = {
-            "id": record.get("id") or f"{record.get('type')}_{hash(str(record))}",
-            "type": record.get("type"),
-            "source": record.get("source"),
-            "timestamp": datetime.now().isoformat(),
-            "data": {}
-        }
-        
-        # Type-specific processing
-        if record.get("type") == "apod":
-            cleaned_record["data"] = {
-                "title": record.get("title"),
-                "description": record.get("explanation"),
-                "date": record.get("date"),
-                "media_url": record.get("url"),
-                "media_type": record.get("media_type")
-            }
-            cleaned_record["text_content"] = f"NASA Astronomy Picture: {record.get('title')}. {record.get('explanation')}"
-            
-        elif record.get("type") == "neo":
-            cleaned_record["data"] = {
-                "name": record.get("name"),
-                "hazardous": record.get("potentially_hazardous"),
-                "magnitude": record.get("absolute_magnitude"),
-                "diameter": record.get("estimated_diameter"),
-                "orbital_info": record.get("orbital_data")
-            }
-            cleaned_record["text_content"] = f"Near-Earth Object: {record.get('name')}. Potentially hazardous: {record.get('potentially_hazardous')}. Magnitude: {record.get('absolute_magnitude')}"
-            
-        elif record.get("type") == "mars_photo":
-            cleaned_record["data"] = {
-                "sol": record.get("sol"),
-                "camera": record.get("camera"),
-                "rover": record.get("rover"),
-                "earth_date": record.get("earth_date"),
-                "image_url": record.get("img_src")
-            }
-            cleaned_record["text_content"] = f"Mars photo from {record.get('rover')} rover on sol {record.get('sol')} using {record.get('camera')} camera"
-            
-        elif record.get("type") == "exoplanet":
-            cleaned_record["data"] = {
-                "planet_name": record.get("planet_name"),
-                "host_star": record.get("host_star"),
-                "discovery_year": record.get("discovery_year"),
-                "orbital_period": record.get("orbital_period"),
-                "radius": record.get("planet_radius"),
-                "mass": record.get("planet_mass"),
-                "distance": record.get("stellar_distance")
-            }
-            cleaned_record["text_content"] = f"Exoplanet {record.get('planet_name')} orbiting {record.get('host_star')}, discovered in {record.get('discovery_year')}"
-            
-        elif record.get("type") == "technology":
-            cleaned_record["data"] = {
-                "title": record.get("title"),
-                "description": record.get("description"),
-                "benefits": record.get("benefits"),
-                "status": record.get("status"),
-                "program": record.get("program")
-            }
-            cleaned_record["text_content"] = f"NASA Technology: {record.get('title')}. {record.get('description')} Benefits: {record.get('benefits')}"
-        
-        if cleaned_record["text_content"]:  # Only add if we have meaningful text content
-            processed.append(cleaned_record)
-    
-    return processed
+    """
+    Process and clean NASA data for training (see app.core.normalization for the per-type specs).
+    Large batches are sharded across worker processes so the event loop stays responsive.
+    """
+    return await NASA_NORMALIZER.normalize_async(raw_data)
 
 async def process_spacex_data(raw_data: List[Dict]) -> List[Dict]:
-    """Process and clean SpaceX data for training."""
-    processed = []
-    
-    for record in raw_data:
-        # Clean and standardize data
-        cleaned_record = {
-            "id": record.get("id") or f"{record.get('type')}_{hash(str(record))}",
-            "type": record.get("type"),
-            "source": record.get("source"),
-            "timestamp": datetime.now().isoformat(),
-            "data": {},
-            "text_content": ""
-        }
-        
-        # Type-specific processing
-        if record.get("type") == "launch":
-            cleaned_record["data"] = {
-                "name": record.get("name"),
-                "date": record.get("date_utc"),
-                "success": record.get("success"),
-                "details": record.get("details"),
-                "flight_number": record.get("flight_number"),
-                "rocket": record.get("rocket"),
-                "payloads": record.get("payloads")
-            }
-            success_text = "successful" if record.get("success") else "unsuccessful" if record.get("success") is False else "pending"
-            cleaned_record["text_content"] = f"SpaceX Launch: {record.get('name')} - Flight #{record.get('flight_number')} was {success_text}. {record.get('details') or ''}"
-            
-        elif record.get("type") == "rocket":
-            cleaned_record["data"] = {
-                "name": record.get("name"),
-                "description": record.get("description"),
-                "height": record.get("height"),
-                "diameter": record.get("diameter"),
-                "mass": record.get("mass"),
-                "cost_per_launch": record.get("cost_per_launch"),
-                "success_rate": record.get("success_rate_pct")
-            }
-            cleaned_record["text_content"] = f"SpaceX Rocket: {record.get('name')}. {record.get('description')} Success rate: {record.get('success_rate_pct')}%"
-            
-        elif record.get("type") == "capsule":
-            cleaned_record["data"] = {
-                "serial": record.get("serial"),
-                "status": record.get("status"),
-                "type": record.get("type"),
-                "reuse_count": record.get("reuse_count"),
-                "water_landings": record.get("water_landings"),
-                "land_landings": record.get("land_landings")
-            }
-            cleaned_record["text_content"] = f"SpaceX Capsule {record.get('serial')} ({record.get('type')}) - Status: {record.get('status')}, Reused {record.get('reuse_count')} times"
-            
-        elif record.get("type") == "crew":
-            cleaned_record["data"] = {
-                "name": record.get("name"),
-                "agency": record.get("agency"),
-                "status": record.get("status"),
-                "launches": record.get("launches")
-            }
-            cleaned_record["text_content"] = f"SpaceX Crew Member: {record.get('name')} from {record.get('agency')} - Status: {record.get('status')}"
-            
-        elif record.get("type") == "payload":
-            cleaned_record["data"] = {
-                "name": record.get("name"),
-                "type": record.get("type"),
-                "mass_kg": record.get("mass_kg"),
-                "orbit": record.get("orbit"),
-                "customers": record.get("customers"),
-                "manufacturers": record.get("manufacturers")
-            }
-            customers = ", ".join(record.get("customers", [])) if record.get("customers") else "Unknown"
-            cleaned_record["text_content"] = f"SpaceX Payload: {record.get('name')} ({record.get('type')}) - Mass: {record.get('mass_kg')}kg, Customers: {customers}"
-            
-        elif record.get("type") == "starlink":
-            cleaned_record["data"] = {
-                "object_name": record.get("object_name"),
-                "launch_date": record.get("launch_date"),
-                "height_km": record.get("height_km"),
-                "velocity_kms": record.get("velocity_kms"),
-                "longitude": record.get("longitude"),
-                "latitude": record.get("latitude")
-            }
-            cleaned_record["text_content"] = f"Starlink Satellite: {record.get('object_name')} at {record.get('height_km')}km altitude, velocity {record.get('velocity_kms')}km/s"
-        
-        if cleaned_record["text_content"]:  # Only add if we have meaningful text content
-            processed.append(cleaned_record)
-    
-    return processed
+    """
+    Process and clean SpaceX data for training (see app.core.normalization for the per-type specs).
+    Large batches are sharded across worker processes so the event loop stays responsive.
+    """
+    return await SPACEX_NORMALIZER.normalize_async(raw_data)
 
 def calculate_data_quality(data: List[Dict]) -> float:
-    """Calculate data quality score based on completeness and consistency."""
-    if not data:
-        return 0.0
-    
-    total_score = 0.0
-    for record in data:
-        score = 0.0
-        
-        # Check required fields
-        if record.get("id"):
-            score += 0.2
-        if record.get("type"):
-            score += 0.2
-        if record.get("source"):
-            score += 0.2
-        if record.get("text_content"):
-            score += 0.2
-        if record.get("data") and isinstance(record["data"], dict) and record["data"]:
-            score += 0.2
-        
-        total_score += score
-    
-    return total_score / len(data) if data else 0.0
+    """Calculate data quality score based on completeness and consistency (see DataQualityProfiler)."""
+    return DataQualityProfiler().update(data).score
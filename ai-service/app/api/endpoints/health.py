@@ -2,6 +2,8 @@ from fastapi import APIRouter
 from datetime import datetime
 import os
 
+from app.core.retrieval import get_retrieval_service
+
 router = APIRouter()
 
 @router.get("/")
@@ -30,5 +32,6 @@ async def detailed_status():
             "model_type": os.getenv("AI_MODEL_TYPE", "openai"),
             "port": os.getenv("AI_SERVICE_PORT", "8001")
         },
+        "retrieval": get_retrieval_service().get_stats(),
         "timestamp": datetime.utcnow().isoformat()
     }
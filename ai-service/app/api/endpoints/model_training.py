@@ -11,7 +11,7 @@ import sys
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
 
 from app.core.training_manager import TrainingDataManager
-from app.core.vector_embeddings import VectorEmbeddingManager  
+from app.core.retrieval import get_retrieval_service
 from app.core.model_trainer import SpaceModelTrainer
 
 router = APIRouter()
@@ -114,63 +114,98 @@ async def deploy_model(model_id: str):
         "inference_endpoint": f"/api/chat/ask?model={model_id}"
     }
 
+# Display names for stored record types in dataset previews
+RECORD_TYPE_LABELS = {
+    "apod": "Astronomy Picture of the Day",
+    "neo": "Near-Earth Objects",
+    "mars_photo": "Mars Rover Data",
+    "exoplanet": "Exoplanet Discoveries",
+    "technology": "NASA Technology Projects",
+    "launch": "Launch History",
+    "rocket": "Rocket Specifications",
+    "capsule": "Dragon Capsules",
+    "crew": "Crew Members",
+    "payload": "Payloads",
+    "starlink": "Starlink Satellites",
+}
+
 @router.get("/training-datasets-preview")
 async def preview_training_datasets():
-    """Preview available datasets for training."""
-    return {
-        "nasa_data_preview": {
-            "total_records": 15000,
-            "data_types": [
-                "Astronomy Picture of the Day (3,650 records)",
-                "Near-Earth Objects (8,500 records)", 
-                "Mars Rover Data (2,200 records)",
-                "Exoplanet Discoveries (650 records)"
-            ],
-            "sample_topics": [
-                "Mars geology and atmosphere",
-                "Asteroid composition and orbits",
-                "Exoplanet habitability",
-                "Space telescope observations"
-            ]
-        },
-        "spacex_data_preview": {
-            "total_records": 3500,
-            "data_types": [
-                "Launch History (180 records)",
-                "Rocket Specifications (5 types)",
-                "Mission Details (150 missions)",
-                "Starlink Satellites (3,165 active)"
-            ],
-            "sample_topics": [
-                "Falcon 9 reusability metrics",
-                "Dragon capsule capabilities", 
-                "Starlink constellation coverage",
-                "Launch success rates and analysis"
-            ]
-        },
-        "faa_data_preview": {
-            "total_records": 1200,
-            "data_types": [
-                "Commercial Launch Licenses (450 records)",
-                "Safety Reports (300 records)",
-                "Environmental Assessments (250 records)",
-                "Regulatory Updates (200 records)"
-            ],
-            "sample_topics": [
-                "Commercial spaceflight regulations",
-                "Launch site environmental impact",
-                "Safety protocols and standards",
-                "Licensing requirements and processes"
-            ]
-        },
-        "recommended_training_approach": {
-            "phase_1": "Start with NASA + SpaceX data (18,500 records)",
-            "phase_2": "Add FAA regulatory data for compliance knowledge", 
-            "phase_3": "Fine-tune with domain-specific Q&A pairs",
-            "estimated_training_time": "2-4 hours on GPU",
-            "estimated_cost": "$50-200 depending on model size"
+    """
+    Preview available datasets for training.
+    Record counts come from the record store and quality statistics from the
+    profile taken during the last collection run.
+    """
+    try:
+        data_manager = TrainingDataManager()
+        last_collection = await asyncio.to_thread(data_manager.load_data, "raw/collection_metadata.json") or {}
+        quality = last_collection.get("quality") or {}
+        # SQLite queries block, so they run off the event loop
+        group_counts = {
+            group: await asyncio.to_thread(data_manager.store.counts_by_type, group=group)
+            for group in ("nasa", "spacex")
         }
-    }
+        
+        def group_preview(group: str, sample_topics: List[str]) -> Dict[str, Any]:
+            counts = group_counts[group]
+            return {
+                "total_records": sum(counts.values()),
+                "data_types": [
+                    f"{RECORD_TYPE_LABELS.get(record_type, record_type)} ({count:,} records)"
+                    for record_type, count in sorted(counts.items(), key=lambda item: -item[1])
+                ],
+                "quality": {
+                    record_type: quality["by_type"][record_type]
+                    for record_type in counts if record_type in quality.get("by_type", {})
+                },
+                "sample_topics": sample_topics
+            }
+        
+        nasa_preview = group_preview("nasa", [
+            "Mars geology and atmosphere",
+            "Asteroid composition and orbits",
+            "Exoplanet habitability",
+            "Space telescope observations"
+        ])
+        spacex_preview = group_preview("spacex", [
+            "Falcon 9 reusability metrics",
+            "Dragon capsule capabilities",
+            "Starlink constellation coverage",
+            "Launch success rates and analysis"
+        ])
+        total_records = nasa_preview["total_records"] + spacex_preview["total_records"]
+        
+        return {
+            "nasa_data_preview": nasa_preview,
+            "spacex_data_preview": spacex_preview,
+            "faa_data_preview": {
+                "total_records": 0,
+                "data_types": [],
+                "note": "No FAA source is ingested yet",
+                "sample_topics": [
+                    "Commercial spaceflight regulations",
+                    "Launch site environmental impact",
+                    "Safety protocols and standards",
+                    "Licensing requirements and processes"
+                ]
+            },
+            "last_collection": {
+                "collection_date": last_collection.get("collection_date"),
+                "fetched_records": last_collection.get("fetched_records", 0),
+                "quality_score": quality.get("quality_score"),
+                "completeness": quality.get("completeness", {}),
+                "by_source": quality.get("by_source", {})
+            },
+            "recommended_training_approach": {
+                "phase_1": f"Start with NASA + SpaceX data ({total_records:,} records)",
+                "phase_2": "Add FAA regulatory data for compliance knowledge",
+                "phase_3": "Fine-tune with domain-specific Q&A pairs",
+                "estimated_training_time": "2-4 hours on GPU",
+                "estimated_cost": "$50-200 depending on model size"
+            }
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Dataset preview failed: {str(e)}")
 
 async def run_training_pipeline(training_id: str, request: ModelTrainingRequest):
     """Run the actual model training pipeline with real data collection."""
@@ -182,7 +217,8 @@ async def run_training_pipeline(training_id: str, request: ModelTrainingRequest)
         training_status.progress = 0.125
         
         data_manager = TrainingDataManager()
-        embedding_manager = VectorEmbeddingManager()
+        retrieval = get_retrieval_service()
+        embedding_manager = retrieval.new_manager()  # Shares the already loaded embedding model
         model_trainer = SpaceModelTrainer()
         
         # Step 2: Collect Real Data
@@ -195,12 +231,23 @@ async def run_training_pipeline(training_id: str, request: ModelTrainingRequest)
         if collected_data["metadata"]["total_records"] == 0:
             raise Exception("No training data collected")
         
+        # Nothing new or changed upstream: the existing embeddings and model are current
+        changes = collected_data["metadata"].get("changes", {})
+        embeddings_built = embedding_manager.has_embeddings()
+        if embeddings_built and changes and not (changes["new"] or changes["changed"]):
+            print(f"⏭️ No new or changed records for training job {training_id}; skipping embeddings and training")
+            training_status.current_step = "No new or changed records; existing model is up to date"
+            training_status.progress = 1.0
+            training_status.status = "completed"
+            return
+        
         # Step 3: Prepare Training Dataset
         training_status.current_step = "Preparing training dataset"
         training_status.progress = 0.375
         
-        training_dataset = data_manager.prepare_training_dataset(collected_data)
-        print(f"📊 Prepared {len(training_dataset)} training examples")
+        example_count = data_manager.prepare_training_dataset()  # Read back from the record store
+        print(f"📊 Prepared {example_count} training examples")
+        training_dataset = data_manager.load_training_dataset()
         
         # Step 4: Create Vector Embeddings
         training_status.current_step = "Creating vector embeddings"
@@ -208,6 +255,7 @@ async def run_training_pipeline(training_id: str, request: ModelTrainingRequest)
         
         embedding_data = await embedding_manager.create_embeddings(training_dataset)
         print(f"🧮 Created embeddings for {embedding_data['total_documents']} documents")
+        await retrieval.refresh()  # Serve the new build from the next query on
         
         # Step 5: Train Space Model
         training_status.current_step = "Training space industry model"
@@ -241,7 +289,7 @@ async def run_training_pipeline(training_id: str, request: ModelTrainingRequest)
             model_name=request.model_name,
             training_data_size=collected_data["metadata"]["total_records"],
             performance_metrics={
-                "data_quality_score": 1.0,
+                "data_quality_score": collected_data["metadata"].get("quality", {}).get("quality_score", 1.0),
                 "training_examples": len(training_dataset),
                 "embedding_dimension": embedding_data.get("embedding_dimension", 384),
                 "knowledge_coverage": 0.92,
@@ -313,18 +361,17 @@ async def query_trained_model(model_id: str, query: str):
     try:
         # Import training components
         from app.core.model_trainer import SpaceModelTrainer
-        from app.core.vector_embeddings import VectorEmbeddingManager
         
-        # Initialize components
+        # Initialize components (the retrieval service keeps the model and embeddings loaded)
         model_trainer = SpaceModelTrainer()
-        embedding_manager = VectorEmbeddingManager()
+        retrieval = get_retrieval_service()
         
-        # Try to load embeddings for semantic search
-        embeddings_loaded = embedding_manager.load_embeddings()
+        # Check the published embeddings for semantic search
+        embeddings_loaded = await retrieval.refresh()
         
         if embeddings_loaded:
             # Use vector search for relevant context
-            similar_docs = embedding_manager.search_similar(query, top_k=3)
+            similar_docs = await retrieval.search(query, top_k=3)
             
             if similar_docs:
                 # Generate response based on similar training examples
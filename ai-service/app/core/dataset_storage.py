@@ -0,0 +1,238 @@
+# Partitioned Columnar Dataset Storage
+
+import shutil
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import pandas as pd
+from pandas.api.types import infer_dtype
+
+# Parquet datasets and Arrow IPC files (optional dependency)
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+PARQUET_COMPRESSION = "zstd"
+
+# Column values a dataset is split into directories by (``source=.../type=...``)
+DEFAULT_PARTITION_COLUMNS = ["source", "type"]
+
+
+def _partitioning(partition_cols: List[str]) -> "ds.Partitioning":
+    schema = pa.schema([(column, pa.string()) for column in partition_cols])
+    return ds.partitioning(schema, flavor="hive")
+
+
+def _partition_names(path: Path) -> List[str]:
+    """Partition columns of a hive-layout dataset, read off its directory names."""
+    names = []
+    current = path
+    while True:
+        subdirs = [child for child in current.iterdir() if child.is_dir() and "=" in child.name]
+        if not subdirs:
+            return names
+        names.append(subdirs[0].name.split("=", 1)[0])
+        current = subdirs[0]
+
+
+def _filter_expression(filters: Dict[str, Any]) -> Optional["ds.Expression"]:
+    expression = None
+    for column, value in filters.items():
+        values = value if isinstance(value, (list, tuple, set)) else [value]
+        clause = ds.field(column).isin([str(v) for v in values])
+        expression = clause if expression is None else expression & clause
+    return expression
+
+
+class DatasetWriter:
+    """
+    Writes a zstd-compressed Parquet dataset chunk by chunk, partitioned by
+    ``partition_cols`` (hive layout, one directory per value).
+
+    Chunks go to a staging directory next to ``path`` that ``close`` swaps
+    in, so readers never see a half-written dataset and partitions that no
+    longer exist are dropped. Without pyarrow the chunks are appended to a
+    single CSV instead. Use as a context manager to discard the staged
+    chunks on error.
+    """
+
+    def __init__(self, path: Path, partition_cols: Optional[List[str]] = None):
+        self.path = Path(path) if PYARROW_AVAILABLE else Path(path).with_suffix(".csv")
+        self.partition_cols = partition_cols or DEFAULT_PARTITION_COLUMNS
+        self.staging = self.path.with_name(self.path.name + ".tmp")
+        self.chunks = 0
+        self._discard_staging()
+
+    def __enter__(self) -> "DatasetWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self._discard_staging()
+
+    def _discard_staging(self):
+        if self.staging.is_dir():
+            shutil.rmtree(self.staging)
+        elif self.staging.exists():
+            self.staging.unlink()
+
+    def write(self, frame: pd.DataFrame):
+        """Append one chunk of rows."""
+        if frame.empty:
+            return
+        if not PYARROW_AVAILABLE:
+            frame.to_csv(self.staging, mode="a", header=self.chunks == 0, index=False)
+            self.chunks += 1
+            return
+
+        partition_cols = [column for column in self.partition_cols if column in frame.columns]
+        frame = frame.copy()
+        for column in partition_cols:
+            # Partition values become directory names, so they are stored as strings
+            if infer_dtype(frame[column], skipna=True) not in ("string", "empty"):
+                frame[column] = [None if pd.isna(value) else str(value) for value in frame[column]]
+        table = pa.Table.from_pandas(frame, preserve_index=False)
+        # A column that is all null in one chunk is stored as strings so every chunk's schema agrees
+        table = table.cast(pa.schema([
+            field.with_type(pa.string()) if pa.types.is_null(field.type) else field for field in table.schema
+        ]))
+
+        ds.write_dataset(
+            table,
+            self.staging,
+            format="parquet",
+            partitioning=_partitioning(partition_cols) if partition_cols else None,
+            file_options=ds.ParquetFileFormat().make_write_options(compression=PARQUET_COMPRESSION),
+            basename_template=f"part-{self.chunks}-{{i}}.parquet",
+            existing_data_behavior="overwrite_or_ignore",
+        )
+        self.chunks += 1
+
+    def close(self) -> Path:
+        """Swap the staged chunks in; returns the path written."""
+        if not self.staging.exists():
+            if PYARROW_AVAILABLE:
+                self.staging.mkdir(parents=True)
+            else:
+                self.staging.touch()
+        if self.path.is_dir():
+            shutil.rmtree(self.path)
+        elif self.path.exists():
+            self.path.unlink()
+        self.staging.rename(self.path)
+        return self.path
+
+
+def write_dataset(
+    frame: pd.DataFrame,
+    path: Path,
+    partition_cols: Optional[List[str]] = None,
+) -> Path:
+    """Write a DataFrame in one go with ``DatasetWriter``; returns the path written."""
+    with DatasetWriter(path, partition_cols) as writer:
+        writer.write(frame)
+    return writer.path
+
+
+def read_dataset(
+    path: Path,
+    columns: Optional[List[str]] = None,
+    filters: Optional[Dict[str, Any]] = None,
+) -> Optional[pd.DataFrame]:
+    """
+    Read a dataset written by ``write_dataset``.
+
+    Only the requested ``columns`` are decoded, and ``filters`` (column ->
+    value or list of values) on partition columns skip whole directories
+    without opening their files. Rows come back grouped by partition.
+    """
+    path = Path(path)
+    csv_path = path.with_suffix(".csv")
+    if not path.exists() and csv_path.exists():
+        # Written without pyarrow
+        if csv_path.stat().st_size == 0:
+            return pd.DataFrame(columns=columns)
+        filters = filters or {}
+        usecols = None if columns is None else list(dict.fromkeys([*columns, *filters]))
+        frame = pd.read_csv(csv_path, usecols=usecols)
+        for column, value in filters.items():
+            values = value if isinstance(value, (list, tuple, set)) else [value]
+            frame = frame[frame[column].map(str).isin([str(v) for v in values])]
+        return (frame if columns is None else frame[columns]).reset_index(drop=True)
+    if not path.exists():
+        return None
+    if not PYARROW_AVAILABLE:
+        raise RuntimeError(f"pyarrow is required to read {path}")
+
+    if not any(path.rglob("*.parquet")):
+        return pd.DataFrame(columns=columns)
+    # Partition values are read back as the strings they were written as
+    dataset = ds.dataset(path, format="parquet", partitioning=_partitioning(_partition_names(path)))
+    expression = _filter_expression(filters) if filters else None
+    return dataset.to_table(columns=columns, filter=expression).to_pandas()
+
+
+class TextColumn:
+    """
+    Read-only sequence of strings over an Arrow string column.
+
+    Values are converted one at a time as they are read, so a column of a
+    memory-mapped table stays in the shared page cache instead of being
+    copied into a Python list per process.
+    """
+
+    def __init__(self, column: "pa.ChunkedArray"):
+        self.column = column
+
+    def __len__(self) -> int:
+        return len(self.column)
+
+    def __getitem__(self, index: int) -> str:
+        return self.column[index].as_py()
+
+    def __iter__(self):
+        for chunk in self.column.iterchunks():
+            yield from chunk.to_pylist()
+
+
+def write_arrow(frame: pd.DataFrame, path: Path) -> Path:
+    """
+    Write a DataFrame as an uncompressed Arrow IPC file.
+
+    Unlike Parquet, the file's buffers are laid out as Arrow holds them in
+    memory, so ``read_arrow`` can memory-map it without decoding.
+    """
+    path = Path(path)
+    table = pa.Table.from_pandas(frame, preserve_index=False)
+    staging = path.with_name(path.name + ".tmp")
+    with pa.OSFile(str(staging), "wb") as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    staging.replace(path)
+    return path
+
+
+def read_arrow(
+    path: Path,
+    columns: Optional[List[str]] = None,
+    memory_map: bool = True,
+) -> Optional["pa.Table"]:
+    """
+    Read an Arrow IPC file written by ``write_arrow``.
+
+    With ``memory_map`` the table is backed by the mapped file (zero-copy),
+    so processes reading the same file share one copy in the OS page cache;
+    otherwise it is read into this process's memory.
+    """
+    path = Path(path)
+    if not path.exists():
+        return None
+    source = pa.memory_map(str(path)) if memory_map else pa.OSFile(str(path))
+    table = pa.ipc.open_file(source).read_all()
+    return table.select(columns) if columns else table
+
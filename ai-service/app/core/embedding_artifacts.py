@@ -0,0 +1,295 @@
+# Versioned Embedding Artifacts
+
+import hashlib
+import json
+import mmap
+import os
+import pickle
+import shutil
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from app.core.dataset_storage import PYARROW_AVAILABLE, TextColumn, read_arrow, write_arrow
+
+ARTIFACT_FORMAT_VERSION = 2
+
+# Stored vector precision: "float32", or "float16" for half the disk and page cache
+EMBEDDINGS_VECTOR_DTYPE = os.getenv("EMBEDDINGS_VECTOR_DTYPE", "float32")
+
+# Columns of the per-document store
+DOCUMENT_COLUMNS = ["document", "input", "output", "type", "source", "data_type"]
+
+# Files of the unversioned layout, written directly under embeddings/
+LEGACY_FILES = ["embeddings.json", "embeddings.npy", "documents.arrow", "metadata.pkl", "index.faiss", "manifest.json"]
+
+# Published builds kept on disk (the current one and its predecessor)
+KEEP_BUILDS = 2
+
+
+def _file_fingerprint(path: Path, sample_bytes: int = 1 << 20) -> str:
+    """
+    Hash a file's size and its first and last ``sample_bytes``.
+
+    Constant time whatever the file size, so checking a build on load does
+    not grow with the corpus; a truncated, partly written or swapped file
+    changes it. Bytes in the middle are not read, so this is a quick
+    consistency check, not an integrity check (see ``_file_sha256``).
+    """
+    size = path.stat().st_size
+    digest = hashlib.blake2b(str(size).encode(), digest_size=16)
+    with open(path, "rb") as f:
+        digest.update(f.read(sample_bytes))
+        if size > sample_bytes:
+            f.seek(max(sample_bytes, size - sample_bytes))
+            digest.update(f.read(sample_bytes))
+    return digest.hexdigest()
+
+
+def _file_sha256(path: Path, chunk_size: int = 1 << 20) -> str:
+    """SHA-256 of a file's full contents, read in chunks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class JsonlColumn:
+    """
+    Read-only sequence over one field of a JSON-lines file, with random
+    access through a companion array of line offsets.
+
+    The document store used when pyarrow is not installed; with ``mmap``
+    lines are read straight from the mapped file.
+    """
+
+    def __init__(self, path: Path, offsets: np.ndarray, field: str, use_mmap: bool = True):
+        self.offsets = offsets
+        self.field = field
+        with open(path, "rb") as f:
+            if use_mmap and path.stat().st_size:
+                self.data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            else:
+                self.data = f.read()
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index: int) -> Any:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        line = self.data[int(self.offsets[index]):int(self.offsets[index + 1])]
+        return json.loads(line).get(self.field)
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+
+class DocumentMetadata:
+    """
+    Per-document metadata (input, output, type, source, data_type) held as
+    columns that search results index into by row.
+
+    Columns are the lazily converted Arrow or JSON-lines sequences of the
+    document store, so a hit costs a handful of value conversions and the
+    metadata is never deserialized as one list of dicts.
+    """
+
+    def __init__(self, columns: Dict[str, Sequence[Any]]):
+        self.columns = columns
+
+    @classmethod
+    def from_records(cls, records: List[Dict[str, Any]]) -> "DocumentMetadata":
+        return cls({name: [record.get(name) for record in records] for name in DOCUMENT_COLUMNS[1:]})
+
+    def __len__(self) -> int:
+        return len(next(iter(self.columns.values()), []))
+
+    def row(self, index: int) -> Dict[str, Any]:
+        return {name: column[index] for name, column in self.columns.items()}
+
+
+class EmbeddingArtifactStore:
+    """
+    On-disk layout of embeddings builds.
+
+    Each build is written to its own directory under ``builds/`` and
+    published by pointing ``CURRENT`` at it, so readers always see one
+    complete build and can keep using the one they loaded while the next is
+    written::
+
+        embeddings/
+          CURRENT                  name of the published build
+          builds/<build>/
+            manifest.json          format version, counts, dtype, file sizes,
+                                   SHA-256 digests and fingerprints
+            vectors.npy            float32 or float16 vectors, one row per document
+            documents.arrow        document text and metadata columns (Arrow IPC),
+                                   or documents.jsonl + documents.offsets.npy
+            index.faiss            built FAISS index (when faiss is installed)
+            tfidf.*                sparse TF-IDF vocabulary, IDF and CSR matrix
+                                   (builds made without an embedding model)
+
+    Directories written before builds were versioned (``embeddings.npy``
+    and ``embeddings.json`` directly under ``embeddings/``) are still read
+    by ``load_legacy`` and ``load_metadata``.
+    """
+
+    def __init__(self, embeddings_dir: Path):
+        self.embeddings_dir = Path(embeddings_dir)
+        self.builds_dir = self.embeddings_dir / "builds"
+
+    def current(self) -> Optional[Path]:
+        """Directory of the published build, if any."""
+        try:
+            name = (self.embeddings_dir / "CURRENT").read_text().strip()
+        except OSError:
+            return None
+        build_dir = self.builds_dir / name
+        return build_dir if name and (build_dir / "manifest.json").exists() else None
+
+    def has_legacy(self) -> bool:
+        return (self.embeddings_dir / "embeddings.npy").exists() or (self.embeddings_dir / "embeddings.json").exists()
+
+    def remove_legacy(self):
+        """Delete unversioned files once a build has been published in their place."""
+        for name in LEGACY_FILES:
+            (self.embeddings_dir / name).unlink(missing_ok=True)
+
+    def begin_build(self) -> Path:
+        """Create an empty directory for a new build."""
+        name = f"{datetime.now().strftime('%Y%m%dT%H%M%S%f')}-{uuid.uuid4().hex[:8]}"
+        build_dir = self.builds_dir / name
+        build_dir.mkdir(parents=True)
+        return build_dir
+
+    def publish(self, build_dir: Path, summary: Dict[str, Any]) -> Dict[str, Any]:
+        """Write the build's manifest, point CURRENT at it and prune old builds."""
+        manifest = {
+            "format_version": ARTIFACT_FORMAT_VERSION,
+            "build": build_dir.name,
+            **summary,
+            "files": {
+                path.name: {
+                    "bytes": path.stat().st_size,
+                    "sha256": _file_sha256(path),  # Hashed once here; loads only compare fingerprints
+                    "fingerprint": _file_fingerprint(path),
+                }
+                for path in sorted(build_dir.iterdir()) if path.is_file() and path.name != "manifest.json"
+            },
+        }
+        with open(build_dir / "manifest.json", "w") as f:
+            json.dump(manifest, f, indent=2)
+
+        pointer = self.embeddings_dir / "CURRENT"
+        staging = pointer.with_name("CURRENT.tmp")
+        staging.write_text(build_dir.name)
+        staging.replace(pointer)
+        self.prune()
+        return manifest
+
+    def prune(self):
+        """Delete all but the newest ``KEEP_BUILDS`` builds (processes that mapped a deleted build keep their view)."""
+        current = self.current()
+        builds = sorted((path for path in self.builds_dir.iterdir() if path.is_dir()), reverse=True)
+        for build_dir in builds[KEEP_BUILDS:]:
+            if build_dir != current:
+                shutil.rmtree(build_dir, ignore_errors=True)
+
+    def read_manifest(self, build_dir: Path) -> Dict[str, Any]:
+        with open(build_dir / "manifest.json", "r") as f:
+            return json.load(f)
+
+    def verify(self, build_dir: Path, required: List[str], full: bool = False) -> bool:
+        """
+        Whether the manifest lists ``required`` and every listed file still
+        matches its fingerprint, or with ``full`` its SHA-256 digest (reads
+        every file in full).
+        """
+        try:
+            files = self.read_manifest(build_dir).get("files", {})
+        except (OSError, ValueError):
+            return False
+        if any(name not in files for name in required):
+            return False
+        if full:
+            return all(
+                (build_dir / name).exists() and _file_sha256(build_dir / name) == entry.get("sha256")
+                for name, entry in files.items()
+            )
+        return all(
+            (build_dir / name).exists() and _file_fingerprint(build_dir / name) == entry["fingerprint"]
+            for name, entry in files.items()
+        )
+
+    def save_vectors(self, build_dir: Path, vectors: np.ndarray, dtype: str = EMBEDDINGS_VECTOR_DTYPE):
+        np.save(build_dir / "vectors.npy", np.ascontiguousarray(vectors, dtype=dtype))
+
+    def load_vectors(self, build_dir: Path, use_mmap: bool) -> Optional[np.ndarray]:
+        path = build_dir / "vectors.npy"
+        if not path.exists():
+            return None
+        return np.load(path, mmap_mode="r" if use_mmap else None)
+
+    def save_documents(self, build_dir: Path, documents: List[str], metadata: List[Dict[str, Any]]):
+        """Store document texts and metadata columns with random access by row."""
+        frame = pd.DataFrame(metadata, columns=DOCUMENT_COLUMNS[1:])
+        frame.insert(0, "document", documents)
+        if PYARROW_AVAILABLE:
+            write_arrow(frame, build_dir / "documents.arrow")
+            return
+
+        offsets = [0]
+        with open(build_dir / "documents.jsonl", "wb") as f:
+            # Missing values as JSON null, not NaN
+            for row in frame.astype(object).where(frame.notna(), None).to_dict("records"):
+                line = (json.dumps(row, default=str) + "\n").encode("utf-8")
+                f.write(line)
+                offsets.append(offsets[-1] + len(line))
+        np.save(build_dir / "documents.offsets.npy", np.asarray(offsets, dtype=np.int64))
+
+    def _document_columns(self, directory: Path, columns: List[str], use_mmap: bool) -> Dict[str, Sequence[Any]]:
+        """Lazily converted columns of the document store in ``directory``."""
+        if (directory / "documents.arrow").exists() and PYARROW_AVAILABLE:
+            table = read_arrow(directory / "documents.arrow", columns=columns, memory_map=use_mmap)
+            return {name: TextColumn(table.column(name)) for name in columns}
+        offsets = np.load(directory / "documents.offsets.npy")
+        return {name: JsonlColumn(directory / "documents.jsonl", offsets, name, use_mmap=use_mmap) for name in columns}
+
+    def load_documents(self, build_dir: Path, use_mmap: bool, column: str = "document") -> Any:
+        """One column of the document store, as a random-access sequence (a list without ``use_mmap``)."""
+        values = self._document_columns(build_dir, [column], use_mmap)[column]
+        return values if use_mmap else list(values)
+
+    def load_metadata(self, build_dir: Optional[Path], use_mmap: bool) -> DocumentMetadata:
+        """Metadata columns of a build, or of the legacy directory when ``build_dir`` is None."""
+        if build_dir is not None:
+            return DocumentMetadata(self._document_columns(build_dir, DOCUMENT_COLUMNS[1:], use_mmap))
+        if PYARROW_AVAILABLE and (self.embeddings_dir / "documents.arrow").exists():
+            return DocumentMetadata(self._document_columns(self.embeddings_dir, DOCUMENT_COLUMNS[1:], use_mmap))
+        with open(self.embeddings_dir / "metadata.pkl", "rb") as f:
+            return DocumentMetadata.from_records(pickle.load(f))
+
+    def load_legacy(self, use_mmap: bool) -> Tuple[Optional[np.ndarray], List[str]]:
+        """Vectors and documents from an unversioned embeddings directory."""
+        vectors = None
+        vectors_path = self.embeddings_dir / "embeddings.npy"
+        if vectors_path.exists():
+            vectors = np.load(vectors_path, mmap_mode="r" if use_mmap else None)
+
+        if PYARROW_AVAILABLE and (self.embeddings_dir / "documents.arrow").exists():
+            return vectors, self.load_documents(self.embeddings_dir, use_mmap)
+
+        with open(self.embeddings_dir / "embeddings.json", "r") as f:
+            data = json.load(f)
+        if vectors is None and data.get("embeddings"):
+            vectors = np.asarray(data["embeddings"])
+        return vectors, data.get("documents", [])
@@ -0,0 +1,179 @@
+# Bulk NASA Exoplanet Archive Loader
+
+import asyncio
+import io
+import math
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import pandas as pd
+
+from app.core.http_client import get_http_client
+
+# Parquet output (optional dependency)
+try:
+    import pyarrow  # noqa: F401
+    PARQUET_AVAILABLE = True
+except ImportError:
+    PARQUET_AVAILABLE = False
+
+EXOPLANET_TAP_URL = os.getenv("EXOPLANET_TAP_URL", "https://exoplanetarchive.ipac.caltech.edu/TAP/sync")
+
+PLANET_COLUMNS = [
+    "pl_name", "hostname", "disc_year", "discoverymethod", "pl_orbper",
+    "pl_rade", "pl_masse", "pl_eqt", "sy_dist",
+]
+
+# Columns and filter per table; ``ps`` holds one row per parameter set, so it
+# is filtered to each planet's default set
+EXOPLANET_TABLES = {
+    "ps": {"columns": PLANET_COLUMNS, "where": "default_flag=1"},
+    "pscomppars": {"columns": PLANET_COLUMNS, "where": None},
+}
+
+# Archive column -> raw record field
+EXOPLANET_RECORD_FIELDS = {
+    "pl_name": "planet_name",
+    "hostname": "host_star",
+    "disc_year": "discovery_year",
+    "pl_orbper": "orbital_period",
+    "pl_rade": "planet_radius",
+    "pl_masse": "planet_mass",
+    "sy_dist": "stellar_distance",
+}
+
+
+def exoplanet_records(frame: pd.DataFrame) -> List[Dict[str, Any]]:
+    """Convert a loaded table to our raw exoplanet record shape."""
+    columns = [column for column in EXOPLANET_RECORD_FIELDS if column in frame.columns]
+    records = frame[columns].rename(columns=EXOPLANET_RECORD_FIELDS).astype(object)
+    records = records.where(records.notna(), None)
+    records.insert(0, "type", "exoplanet")
+    records["source"] = "NASA Exoplanet Archive"
+    return records.to_dict("records")
+
+
+class ExoplanetBulkLoader:
+    """
+    Loads whole Exoplanet Archive tables through the TAP sync service.
+
+    The row count is fetched first (unless ``max_rows`` caps the load), then
+    the table is pulled as CSV in ``chunk_size`` row chunks (``ORDER BY
+    pl_name`` + ``OFFSET``) with several chunks in flight at once. Each chunk
+    is parsed straight into a DataFrame and the result is written as a single
+    columnar file.
+    """
+
+    def __init__(
+        self,
+        data_dir: str = "training_data",
+        chunk_size: int = 2000,
+        concurrency: int = 4,
+        tap_url: str = EXOPLANET_TAP_URL,
+    ):
+        self.data_dir = Path(data_dir)
+        self.chunk_size = chunk_size
+        self.concurrency = concurrency
+        self.tap_url = tap_url
+
+    def build_query(
+        self,
+        table: str,
+        columns: List[str],
+        where: Optional[str] = None,
+        offset: Optional[int] = None,
+        limit: Optional[int] = None,
+    ) -> str:
+        """Build an ADQL query for one chunk of a table."""
+        top = f"top {limit} " if limit else ""
+        query = f"select {top}{','.join(columns)} from {table}"
+        if where:
+            query += f" where {where}"
+        if offset is not None:
+            query += f" order by pl_name offset {offset}"
+        return query
+
+    async def _run_query(self, query: str) -> Optional[pd.DataFrame]:
+        """Run an ADQL query and parse the CSV response."""
+        body = await get_http_client().request_bytes(
+            "GET", self.tap_url, params={"query": query, "format": "csv"}
+        )
+        if body is None:
+            return None
+        return pd.read_csv(io.BytesIO(body))
+
+    async def count_rows(self, table: str, where: Optional[str] = None) -> Optional[int]:
+        """Count the rows a load will pull."""
+        query = f"select count(*) as row_count from {table}"
+        if where:
+            query += f" where {where}"
+        frame = await self._run_query(query)
+        if frame is None or frame.empty:
+            return None
+        return int(frame["row_count"].iloc[0])
+
+    async def load(
+        self,
+        table: str = "pscomppars",
+        columns: Optional[List[str]] = None,
+        where: Optional[str] = None,
+        max_rows: Optional[int] = None,
+        output_file: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Pull a table in parallel chunks and optionally persist it.
+
+        ``output_file`` is written as Parquet when pyarrow is installed and as
+        CSV otherwise. Returns the DataFrame and load statistics.
+        """
+        start = time.perf_counter()
+        spec = EXOPLANET_TABLES.get(table, {})
+        columns = columns or spec.get("columns")
+        if not columns:
+            raise ValueError(f"No columns configured for Exoplanet Archive table '{table}'")
+        where = where if where is not None else spec.get("where")
+
+        # With a row cap there is no need to count: chunks past the end come back short
+        total_rows = max_rows if max_rows is not None else await self.count_rows(table, where)
+        if total_rows is None:
+            raise RuntimeError(f"Could not count rows of Exoplanet Archive table '{table}'")
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def fetch_chunk(offset: int) -> pd.DataFrame:
+            async with semaphore:
+                limit = min(self.chunk_size, total_rows - offset)
+                frame = await self._run_query(self.build_query(table, columns, where, offset, limit))
+            if frame is None:
+                raise RuntimeError(f"Exoplanet Archive chunk at offset {offset} failed")
+            return frame
+
+        offsets = range(0, total_rows, self.chunk_size)
+        chunks = await asyncio.gather(*[fetch_chunk(offset) for offset in offsets])
+        frame = pd.concat(chunks, ignore_index=True) if chunks else pd.DataFrame(columns=columns)
+
+        output_path = None
+        if output_file:
+            output_path = self.data_dir / output_file
+            output_path.parent.mkdir(parents=True, exist_ok=True)
+            if PARQUET_AVAILABLE:
+                output_path = output_path.with_suffix(".parquet")
+                frame.to_parquet(output_path, index=False)
+            else:
+                output_path = output_path.with_suffix(".csv")
+                frame.to_csv(output_path, index=False)
+
+        elapsed = time.perf_counter() - start
+        return {
+            "frame": frame,
+            "stats": {
+                "table": table,
+                "rows": len(frame),
+                "chunks": math.ceil(total_rows / self.chunk_size) if total_rows else 0,
+                "memory_bytes": int(frame.memory_usage(deep=True).sum()),
+                "output_file": str(output_path) if output_path else None,
+                "elapsed_seconds": round(elapsed, 3),
+            }
+        }
@@ -0,0 +1,76 @@
+# Concurrent Source Fan-out
+
+import asyncio
+import os
+import time
+import weakref
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from app.core.rate_limit import deadline
+
+SourceFetcher = Callable[[], Awaitable[List[Dict]]]
+
+DEFAULT_SOURCE_TIMEOUT = float(os.getenv("INGEST_SOURCE_TIMEOUT", 30))
+DEFAULT_MAX_CONCURRENCY = int(os.getenv("INGEST_MAX_CONCURRENCY", 8))
+
+_semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = weakref.WeakKeyDictionary()
+
+
+def _global_semaphore() -> asyncio.Semaphore:
+    """Return the process-wide source concurrency cap for the running loop."""
+    loop = asyncio.get_running_loop()
+    if loop not in _semaphores:
+        _semaphores[loop] = asyncio.Semaphore(DEFAULT_MAX_CONCURRENCY)
+    return _semaphores[loop]
+
+
+async def _run_source(
+    name: str,
+    fetcher: SourceFetcher,
+    timeout: float,
+    semaphore: asyncio.Semaphore,
+) -> Tuple[List[Dict], Dict[str, Any]]:
+    """Run a single source fetch, never raising."""
+    async with semaphore:
+        start = time.perf_counter()
+        try:
+            # Retries and rate-limit waits inside the fetch give up rather than outlive the timeout
+            with deadline(timeout):
+                records = await asyncio.wait_for(fetcher(), timeout=timeout)
+            report = {"status": "ok", "records": len(records)}
+        except asyncio.TimeoutError:
+            records = []
+            report = {"status": "timeout", "records": 0, "error": f"timed out after {timeout}s"}
+        except Exception as e:
+            records = []
+            report = {"status": "error", "records": 0, "error": str(e)}
+        report["latency_ms"] = round((time.perf_counter() - start) * 1000, 1)
+    return records, report
+
+
+async def fetch_sources(
+    sources: Dict[str, SourceFetcher],
+    timeout: Optional[float] = None,
+    max_concurrency: Optional[int] = None,
+) -> Tuple[Dict[str, List[Dict]], Dict[str, Dict[str, Any]]]:
+    """
+    Fetch several upstream sources concurrently.
+
+    Each source gets its own timeout and a failed source yields an empty list
+    instead of aborting the batch. Returns the records and a per-source report
+    (status, record count, latency) keyed by source name, in input order.
+    """
+    timeout = timeout or DEFAULT_SOURCE_TIMEOUT
+    semaphore = asyncio.Semaphore(max_concurrency) if max_concurrency else _global_semaphore()
+
+    outcomes = await asyncio.gather(*[
+        _run_source(name, fetcher, timeout, semaphore)
+        for name, fetcher in sources.items()
+    ])
+
+    results = {}
+    reports = {}
+    for name, (records, report) in zip(sources.keys(), outcomes):
+        results[name] = records
+        reports[name] = report
+    return results, reports
@@ -0,0 +1,307 @@
+# On-disk HTTP Response Cache
+
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional
+from urllib.parse import urlencode
+
+# Cache modes:
+#   revalidate - serve fresh entries, revalidate stale ones with conditional GETs
+#   replay     - offline, serve only what is already cached and never touch the network
+#   off        - bypass the cache entirely
+CACHE_MODES = ("revalidate", "replay", "off")
+
+# Default time-to-live (seconds) per endpoint, matched by URL substring.
+# Reference collections barely change; launch/Starlink state moves faster.
+DEFAULT_TTLS = {
+    "/rockets": 7 * 86400,
+    "/capsules": 86400,
+    "/crew": 86400,
+    "/payloads": 86400,
+    "/launches": 3600,
+    "/starlink": 3600,
+    "/planetary/apod": 3600,
+    "/neo/rest": 86400,
+    "/mars-photos": 7 * 86400,
+    "/techport/api/projects/": 7 * 86400,
+    "/techport/api/projects": 86400,
+    "exoplanetarchive": 86400,
+}
+
+# Query parameters that identify the caller rather than the resource
+IGNORED_PARAMS = {"api_key"}
+
+# Stores between prunes (the first store of a process prunes too)
+PRUNE_INTERVAL = 200
+
+# Unreferenced objects and partial files younger than this are left alone,
+# as a concurrent store may be about to point an index entry at them
+PRUNE_GRACE_SECONDS = 600
+
+
+class HTTPResponseCache:
+    """
+    Content-addressed on-disk cache for upstream API responses.
+
+    Response bodies are stored once under ``objects/`` keyed by their SHA-256,
+    and a small JSON index entry per request (method, URL, params, body) points
+    at the body along with the validators (ETag / Last-Modified) needed for
+    conditional revalidation.
+
+    Replaced responses leave their old body behind, so ``prune`` (run every
+    ``PRUNE_INTERVAL`` stores) drops entries older than ``max_age``, then the
+    least recently stored entries until bodies fit in ``max_bytes``, and
+    deletes every object no entry references any more.
+    """
+
+    def __init__(
+        self,
+        data_dir: str = "training_data",
+        mode: Optional[str] = None,
+        ttls: Optional[Dict[str, float]] = None,
+        default_ttl: Optional[float] = None,
+        max_bytes: Optional[int] = None,
+        max_age: Optional[float] = None,
+    ):
+        self.cache_dir = Path(data_dir) / "http_cache"
+        self.objects_dir = self.cache_dir / "objects"
+        self.index_dir = self.cache_dir / "index"
+        self.objects_dir.mkdir(parents=True, exist_ok=True)
+        self.index_dir.mkdir(parents=True, exist_ok=True)
+
+        self.mode = mode or os.getenv("HTTP_CACHE_MODE", "revalidate")
+        if self.mode not in CACHE_MODES:
+            raise ValueError(f"Unknown HTTP cache mode '{self.mode}', expected one of {CACHE_MODES}")
+        self.ttls = ttls if ttls is not None else DEFAULT_TTLS
+        self.default_ttl = default_ttl if default_ttl is not None else float(os.getenv("HTTP_CACHE_DEFAULT_TTL", 3600))
+        self.max_bytes = max_bytes if max_bytes is not None else int(os.getenv("HTTP_CACHE_MAX_BYTES", 1 << 30))
+        self.max_age = max_age if max_age is not None else float(os.getenv("HTTP_CACHE_MAX_AGE", 30 * 86400))
+
+        self.stats = {"hits": 0, "revalidated": 0, "misses": 0, "stored": 0, "evicted_entries": 0, "evicted_objects": 0}
+        self._prune_lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.mode != "off"
+
+    @property
+    def replay_only(self) -> bool:
+        return self.mode == "replay"
+
+    def cache_key(self, method: str, url: str, params: Optional[Dict[str, Any]] = None, body: Any = None) -> str:
+        """Build a stable key for a request, ignoring credentials."""
+        query = urlencode(sorted(
+            (str(key), str(value)) for key, value in (params or {}).items()
+            if key not in IGNORED_PARAMS
+        ))
+        body_text = json.dumps(body, sort_keys=True, separators=(",", ":")) if body is not None else ""
+        return hashlib.sha256(f"{method.upper()} {url}?{query}\n{body_text}".encode()).hexdigest()
+
+    def ttl_for(self, url: str) -> float:
+        """Return the TTL of the most specific matching endpoint rule."""
+        matches = [pattern for pattern in self.ttls if pattern in url]
+        if not matches:
+            return self.default_ttl
+        return self.ttls[max(matches, key=len)]
+
+    def lookup(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the index entry for a key, if the cached body is still present."""
+        index_path = self.index_dir / f"{key}.json"
+        if not index_path.exists():
+            return None
+        with open(index_path, "r") as f:
+            entry = json.load(f)
+        if not self._object_path(entry["content_hash"]).exists():
+            return None
+        return entry
+
+    def is_fresh(self, entry: Dict[str, Any]) -> bool:
+        return time.time() - entry["stored_at"] < self.ttl_for(entry["url"])
+
+    def conditional_headers(self, entry: Optional[Dict[str, Any]]) -> Dict[str, str]:
+        """Headers for revalidating a stale entry with a conditional GET."""
+        headers = {}
+        if entry:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def read_body(self, entry: Dict[str, Any]) -> bytes:
+        with open(self._object_path(entry["content_hash"]), "rb") as f:
+            return f.read()
+
+    def store(self, key: str, url: str, body: bytes, headers: Any) -> Dict[str, Any]:
+        """Store a 200 response body and its validators."""
+        content_hash = hashlib.sha256(body).hexdigest()
+        object_path = self._object_path(content_hash)
+        if not object_path.exists():
+            object_path.parent.mkdir(exist_ok=True)
+            self._atomic_write(object_path, body)
+
+        entry = {
+            "url": url,
+            "content_hash": content_hash,
+            "size": len(body),
+            "etag": headers.get("ETag"),
+            "last_modified": headers.get("Last-Modified"),
+            "stored_at": time.time(),
+        }
+        self._write_entry(key, entry)
+        self._stored()
+        return entry
+
+    def touch(self, key: str, entry: Dict[str, Any], headers: Any):
+        """Mark an entry fresh again after a 304 Not Modified."""
+        entry["stored_at"] = time.time()
+        entry["etag"] = headers.get("ETag") or entry.get("etag")
+        entry["last_modified"] = headers.get("Last-Modified") or entry.get("last_modified")
+        self._write_entry(key, entry)
+        self.stats["revalidated"] += 1
+
+    def iter_body(self, entry: Dict[str, Any], chunk_size: int = 65536) -> Iterator[bytes]:
+        """Read a cached body in chunks."""
+        with open(self._object_path(entry["content_hash"]), "rb") as f:
+            while True:
+                chunk = f.read(chunk_size)
+                if not chunk:
+                    return
+                yield chunk
+
+    def open_writer(self, key: str, url: str, headers: Any) -> "CacheWriter":
+        """Start writing a streamed response body into the cache."""
+        return CacheWriter(self, key, url, headers)
+
+    def prune(self) -> Dict[str, int]:
+        """
+        Evict expired and over-budget entries and delete unreferenced objects.
+
+        Blocking disk work: call it from a worker thread. Concurrent calls
+        return immediately while one prune is running.
+        """
+        if not self._prune_lock.acquire(blocking=False):
+            return {"entries": 0, "objects": 0}
+        try:
+            now = time.time()
+            entries = []
+            for index_path in self.index_dir.glob("*.json"):
+                try:
+                    with open(index_path, "r") as f:
+                        entries.append((index_path, json.load(f)))
+                except (OSError, ValueError):
+                    continue
+
+            # Newest first: expired entries go, then whatever no longer fits in max_bytes
+            entries.sort(key=lambda item: item[1].get("stored_at", 0), reverse=True)
+            kept_hashes = set()
+            kept_bytes = 0
+            evicted = 0
+            for index_path, entry in entries:
+                content_hash = entry.get("content_hash")
+                size = 0 if content_hash in kept_hashes else entry.get("size", 0)
+                if now - entry.get("stored_at", 0) > self.max_age or kept_bytes + size > self.max_bytes:
+                    index_path.unlink(missing_ok=True)
+                    evicted += 1
+                    continue
+                kept_hashes.add(content_hash)
+                kept_bytes += size
+
+            removed = 0
+            for path in self.objects_dir.rglob("*"):
+                if not path.is_file() or path.name in kept_hashes:
+                    continue
+                try:
+                    if now - path.stat().st_mtime > PRUNE_GRACE_SECONDS:
+                        path.unlink()
+                        removed += 1
+                except OSError:
+                    continue
+
+            self.stats["evicted_entries"] += evicted
+            self.stats["evicted_objects"] += removed
+            return {"entries": evicted, "objects": removed}
+        finally:
+            self._prune_lock.release()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {"mode": self.mode, "max_bytes": self.max_bytes, "max_age": self.max_age, **self.stats}
+
+    def _object_path(self, content_hash: str) -> Path:
+        return self.objects_dir / content_hash[:2] / content_hash
+
+    def _commit_object(self, tmp_path: Path, content_hash: str):
+        object_path = self._object_path(content_hash)
+        if object_path.exists():
+            tmp_path.unlink()
+            return
+        object_path.parent.mkdir(exist_ok=True)
+        os.replace(tmp_path, object_path)
+
+    def _stored(self):
+        self.stats["stored"] += 1
+        if self.stats["stored"] % PRUNE_INTERVAL == 1:
+            self.prune()
+
+    def _write_entry(self, key: str, entry: Dict[str, Any]):
+        self._atomic_write(self.index_dir / f"{key}.json", json.dumps(entry).encode())
+
+    def _atomic_write(self, path: Path, data: bytes):
+        tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+
+class CacheWriter:
+    """
+    Tees a streamed response body into the cache.
+
+    The body is only committed if the whole stream was read; a consumer that
+    stops early (e.g. after a record limit) leaves no partial entry behind.
+    """
+
+    def __init__(self, cache: HTTPResponseCache, key: str, url: str, headers: Any):
+        self.cache = cache
+        self.key = key
+        self.url = url
+        self.etag = headers.get("ETag")
+        self.last_modified = headers.get("Last-Modified")
+        self._hash = hashlib.sha256()
+        self._size = 0
+        self._tmp_path = cache.objects_dir / f".{key}.{os.getpid()}.{id(self)}.part"
+        self._file = open(self._tmp_path, "wb")
+        self._committed = False
+
+    def write(self, chunk: bytes):
+        self._hash.update(chunk)
+        self._size += len(chunk)
+        self._file.write(chunk)
+
+    def commit(self):
+        """Store the complete body and point the request's index entry at it."""
+        self._file.close()
+        content_hash = self._hash.hexdigest()
+        self.cache._commit_object(self._tmp_path, content_hash)
+        self.cache._write_entry(self.key, {
+            "url": self.url,
+            "content_hash": content_hash,
+            "size": self._size,
+            "etag": self.etag,
+            "last_modified": self.last_modified,
+            "stored_at": time.time(),
+        })
+        self._committed = True
+        self.cache._stored()
+
+    def discard(self):
+        """Drop a partially written body."""
+        if self._committed:
+            return
+        self._file.close()
+        if self._tmp_path.exists():
+            self._tmp_path.unlink()
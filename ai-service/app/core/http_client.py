@@ -0,0 +1,341 @@
+# Shared HTTP Client for Upstream Space APIs
+
+import asyncio
+import json
+import os
+from typing import Any, AsyncIterator, Dict, Optional
+from urllib.parse import urlparse
+
+import aiohttp
+
+from app.core.http_cache import HTTPResponseCache
+from app.core.json_stream import iter_json_array
+from app.core.rate_limit import (
+    RETRYABLE_STATUSES, AdaptiveRateLimiter, DeadlineExceeded, RetryPolicy, parse_retry_after, time_left,
+)
+
+# Methods that are always safe to retry; read-only POST queries opt in explicitly
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
+class SpaceHTTPClient:
+    """App-scoped pooled HTTP client shared by every NASA/SpaceX fetcher.
+
+    One ``aiohttp.ClientSession`` (and therefore one connector) is reused for
+    the lifetime of the process, so keep-alive connections, DNS lookups and
+    TLS sessions are paid for once instead of on every fetch.
+    """
+
+    def __init__(
+        self,
+        total_connections: Optional[int] = None,
+        connections_per_host: Optional[int] = None,
+        dns_cache_ttl: Optional[int] = None,
+        keepalive_timeout: Optional[float] = None,
+        total_timeout: Optional[float] = None,
+        connect_timeout: Optional[float] = None,
+        read_timeout: Optional[float] = None,
+        cache: Optional[HTTPResponseCache] = None,
+        rate_limiters: Optional[Dict[str, AdaptiveRateLimiter]] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+    ):
+        self.total_connections = total_connections or int(os.getenv("HTTP_POOL_SIZE", 100))
+        self.connections_per_host = connections_per_host or int(os.getenv("HTTP_POOL_PER_HOST", 10))
+        self.dns_cache_ttl = dns_cache_ttl or int(os.getenv("HTTP_DNS_CACHE_TTL", 300))
+        self.keepalive_timeout = keepalive_timeout or float(os.getenv("HTTP_KEEPALIVE_TIMEOUT", 30))
+        self.timeout = aiohttp.ClientTimeout(
+            total=total_timeout or float(os.getenv("HTTP_TOTAL_TIMEOUT", 60)),
+            sock_connect=connect_timeout or float(os.getenv("HTTP_CONNECT_TIMEOUT", 10)),
+            sock_read=read_timeout or float(os.getenv("HTTP_READ_TIMEOUT", 30)),
+        )
+        self.cache = cache
+        # Limiters are keyed by hostname and shared by every request to that host
+        self.rate_limiters = rate_limiters or {}
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.retry_stats = {"retries": 0, "gave_up": 0}
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    async def start(self) -> aiohttp.ClientSession:
+        """Create the pooled session if it does not exist yet."""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.total_connections,
+                limit_per_host=self.connections_per_host,
+                ttl_dns_cache=self.dns_cache_ttl,
+                use_dns_cache=True,
+                keepalive_timeout=self.keepalive_timeout,
+            )
+            self._session = aiohttp.ClientSession(connector=connector, timeout=self.timeout)
+        return self._session
+
+    async def close(self):
+        """Close the pooled session and release all connections."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    async def session(self) -> aiohttp.ClientSession:
+        """Return the shared session, creating it lazily outside the app lifecycle."""
+        return await self.start()
+
+    async def get_json(self, url: str, params: Optional[Dict[str, Any]] = None) -> Optional[Any]:
+        """GET a URL and return the decoded JSON body, or None on a non-200 response."""
+        return await self.request_json("GET", url, params=params)
+
+    async def post_json(self, url: str, body: Any, params: Optional[Dict[str, Any]] = None) -> Optional[Any]:
+        """POST a read-only JSON query and return the decoded JSON response."""
+        return await self.request_json("POST", url, params=params, json_body=body, idempotent=True)
+
+    async def request_json(
+        self,
+        method: str,
+        url: str,
+        params: Optional[Dict[str, Any]] = None,
+        json_body: Any = None,
+        idempotent: Optional[bool] = None,
+    ) -> Optional[Any]:
+        """Send a request and return the decoded JSON body, or None on a non-200 response."""
+        body = await self.request_bytes(method, url, params, json_body, idempotent)
+        return json.loads(body) if body is not None else None
+
+    async def request_bytes(
+        self,
+        method: str,
+        url: str,
+        params: Optional[Dict[str, Any]] = None,
+        json_body: Any = None,
+        idempotent: Optional[bool] = None,
+    ) -> Optional[bytes]:
+        """
+        Send a request and return the raw response body, or None on a non-200 response.
+
+        With a response cache attached, fresh entries are served from disk, stale
+        ones are revalidated with a conditional request, and in replay mode the
+        network is never touched.
+        """
+        cache = self.cache if self.cache is not None and self.cache.enabled else None
+        if cache is None:
+            response = await self._send(method, url, params, json_body, idempotent=idempotent)
+            async with response:
+                if response.status == 200:
+                    return await response.read()
+                return None
+
+        # Index and body files are read and written off the event loop
+        key = cache.cache_key(method, url, params, json_body)
+        entry = await asyncio.to_thread(cache.lookup, key)
+        if entry and (cache.replay_only or cache.is_fresh(entry)):
+            cache.stats["hits"] += 1
+            return await asyncio.to_thread(cache.read_body, entry)
+        if cache.replay_only:
+            cache.stats["misses"] += 1
+            return None
+
+        headers = cache.conditional_headers(entry)
+        response = await self._send(method, url, params, json_body, headers, idempotent)
+        async with response:
+            if response.status == 304 and entry:
+                await asyncio.to_thread(cache.touch, key, entry, response.headers)
+                return await asyncio.to_thread(cache.read_body, entry)
+            if response.status == 200:
+                cache.stats["misses"] += 1
+                body = await response.read()
+                await asyncio.to_thread(cache.store, key, url, body, response.headers)
+                return body
+            return None
+
+    async def stream_json_items(
+        self,
+        method: str,
+        url: str,
+        params: Optional[Dict[str, Any]] = None,
+        json_body: Any = None,
+        key: Optional[str] = None,
+        limit: Optional[int] = None,
+        idempotent: Optional[bool] = None,
+        fields: Optional[Dict[str, Any]] = None,
+    ) -> AsyncIterator[Any]:
+        """
+        Stream the items of a JSON array response one at a time.
+
+        The array is the top-level body, or the value of ``key`` in a top-level
+        object, whose other fields are copied into ``fields`` once the body has
+        been read to the end. Reading stops (and the connection is released)
+        once ``limit`` items have been yielded. Yields nothing on a non-200
+        response, leaving ``fields`` empty.
+        """
+        body = self._stream_body(method, url, params, json_body, idempotent)
+        async for item in iter_json_array(body, key=key, limit=limit, fields=fields):
+            yield item
+
+    async def _stream_body(
+        self,
+        method: str,
+        url: str,
+        params: Optional[Dict[str, Any]],
+        json_body: Any,
+        idempotent: Optional[bool] = None,
+    ) -> AsyncIterator[bytes]:
+        """Yield a response body in chunks, going through the response cache."""
+        cache = self.cache if self.cache is not None and self.cache.enabled else None
+        if cache is None:
+            response = await self._send(method, url, params, json_body, idempotent=idempotent)
+            async with response:
+                if response.status != 200:
+                    return
+                async for chunk in response.content.iter_chunked(STREAM_CHUNK_SIZE):
+                    yield chunk
+            return
+
+        key = cache.cache_key(method, url, params, json_body)
+        entry = await asyncio.to_thread(cache.lookup, key)
+        if entry and (cache.replay_only or cache.is_fresh(entry)):
+            cache.stats["hits"] += 1
+            async for chunk in self._read_cached(entry):
+                yield chunk
+            return
+        if cache.replay_only:
+            cache.stats["misses"] += 1
+            return
+
+        headers = cache.conditional_headers(entry)
+        response = await self._send(method, url, params, json_body, headers, idempotent)
+        async with response:
+            if response.status == 304 and entry:
+                await asyncio.to_thread(cache.touch, key, entry, response.headers)
+                async for chunk in self._read_cached(entry):
+                    yield chunk
+                return
+            if response.status != 200:
+                return
+
+            cache.stats["misses"] += 1
+            # Cache files are written off the event loop, chunk by chunk as they arrive
+            writer = await asyncio.to_thread(cache.open_writer, key, url, response.headers)
+            try:
+                async for chunk in response.content.iter_chunked(STREAM_CHUNK_SIZE):
+                    await asyncio.to_thread(writer.write, chunk)
+                    yield chunk
+                await asyncio.to_thread(writer.commit)
+            finally:
+                await asyncio.to_thread(writer.discard)
+
+    async def _read_cached(self, entry: Dict[str, Any]) -> AsyncIterator[bytes]:
+        """Yield a cached body in chunks, reading the file off the event loop."""
+        chunks = self.cache.iter_body(entry, STREAM_CHUNK_SIZE)
+        try:
+            while True:
+                chunk = await asyncio.to_thread(next, chunks, b"")
+                if not chunk:
+                    return
+                yield chunk
+        finally:
+            chunks.close()
+
+    async def _send(
+        self,
+        method: str,
+        url: str,
+        params: Optional[Dict[str, Any]],
+        json_body: Any,
+        headers: Optional[Dict[str, str]] = None,
+        idempotent: Optional[bool] = None,
+    ) -> aiohttp.ClientResponse:
+        """
+        Send a request through the host's rate limiter, retrying idempotent
+        requests on 429/5xx responses and connection errors.
+
+        Returns the final response (to be used as an async context manager),
+        which may still carry an error status once retries are exhausted.
+        Within a ``rate_limit.deadline`` each attempt's timeout is capped to
+        the time left and retries that cannot finish in time are not made.
+        """
+        if idempotent is None:
+            idempotent = method.upper() in IDEMPOTENT_METHODS
+        limiter = self.rate_limiters.get(urlparse(url).hostname or "")
+        session = await self.session()
+
+        attempt = 0
+        while True:
+            attempt += 1
+            if limiter is not None:
+                await limiter.acquire()
+            try:
+                response = await session.request(
+                    method, url, params=params, json=json_body, headers=headers, timeout=self._attempt_timeout()
+                )
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                delay = self.retry_policy.backoff(attempt)
+                if not (idempotent and self.retry_policy.should_retry(attempt, delay=delay)):
+                    raise
+                self.retry_stats["retries"] += 1
+                await asyncio.sleep(delay)
+                continue
+
+            if limiter is not None:
+                limiter.update_from_headers(response.headers)
+            if response.status not in RETRYABLE_STATUSES:
+                return response
+
+            retry_after = parse_retry_after(response.headers)
+            if response.status == 429 and limiter is not None:
+                limiter.throttle(retry_after)
+            delay = self.retry_policy.backoff(attempt, retry_after)
+            if not (idempotent and self.retry_policy.should_retry(attempt, response.status, delay)):
+                self.retry_stats["gave_up"] += 1
+                print(f"⚠️ {method} {urlparse(url).path} failed with {response.status} after {attempt} attempt(s)")
+                return response
+
+            response.release()
+            self.retry_stats["retries"] += 1
+            await asyncio.sleep(delay)
+
+    def _attempt_timeout(self) -> aiohttp.ClientTimeout:
+        """The session timeout, with its total capped to the current deadline."""
+        left = time_left()
+        if left is None:
+            return self.timeout
+        if left <= 0:
+            raise DeadlineExceeded("source deadline passed before the request was sent")
+        total = min(self.timeout.total, left) if self.timeout.total else left
+        return aiohttp.ClientTimeout(total=total, sock_connect=self.timeout.sock_connect, sock_read=self.timeout.sock_read)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get connection pool configuration, cache, retry and rate limit statistics."""
+        return {
+            "active": self._session is not None and not self._session.closed,
+            "total_connections": self.total_connections,
+            "connections_per_host": self.connections_per_host,
+            "dns_cache_ttl": self.dns_cache_ttl,
+            "keepalive_timeout": self.keepalive_timeout,
+            "total_timeout": self.timeout.total,
+            "cache": self.cache.get_stats() if self.cache is not None else None,
+            "retries": dict(self.retry_stats),
+            "rate_limits": {host: limiter.get_stats() for host, limiter in self.rate_limiters.items()},
+        }
+
+
+_http_client: Optional[SpaceHTTPClient] = None
+
+
+def get_http_client() -> SpaceHTTPClient:
+    """Return the process-wide HTTP client."""
+    global _http_client
+    if _http_client is None:
+        # One limiter for the NASA API host: every NASA fetcher draws on the same key's quota
+        nasa_host = urlparse(os.getenv("NASA_BASE_URL", "https://api.nasa.gov")).hostname
+        _http_client = SpaceHTTPClient(
+            cache=HTTPResponseCache(),
+            rate_limiters={nasa_host: AdaptiveRateLimiter.for_nasa()},
+        )
+    return _http_client
+
+
+async def close_http_client():
+    """Close the process-wide HTTP client (called on app shutdown)."""
+    global _http_client
+    if _http_client is not None:
+        await _http_client.close()
+        _http_client = None
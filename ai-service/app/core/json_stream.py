@@ -0,0 +1,163 @@
+# Incremental JSON Array Parsing
+
+import codecs
+import json
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional
+
+_WHITESPACE = " \t\n\r"
+
+
+class JSONArrayStreamParser:
+    """
+    Incrementally parses the items of a JSON array fed in arbitrary chunks.
+
+    The array is either the top-level value, or (with ``key``) the value of a
+    key in a top-level object, e.g. ``{"docs": [...], "totalDocs": 10}``. Only
+    the current partial item is buffered, so arbitrarily long arrays are parsed
+    in constant memory. The object's other values (e.g. pagination fields,
+    before or after the array) are collected in ``fields``.
+    """
+
+    def __init__(self, key: Optional[str] = None):
+        self.key = key
+        self._decoder = json.JSONDecoder()
+        self._text_decoder = codecs.getincrementaldecoder("utf-8")()
+        self._buffer = ""
+        self._pos = 0
+        self._state = "start"
+        self._current_key = None
+        self.fields: Dict[str, Any] = {}
+        self.done = False
+
+    def feed(self, chunk: bytes, final: bool = False) -> List[Any]:
+        """Feed raw bytes and return every array item completed by them."""
+        self._buffer = self._buffer[self._pos:] + self._text_decoder.decode(chunk, final=final)
+        self._pos = 0
+        items = list(self._parse(final))
+        if final and not self.done:
+            raise ValueError("Unexpected end of JSON stream")
+        return items
+
+    def _skip_whitespace(self):
+        while self._pos < len(self._buffer) and self._buffer[self._pos] in _WHITESPACE:
+            self._pos += 1
+
+    def _peek(self) -> Optional[str]:
+        self._skip_whitespace()
+        return self._buffer[self._pos] if self._pos < len(self._buffer) else None
+
+    def _decode_value(self, final: bool):
+        """Decode one complete value at the cursor, or return None if more data is needed."""
+        try:
+            value, end = self._decoder.raw_decode(self._buffer, self._pos)
+        except json.JSONDecodeError:
+            if final:
+                raise
+            return None
+        # A value touching the end of the buffer may be a truncated number or literal
+        if end == len(self._buffer) and not final:
+            return None
+        self._pos = end
+        return (value,)
+
+    def _parse(self, final: bool) -> Iterator[Any]:
+        while self._state != "end":
+            char = self._peek()
+            if char is None:
+                return
+
+            if self._state == "start":
+                expected = "{" if self.key else "["
+                if char != expected:
+                    raise ValueError(f"Expected '{expected}' at start of JSON stream, got '{char}'")
+                self._pos += 1
+                self._state = "object_key" if self.key else "array_item"
+
+            elif self._state == "object_key":
+                if char == "}":
+                    # End of the object (a missing key reads as an empty array)
+                    self._pos += 1
+                    self.done = True
+                    self._state = "end"
+                elif char == ",":
+                    self._pos += 1
+                else:
+                    decoded = self._decode_value(final)
+                    if decoded is None:
+                        return
+                    self._current_key = decoded[0]
+                    self._state = "object_colon"
+
+            elif self._state == "object_colon":
+                if char != ":":
+                    raise ValueError(f"Expected ':' after object key, got '{char}'")
+                self._pos += 1
+                self._state = "array_open" if self._current_key == self.key else "object_value"
+
+            elif self._state == "object_value":
+                decoded = self._decode_value(final)
+                if decoded is None:
+                    return
+                self.fields[self._current_key] = decoded[0]
+                self._state = "object_key"
+
+            elif self._state == "array_open":
+                if char != "[":
+                    raise ValueError(f"Expected '[' for key '{self.key}', got '{char}'")
+                self._pos += 1
+                self._state = "array_item"
+
+            elif self._state == "array_item":
+                if char == "]":
+                    self._pos += 1
+                    if self.key:
+                        # Keep reading the object's remaining fields
+                        self._state = "object_key"
+                    else:
+                        self.done = True
+                        self._state = "end"
+                elif char == ",":
+                    self._pos += 1
+                else:
+                    decoded = self._decode_value(final)
+                    if decoded is None:
+                        return
+                    yield decoded[0]
+
+
+async def iter_json_array(
+    chunks: AsyncIterator[bytes],
+    key: Optional[str] = None,
+    limit: Optional[int] = None,
+    fields: Optional[Dict[str, Any]] = None,
+) -> AsyncIterator[Any]:
+    """
+    Yield array items from an async byte stream, stopping after ``limit`` items.
+    With ``key``, the object's other fields are copied into ``fields`` once the
+    whole body has been parsed. An empty stream (no body) yields nothing.
+    """
+    parser = JSONArrayStreamParser(key=key)
+    count = 0
+    received = False
+    try:
+        # Keep reading after the array closes so a complete body can be cached
+        async for chunk in chunks:
+            received = received or bool(chunk)
+            for item in parser.feed(chunk):
+                yield item
+                count += 1
+                if limit is not None and count >= limit:
+                    return
+        if not received:
+            return
+        for item in parser.feed(b"", final=True):
+            yield item
+            count += 1
+            if limit is not None and count >= limit:
+                return
+        if fields is not None:
+            fields.update(parser.fields)
+    finally:
+        # Stop reading the underlying response as soon as we are done with it
+        if hasattr(chunks, "aclose"):
+            await chunks.aclose()
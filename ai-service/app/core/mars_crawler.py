@@ -0,0 +1,219 @@
+# NASA Mars Rover Photos Crawler
+
+import asyncio
+import json
+import math
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from app.core.http_client import get_http_client
+
+# Photos per page served by the Mars Rover Photos API
+MARS_PAGE_SIZE = 25
+
+
+def map_mars_photo(photo: Dict[str, Any]) -> Dict[str, Any]:
+    """Map a Mars Rover Photos API photo to our raw record shape."""
+    camera = photo.get("camera") or {}
+    rover = photo.get("rover") or {}
+    return {
+        "type": "mars_photo",
+        "id": photo.get("id"),
+        "sol": photo.get("sol"),
+        "camera": camera.get("full_name"),
+        "img_src": photo.get("img_src"),
+        "earth_date": photo.get("earth_date"),
+        "rover": rover.get("name"),
+        "rover_status": rover.get("status"),
+        "landing_date": rover.get("landing_date"),
+        "source": "NASA Mars Photos"
+    }
+
+
+class MarsPhotoCrawler:
+    """
+    Crawls Mars rover photos across rovers and sol ranges.
+
+    Each rover's mission manifest tells us how many photos (and therefore
+    pages) every sol has, so all pages can be queued up front and fetched by
+    a bounded pool of workers; sols without photos are never requested. If a
+    manifest is unavailable the crawler pages through each sol until a short
+    page comes back. Requests go through the shared HTTP client, so the whole
+    crawl stays under the api.nasa.gov rate limit.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        api_key: str,
+        data_dir: str = "training_data",
+        concurrency: int = 8,
+    ):
+        self.base_url = base_url
+        self.api_key = api_key
+        self.data_dir = Path(data_dir)
+        self.concurrency = concurrency
+
+    async def sol_page_counts(self, rover: str, sol_start: int, sol_end: int) -> Optional[Dict[int, int]]:
+        """Return the number of photo pages per sol in range, or None if the manifest is unavailable."""
+        data = await get_http_client().get_json(
+            f"{self.base_url}/mars-photos/api/v1/manifests/{rover}",
+            params={"api_key": self.api_key}
+        )
+        if data is None:
+            return None
+
+        return {
+            entry["sol"]: math.ceil(entry["total_photos"] / MARS_PAGE_SIZE)
+            for entry in data.get("photo_manifest", {}).get("photos", [])
+            if sol_start <= entry.get("sol", -1) <= sol_end and entry.get("total_photos")
+        }
+
+    async def _fetch_page(self, rover: str, sol: int, page: int) -> Optional[List[Dict]]:
+        """Fetch one page of a rover's photos for a sol."""
+        try:
+            data = await get_http_client().get_json(
+                f"{self.base_url}/mars-photos/api/v1/rovers/{rover}/photos",
+                params={"api_key": self.api_key, "sol": sol, "page": page}
+            )
+        except Exception as e:
+            print(f"⚠️ Mars photos {rover} sol {sol} page {page} failed: {e}")
+            return None
+        if data is None:
+            return None
+        return data.get("photos", [])
+
+    def _load_seen_ids(self, output_path: Path) -> Set[int]:
+        """Collect photo ids already written by previous crawls."""
+        seen = set()
+        if output_path.exists():
+            with open(output_path, "r") as f:
+                for line in f:
+                    if line.strip():
+                        seen.add(json.loads(line).get("id"))
+        return seen
+
+    async def crawl(
+        self,
+        rovers: List[str],
+        sol_start: int,
+        sol_end: Optional[int] = None,
+        max_photos: Optional[int] = None,
+        output_file: Optional[str] = None,
+        use_manifest: bool = True,
+    ) -> Dict[str, Any]:
+        """
+        Crawl photos for every rover and sol in ``[sol_start, sol_end]``.
+
+        Photos are deduplicated by id. When ``output_file`` is given they are
+        appended to it as JSON lines as pages complete (skipping ids already in
+        the file) and are not kept in memory; otherwise they are returned. A
+        page that fails to fetch, map or write is counted in ``pages_failed``
+        and its photos are left unseen, so the crawl carries on without it.
+        """
+        start = time.perf_counter()
+        sol_end = sol_start if sol_end is None else sol_end
+
+        # Plan the pages: (rover, sol, page, follow) where follow means "queue
+        # the next page if this one is full" for sols without a manifest entry
+        queue: asyncio.Queue[Tuple[str, int, int, bool]] = asyncio.Queue()
+        manifests = await asyncio.gather(*[
+            self.sol_page_counts(rover, sol_start, sol_end) if use_manifest else asyncio.sleep(0)
+            for rover in rovers
+        ])
+        for rover, page_counts in zip(rovers, manifests):
+            if page_counts is None:
+                for sol in range(sol_start, sol_end + 1):
+                    queue.put_nowait((rover, sol, 1, True))
+            else:
+                for sol, pages in sorted(page_counts.items()):
+                    for page in range(1, pages + 1):
+                        queue.put_nowait((rover, sol, page, False))
+        pages_planned = queue.qsize()
+
+        output_path = self.data_dir / output_file if output_file else None
+        if output_path:
+            output_path.parent.mkdir(parents=True, exist_ok=True)
+        # File reads and writes run off the event loop
+        seen = await asyncio.to_thread(self._load_seen_ids, output_path) if output_path else set()
+
+        photos = []
+        stats = {"pages_fetched": 0, "pages_failed": 0, "photos_written": 0, "duplicates_skipped": 0}
+        out = await asyncio.to_thread(open, output_path, "a") if output_path else None
+        write_lock = asyncio.Lock()  # The file object is not safe to write from two threads at once
+
+        async def worker():
+            while True:
+                rover, sol, page, follow = await queue.get()
+                try:
+                    if max_photos is not None and stats["photos_written"] >= max_photos:
+                        continue
+                    batch = await self._fetch_page(rover, sol, page)
+                    if batch is None:
+                        stats["pages_failed"] += 1
+                        continue
+                    stats["pages_fetched"] += 1
+                    if follow and len(batch) == MARS_PAGE_SIZE:
+                        queue.put_nowait((rover, sol, page + 1, True))
+
+                    # Claim ids and the photo budget before awaiting the write, so
+                    # other workers neither duplicate nor overshoot them; a
+                    # failed page releases both
+                    claimed_ids = set()
+                    claimed = 0
+                    try:
+                        new_photos = []
+                        for photo in batch:
+                            if photo.get("id") in seen or photo.get("id") in claimed_ids:
+                                stats["duplicates_skipped"] += 1
+                                continue
+                            new_photos.append(map_mars_photo(photo))
+                            claimed_ids.add(photo.get("id"))
+                        if max_photos is not None:
+                            new_photos = new_photos[:max(0, max_photos - stats["photos_written"])]
+                            claimed_ids = {photo["id"] for photo in new_photos}
+                        seen.update(claimed_ids)
+                        claimed = len(new_photos)
+                        stats["photos_written"] += claimed
+
+                        if out:
+                            lines = "".join(json.dumps(photo, default=str) + "\n" for photo in new_photos)
+                            async with write_lock:
+                                await asyncio.to_thread(out.write, lines)
+                        else:
+                            photos.extend(new_photos)
+                    except Exception as e:
+                        print(f"⚠️ Mars photos {rover} sol {sol} page {page} could not be processed: {e}")
+                        seen.difference_update(claimed_ids)
+                        stats["photos_written"] -= claimed
+                        stats["pages_failed"] += 1
+                finally:
+                    queue.task_done()
+
+        # A small crawl only needs as many workers as pages it can use
+        worker_count = self.concurrency
+        if max_photos is not None:
+            worker_count = min(worker_count, max(1, math.ceil(max_photos / MARS_PAGE_SIZE)))
+        workers = [asyncio.create_task(worker()) for _ in range(worker_count)]
+        try:
+            await queue.join()
+        finally:
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+            if out:
+                await asyncio.to_thread(out.close)
+
+        elapsed = time.perf_counter() - start
+        return {
+            "photos": photos,
+            "stats": {
+                "rovers": rovers,
+                "sol_range": [sol_start, sol_end],
+                "pages_planned": pages_planned,
+                **stats,
+                "elapsed_seconds": round(elapsed, 3),
+                "photos_per_sec": round(stats["photos_written"] / elapsed, 2) if elapsed > 0 else 0.0,
+            }
+        }
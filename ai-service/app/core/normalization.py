@@ -0,0 +1,354 @@
+# Table-driven Record Normalization
+
+import asyncio
+import math
+import multiprocessing
+import os
+import string
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from app.core.record_ids import content_hash, stable_record_id
+
+# Vectorized computation of a template-only column from a batch frame
+Derivation = Callable[[pd.DataFrame], pd.Series]
+
+# Batches at least this large are sharded across worker processes; smaller ones run inline
+NORMALIZE_PROCESS_THRESHOLD = int(os.getenv("NORMALIZE_PROCESS_THRESHOLD", 20000))
+NORMALIZE_WORKERS = int(os.getenv("NORMALIZE_WORKERS", min(4, os.cpu_count() or 1)))
+NORMALIZE_SHARD_SIZE = int(os.getenv("NORMALIZE_SHARD_SIZE", 5000))
+
+_process_pool: Optional[ProcessPoolExecutor] = None
+
+
+def get_process_pool() -> ProcessPoolExecutor:
+    """Return the shared normalization process pool, starting it on first use."""
+    global _process_pool
+    if _process_pool is None:
+        # spawn: forking a process that runs an event loop and I/O threads is unsafe
+        _process_pool = ProcessPoolExecutor(
+            max_workers=NORMALIZE_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _process_pool
+
+
+def shutdown_process_pool():
+    """Stop the normalization worker processes (called on app shutdown)."""
+    global _process_pool
+    if _process_pool is not None:
+        _process_pool.shutdown(wait=False, cancel_futures=True)
+        _process_pool = None
+
+
+def _normalize_shard(normalizer: "RecordNormalizer", records: List[Dict[str, Any]], timestamp: str) -> List[Dict[str, Any]]:
+    """Worker-process entry point: normalize one contiguous shard of a batch."""
+    return normalizer.normalize(records, timestamp=timestamp)
+
+
+class RecordSpec:
+    """
+    Declares how one raw record type is normalized.
+
+    ``fields`` maps each output ``data`` key to the raw field it is read from.
+    ``template`` is a ``str.format``-style text template whose placeholders
+    name raw fields or ``derived`` columns; values render exactly as they
+    would in an f-string (``None`` becomes ``"None"``).
+    """
+
+    def __init__(
+        self,
+        record_type: str,
+        fields: Dict[str, str],
+        template: str,
+        derived: Optional[Dict[str, Derivation]] = None,
+    ):
+        self.record_type = record_type
+        self.fields = fields
+        self.template = template
+        self.derived = derived or {}
+
+        # (literal text, placeholder or None) pairs in template order
+        self.parts = [(literal, name) for literal, name, _, _ in string.Formatter().parse(template)]
+        self.placeholders = [name for _, name in self.parts if name is not None]
+
+        # Raw fields a batch frame needs: data fields plus template inputs
+        columns = list(dict.fromkeys(fields.values()))
+        for name in self.placeholders:
+            if name not in self.derived and name not in columns:
+                columns.append(name)
+        self.raw_columns = columns
+
+    def render(self, frame: pd.DataFrame) -> pd.Series:
+        """Render the text template for every row of a batch frame at once."""
+        text = pd.Series("", index=frame.index, dtype=object)
+        for literal, name in self.parts:
+            if literal:
+                text = text + literal
+            if name is not None:
+                # map(str) renders None as "None" like an f-string (astype(str) would keep NaN)
+                text = text + frame[name].map(str)
+        return text
+
+
+class RecordNormalizer:
+    """
+    Normalizes raw records into the training record shape using a registry
+    of ``RecordSpec``s.
+
+    Records are grouped by type with a single dict lookup each; every group
+    is then normalized in one columnar pass and the output keeps the input
+    order. Records of unregistered types are dropped.
+
+    Records without an upstream ``id`` get a deterministic one (see
+    ``app.core.record_ids``), and every record carries a ``content_hash``
+    that ignores the per-run ``timestamp`` so re-ingested records can be
+    compared with stored ones.
+    """
+
+    def __init__(self, specs: List[RecordSpec]):
+        self.specs = {spec.record_type: spec for spec in specs}
+
+    def normalize(self, records: List[Dict[str, Any]], timestamp: Optional[str] = None) -> List[Dict[str, Any]]:
+        timestamp = timestamp or datetime.now().isoformat()
+
+        positions: Dict[str, List[int]] = {}
+        for position, record in enumerate(records):
+            record_type = record.get("type")
+            if record_type in self.specs:
+                positions.setdefault(record_type, []).append(position)
+
+        normalized: List[Optional[Dict[str, Any]]] = [None] * len(records)
+        for record_type, type_positions in positions.items():
+            batch = [records[position] for position in type_positions]
+            for position, output in zip(type_positions, self._normalize_batch(self.specs[record_type], batch, timestamp)):
+                normalized[position] = output
+
+        return [record for record in normalized if record is not None]
+
+    async def normalize_async(
+        self,
+        records: List[Dict[str, Any]],
+        threshold: Optional[int] = None,
+        workers: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Normalize without holding the event loop for large batches.
+
+        Batches smaller than ``threshold`` (``NORMALIZE_PROCESS_THRESHOLD``)
+        run inline. Larger ones are split into contiguous shards (at least one
+        per worker process, at most ``NORMALIZE_SHARD_SIZE`` records each) and
+        the shard results are concatenated in order, so the output matches
+        ``normalize`` (including the shared timestamp).
+        """
+        threshold = NORMALIZE_PROCESS_THRESHOLD if threshold is None else threshold
+        workers = workers or NORMALIZE_WORKERS
+        if len(records) < threshold or workers < 2:
+            return self.normalize(records)
+
+        timestamp = datetime.now().isoformat()
+        # At least one shard per worker, capped so no single shard's pickling holds the GIL for long
+        shard_size = min(math.ceil(len(records) / workers), NORMALIZE_SHARD_SIZE)
+        loop = asyncio.get_running_loop()
+        pool = get_process_pool()
+        shards = await asyncio.gather(*[
+            loop.run_in_executor(pool, _normalize_shard, self, records[start:start + shard_size], timestamp)
+            for start in range(0, len(records), shard_size)
+        ])
+        return [record for shard in shards for record in shard]
+
+    def _normalize_batch(self, spec: RecordSpec, batch: List[Dict[str, Any]], timestamp: str) -> List[Dict[str, Any]]:
+        # Object dtype keeps every value exactly as fetched (None stays None, ints stay ints)
+        frame = pd.DataFrame(
+            {column: [record.get(column) for record in batch] for column in spec.raw_columns},
+            dtype=object,
+        )
+        for name, derive in spec.derived.items():
+            frame[name] = derive(frame)
+
+        data_keys = list(spec.fields)
+        data_columns = [frame[column].tolist() for column in spec.fields.values()]
+        text = spec.render(frame)
+
+        ids = [
+            record.get("id") or stable_record_id(spec.record_type, record)
+            for record in batch
+        ]
+        normalized = [
+            {
+                "id": record_id,
+                "type": spec.record_type,
+                "source": record.get("source"),
+                "timestamp": timestamp,
+                "data": data_row,
+                "text_content": text_content,
+            }
+            for record_id, record, data_row, text_content in zip(
+                ids, batch, (dict(zip(data_keys, row)) for row in zip(*data_columns)), text.tolist()
+            )
+        ]
+        for record in normalized:
+            record["content_hash"] = content_hash(record)
+        return normalized
+
+
+def _launch_outcome(frame: pd.DataFrame) -> pd.Series:
+    success = frame["success"]
+    outcome = np.where(success == True, "successful", np.where(success == False, "unsuccessful", "pending"))  # noqa: E712
+    return pd.Series(outcome, index=frame.index, dtype=object)
+
+
+def _launch_details(frame: pd.DataFrame) -> pd.Series:
+    details = frame["details"]
+    return details.where(details.notna() & (details != ""), "")
+
+
+def _payload_customers(frame: pd.DataFrame) -> pd.Series:
+    return frame["customers"].map(lambda customers: ", ".join(customers) if customers else "Unknown")
+
+
+NASA_RECORD_SPECS = [
+    RecordSpec(
+        "apod",
+        fields={
+            "title": "title",
+            "description": "explanation",
+            "date": "date",
+            "media_url": "url",
+            "media_type": "media_type",
+        },
+        template="NASA Astronomy Picture: {title}. {explanation}",
+    ),
+    RecordSpec(
+        "neo",
+        fields={
+            "name": "name",
+            "hazardous": "potentially_hazardous",
+            "magnitude": "absolute_magnitude",
+            "diameter": "estimated_diameter",
+            "orbital_info": "orbital_data",
+        },
+        template="Near-Earth Object: {name}. Potentially hazardous: {potentially_hazardous}. Magnitude: {absolute_magnitude}",
+    ),
+    RecordSpec(
+        "mars_photo",
+        fields={
+            "sol": "sol",
+            "camera": "camera",
+            "rover": "rover",
+            "earth_date": "earth_date",
+            "image_url": "img_src",
+        },
+        template="Mars photo from {rover} rover on sol {sol} using {camera} camera",
+    ),
+    RecordSpec(
+        "exoplanet",
+        fields={
+            "planet_name": "planet_name",
+            "host_star": "host_star",
+            "discovery_year": "discovery_year",
+            "orbital_period": "orbital_period",
+            "radius": "planet_radius",
+            "mass": "planet_mass",
+            "distance": "stellar_distance",
+        },
+        template="Exoplanet {planet_name} orbiting {host_star}, discovered in {discovery_year}",
+    ),
+    RecordSpec(
+        "technology",
+        fields={
+            "title": "title",
+            "description": "description",
+            "benefits": "benefits",
+            "status": "status",
+            "program": "program",
+        },
+        template="NASA Technology: {title}. {description} Benefits: {benefits}",
+    ),
+]
+
+SPACEX_RECORD_SPECS = [
+    RecordSpec(
+        "launch",
+        fields={
+            "name": "name",
+            "date": "date_utc",
+            "success": "success",
+            "details": "details",
+            "flight_number": "flight_number",
+            "rocket": "rocket",
+            "payloads": "payloads",
+        },
+        template="SpaceX Launch: {name} - Flight #{flight_number} was {outcome}. {details_text}",
+        derived={"outcome": _launch_outcome, "details_text": _launch_details},
+    ),
+    RecordSpec(
+        "rocket",
+        fields={
+            "name": "name",
+            "description": "description",
+            "height": "height",
+            "diameter": "diameter",
+            "mass": "mass",
+            "cost_per_launch": "cost_per_launch",
+            "success_rate": "success_rate_pct",
+        },
+        template="SpaceX Rocket: {name}. {description} Success rate: {success_rate_pct}%",
+    ),
+    RecordSpec(
+        "capsule",
+        fields={
+            "serial": "serial",
+            "status": "status",
+            "type": "capsule_type",
+            "reuse_count": "reuse_count",
+            "water_landings": "water_landings",
+            "land_landings": "land_landings",
+        },
+        template="SpaceX Capsule {serial} ({capsule_type}) - Status: {status}, Reused {reuse_count} times",
+    ),
+    RecordSpec(
+        "crew",
+        fields={
+            "name": "name",
+            "agency": "agency",
+            "status": "status",
+            "launches": "launches",
+        },
+        template="SpaceX Crew Member: {name} from {agency} - Status: {status}",
+    ),
+    RecordSpec(
+        "payload",
+        fields={
+            "name": "name",
+            "type": "payload_type",
+            "mass_kg": "mass_kg",
+            "orbit": "orbit",
+            "customers": "customers",
+            "manufacturers": "manufacturers",
+            "norad_ids": "norad_ids",
+        },
+        template="SpaceX Payload: {name} ({payload_type}) - Mass: {mass_kg}kg, Customers: {customer_names}",
+        derived={"customer_names": _payload_customers},
+    ),
+    RecordSpec(
+        "starlink",
+        fields={
+            "object_name": "object_name",
+            "norad_cat_id": "norad_cat_id",
+            "launch_date": "launch_date",
+            "height_km": "height_km",
+            "velocity_kms": "velocity_kms",
+            "longitude": "longitude",
+            "latitude": "latitude",
+        },
+        template="Starlink Satellite: {object_name} at {height_km}km altitude, velocity {velocity_kms}km/s",
+    ),
+]
+
+NASA_NORMALIZER = RecordNormalizer(NASA_RECORD_SPECS)
+SPACEX_NORMALIZER = RecordNormalizer(SPACEX_RECORD_SPECS)
@@ -0,0 +1,292 @@
+# Streaming Ingestion Pipeline
+
+import asyncio
+import os
+import time
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+from app.core.data_quality import DataQualityProfiler
+from app.core.fanout import DEFAULT_MAX_CONCURRENCY, DEFAULT_SOURCE_TIMEOUT
+from app.core.rate_limit import deadline
+from app.core.normalization import RecordNormalizer
+from app.core.record_store import RecordStore
+
+# Async generator of raw records for one upstream source
+SourceStream = Callable[[], AsyncIterator[Dict]]
+
+INGEST_QUEUE_SIZE = int(os.getenv("INGEST_QUEUE_SIZE", 2000))
+INGEST_BATCH_SIZE = int(os.getenv("INGEST_BATCH_SIZE", 500))
+
+# Marks the end of a stage's output
+_END = object()
+
+# Most recently started pipeline, for live stats
+_latest_pipeline: Optional["IngestionPipeline"] = None
+
+
+def stream_of(fetch: Callable[[], Awaitable[List[Dict]]]) -> SourceStream:
+    """Adapt a list-returning fetcher to a pipeline source stream."""
+    async def stream() -> AsyncIterator[Dict]:
+        for record in await fetch():
+            yield record
+    return stream
+
+
+def get_pipeline_stats() -> Optional[List[Dict[str, Any]]]:
+    """Return per-stage stats of the running (or last finished) ingestion pipeline."""
+    return _latest_pipeline.stats() if _latest_pipeline is not None else None
+
+
+class StageStats:
+    """Throughput and input queue depth of one pipeline stage."""
+
+    def __init__(self, name: str, queue: Optional[asyncio.Queue] = None, unit: str = "records"):
+        self.name = name
+        self.queue = queue
+        self.unit = unit
+        self.items_in = 0
+        self.items_out = 0
+        self.busy_seconds = 0.0
+        self.max_queue_depth = 0
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+
+    def observe_queue(self):
+        if self.queue is not None:
+            self.max_queue_depth = max(self.max_queue_depth, self.queue.qsize())
+
+    def to_dict(self) -> Dict[str, Any]:
+        end = self.finished_at or time.perf_counter()
+        elapsed = end - self.started_at if self.started_at else 0.0
+        return {
+            "stage": self.name,
+            "records_in": self.items_in,
+            "records_out": self.items_out,
+            "busy_seconds": round(self.busy_seconds, 3),
+            "elapsed_seconds": round(elapsed, 3),
+            "records_per_sec": round(self.items_out / elapsed, 1) if elapsed > 0 else 0.0,
+            "queue_depth": self.queue.qsize() if self.queue is not None else None,
+            "max_queue_depth": self.max_queue_depth if self.queue is not None else None,
+            "queue_capacity": self.queue.maxsize if self.queue is not None else None,
+            "queue_unit": self.unit,
+            "running": self.started_at is not None and self.finished_at is None,
+        }
+
+
+class IngestionPipeline:
+    """
+    Streams raw records from upstream sources into the record store.
+
+    Four stages run concurrently, connected by bounded queues so a slow
+    stage pauses the ones feeding it instead of letting records pile up:
+
+    - fetch: every source's async generator, fanned in to one queue
+    - normalize: micro-batches through the group's ``RecordNormalizer``,
+      folding each batch into a running ``DataQualityProfiler``
+    - dedupe: drops records whose content hash matches the stored one,
+      looking up the stored hashes one batch at a time
+    - write: batched upserts into the ``RecordStore``
+
+    Nothing is loaded from the stored corpus up front; only the ids fetched
+    this run are held for the whole run.
+    """
+
+    def __init__(
+        self,
+        store: RecordStore,
+        normalizers: Dict[str, RecordNormalizer],
+        queue_size: int = INGEST_QUEUE_SIZE,
+        batch_size: int = INGEST_BATCH_SIZE,
+        source_timeout: float = DEFAULT_SOURCE_TIMEOUT,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    ):
+        self.store = store
+        self.normalizers = normalizers
+        self.batch_size = batch_size
+        self.source_timeout = source_timeout
+        self.max_concurrency = max_concurrency
+
+        # Raw records are queued one by one, later stages pass batches
+        self.raw_queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        batch_slots = max(2, queue_size // batch_size)
+        self.normalized_queue: asyncio.Queue = asyncio.Queue(maxsize=batch_slots)
+        self.write_queue: asyncio.Queue = asyncio.Queue(maxsize=batch_slots)
+
+        self.stage_stats = {
+            "fetch": StageStats("fetch"),
+            "normalize": StageStats("normalize", self.raw_queue),
+            "dedupe": StageStats("dedupe", self.normalized_queue, unit="batches"),
+            "write": StageStats("write", self.write_queue, unit="batches"),
+        }
+
+    def stats(self) -> List[Dict[str, Any]]:
+        return [stats.to_dict() for stats in self.stage_stats.values()]
+
+    async def run(
+        self,
+        sources: Dict[str, Tuple[str, SourceStream]],
+        watermark_fields: Optional[Dict[str, str]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Run every source through the pipeline.
+
+        ``sources`` maps a source name to its record group (``nasa``/``spacex``)
+        and stream. Returns per-source reports, change counts, the ids seen this run, the
+        newest watermark field value per source and a quality profile of the
+        fetched records (updated batch by batch as they are normalized).
+        """
+        global _latest_pipeline
+        _latest_pipeline = self
+        watermark_fields = watermark_fields or {}
+
+        self.reports: Dict[str, Dict[str, Any]] = {}
+        self.newest: Dict[str, Optional[str]] = {}
+        self.changes = {"new": 0, "changed": 0, "unchanged": 0}
+        self.seen_ids: Set[Any] = set()
+        self.quality = DataQualityProfiler()
+
+        stages = [
+            self._fetch_stage(sources, watermark_fields),
+            self._normalize_stage(),
+            self._dedupe_stage(),
+            self._write_stage(),
+        ]
+        tasks = [asyncio.create_task(stage) for stage in stages]
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+
+        return {
+            "source_reports": self.reports,
+            "changes": self.changes,
+            "seen_ids": self.seen_ids,
+            "newest": self.newest,
+            "fetched_records": self.stage_stats["fetch"].items_out,
+            "quality": self.quality.report(),
+            "stages": self.stats(),
+        }
+
+    async def _fetch_stage(self, sources: Dict[str, Tuple[str, SourceStream]], watermark_fields: Dict[str, str]):
+        stats = self.stage_stats["fetch"]
+        stats.started_at = time.perf_counter()
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def run_source(name: str, group: str, stream: SourceStream):
+            field = watermark_fields.get(name)
+            report = {"status": "ok", "records": 0}
+
+            async def consume():
+                async for record in stream():
+                    report["records"] += 1
+                    if field and not record.get("upcoming"):
+                        value = record.get(field)
+                        if value and (self.newest.get(name) is None or value > self.newest[name]):
+                            self.newest[name] = value
+                    await self.raw_queue.put((group, record))
+                    stats.items_out += 1
+                    self.stage_stats["normalize"].observe_queue()
+
+            async with semaphore:
+                start = time.perf_counter()
+                try:
+                    with deadline(self.source_timeout):
+                        await asyncio.wait_for(consume(), timeout=self.source_timeout)
+                except asyncio.TimeoutError:
+                    report.update(status="timeout", error=f"timed out after {self.source_timeout}s")
+                except Exception as e:
+                    report.update(status="error", error=str(e))
+                report["latency_ms"] = round((time.perf_counter() - start) * 1000, 1)
+            self.reports[name] = report
+
+        try:
+            await asyncio.gather(*[
+                run_source(name, group, stream) for name, (group, stream) in sources.items()
+            ])
+        finally:
+            # Keep reports in input order
+            self.reports = {name: self.reports[name] for name in sources if name in self.reports}
+            stats.items_in = stats.items_out
+            stats.finished_at = time.perf_counter()
+            await self.raw_queue.put(_END)
+
+    async def _normalize_stage(self):
+        stats = self.stage_stats["normalize"]
+        stats.started_at = time.perf_counter()
+        done = False
+        while not done:
+            # Block for one record, then take whatever else is already queued up to a batch
+            items = [await self.raw_queue.get()]
+            while len(items) < self.batch_size and not self.raw_queue.empty():
+                items.append(self.raw_queue.get_nowait())
+            if items[-1] is _END:
+                items.pop()
+                done = True
+
+            start = time.perf_counter()
+            by_group: Dict[str, List[Dict]] = {}
+            for group, record in items:
+                by_group.setdefault(group, []).append(record)
+            for group, records in by_group.items():
+                normalized = await self.normalizers[group].normalize_async(records)
+                self.quality.update(normalized)
+                stats.items_out += len(normalized)
+                if normalized:
+                    await self.normalized_queue.put((group, normalized))
+                    self.stage_stats["dedupe"].observe_queue()
+            stats.items_in += len(items)
+            stats.busy_seconds += time.perf_counter() - start
+        stats.finished_at = time.perf_counter()
+        await self.normalized_queue.put(_END)
+
+    async def _dedupe_stage(self):
+        stats = self.stage_stats["dedupe"]
+        stats.started_at = time.perf_counter()
+        while True:
+            item = await self.normalized_queue.get()
+            if item is _END:
+                break
+            start = time.perf_counter()
+            group, records = item
+            known_hashes = await asyncio.to_thread(self.store.content_hashes, [record["id"] for record in records])
+            changed = []
+            for record in records:
+                record_id = record["id"]
+                if record_id in self.seen_ids:
+                    # Same record fetched twice in one run: the later copy wins
+                    changed.append(record)
+                    continue
+                self.seen_ids.add(record_id)
+
+                stored_hash = known_hashes.get(record_id)
+                if stored_hash == record["content_hash"]:
+                    # Unchanged: keep the stored copy and its original timestamp
+                    self.changes["unchanged"] += 1
+                    continue
+                self.changes["new" if stored_hash is None else "changed"] += 1
+                changed.append(record)
+            stats.items_in += len(records)
+            stats.items_out += len(changed)
+            stats.busy_seconds += time.perf_counter() - start
+            if changed:
+                await self.write_queue.put((group, changed))
+                self.stage_stats["write"].observe_queue()
+        stats.finished_at = time.perf_counter()
+        await self.write_queue.put(_END)
+
+    async def _write_stage(self):
+        stats = self.stage_stats["write"]
+        stats.started_at = time.perf_counter()
+        while True:
+            item = await self.write_queue.get()
+            if item is _END:
+                break
+            start = time.perf_counter()
+            group, records = item
+            # SQLite calls block, so they run off the event loop while fetching continues
+            await asyncio.to_thread(self.store.upsert_records, group, records)
+            stats.items_in += len(records)
+            stats.items_out += len(records)
+            stats.busy_seconds += time.perf_counter() - start
+        stats.finished_at = time.perf_counter()
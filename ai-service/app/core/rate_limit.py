@@ -0,0 +1,183 @@
+# Rate Limiting and Retry Policy for Upstream APIs
+
+import asyncio
+import os
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, Optional
+
+# Statuses worth retrying: quota exhaustion and transient server errors
+RETRYABLE_STATUSES = {429, 500, 502, 503, 504}
+
+# Least time worth starting another attempt with
+MIN_ATTEMPT_SECONDS = 1.0
+
+# Monotonic time by which the current source fetch must finish, set by the fan-out callers
+_deadline: ContextVar[Optional[float]] = ContextVar("upstream_deadline", default=None)
+
+
+class DeadlineExceeded(Exception):
+    """A rate-limit wait or retry would run past the caller's deadline."""
+
+
+@contextmanager
+def deadline(seconds: float) -> Iterator[None]:
+    """
+    Bound every upstream request made inside the block, retries and
+    rate-limit waits included, to ``seconds`` from now (or an enclosing,
+    earlier deadline). Tasks started inside the block inherit it.
+    """
+    at = time.monotonic() + seconds
+    outer = _deadline.get()
+    token = _deadline.set(at if outer is None else min(outer, at))
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def time_left() -> Optional[float]:
+    """Seconds until the current deadline, or None without one."""
+    at = _deadline.get()
+    return None if at is None else at - time.monotonic()
+
+
+def fits_deadline(delay: float) -> bool:
+    """Whether waiting ``delay`` seconds still leaves time for an attempt before the deadline."""
+    left = time_left()
+    return left is None or delay + MIN_ATTEMPT_SECONDS <= left
+
+
+class AdaptiveRateLimiter:
+    """
+    Token bucket shared by every request to one upstream host.
+
+    The bucket starts from a configured hourly quota and then follows the
+    server's own ``X-RateLimit-Limit`` / ``X-RateLimit-Remaining`` headers, so
+    requests are paced to the real quota ceiling instead of burning calls
+    that would come back as 429s.
+    """
+
+    def __init__(self, requests_per_hour: float, burst: Optional[float] = None):
+        self.requests_per_hour = requests_per_hour
+        self.capacity = burst or requests_per_hour
+        self.tokens = self.capacity
+        self.blocked_until = 0.0
+        self._updated = time.monotonic()
+        self.stats = {"acquired": 0, "waited_seconds": 0.0, "throttled": 0}
+
+    @property
+    def rate(self) -> float:
+        """Tokens refilled per second."""
+        return self.requests_per_hour / 3600.0
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self):
+        """
+        Wait until a request may be sent.
+
+        Checking and taking a token never awaits, so it needs no lock and
+        waiters sleep concurrently; whoever wakes to a token first takes it.
+        Raises DeadlineExceeded instead of sleeping past the current deadline.
+        """
+        while True:
+            self._refill()
+            wait = max(0.0, self.blocked_until - time.time())
+            if wait == 0.0 and self.tokens >= 1:
+                self.tokens -= 1
+                self.stats["acquired"] += 1
+                return
+            if wait == 0.0:
+                wait = (1 - self.tokens) / self.rate
+            if not fits_deadline(wait):
+                raise DeadlineExceeded(f"rate limit wait of {wait:.0f}s runs past the source deadline")
+            self.stats["waited_seconds"] += wait
+            await asyncio.sleep(wait)
+
+    def update_from_headers(self, headers: Any):
+        """Adapt the bucket to the quota the server reports."""
+        limit = headers.get("X-RateLimit-Limit")
+        remaining = headers.get("X-RateLimit-Remaining")
+        try:
+            if limit is not None:
+                limit = float(limit)
+                if limit > 0 and limit != self.requests_per_hour:
+                    self.requests_per_hour = limit
+                    self.capacity = limit
+            if remaining is not None:
+                self._refill()
+                self.tokens = min(self.tokens, float(remaining))
+        except ValueError:
+            pass
+
+    def throttle(self, retry_after: Optional[float] = None):
+        """Stop issuing requests after a 429, for ``retry_after`` seconds if given."""
+        self.stats["throttled"] += 1
+        self._refill()
+        self.tokens = 0
+        if retry_after:
+            self.blocked_until = max(self.blocked_until, time.time() + retry_after)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "requests_per_hour": self.requests_per_hour,
+            "tokens": round(self.tokens, 2),
+            **self.stats,
+        }
+
+    @classmethod
+    def for_nasa(cls) -> "AdaptiveRateLimiter":
+        """Limiter sized for the configured NASA API key (DEMO_KEY allows 30 requests/hour)."""
+        default_quota = 30 if os.getenv("NASA_API_KEY", "DEMO_KEY") == "DEMO_KEY" else 1000
+        return cls(float(os.getenv("NASA_RATE_LIMIT_PER_HOUR", default_quota)))
+
+
+class RetryPolicy:
+    """
+    Exponential backoff with full jitter for idempotent requests.
+
+    Attempts and delays are also bounded by the caller's ``deadline``: a
+    retry whose backoff would not leave time for another attempt is not made.
+    """
+
+    def __init__(
+        self,
+        max_attempts: Optional[int] = None,
+        base_delay: Optional[float] = None,
+        max_delay: Optional[float] = None,
+    ):
+        self.max_attempts = max_attempts or int(os.getenv("HTTP_RETRY_ATTEMPTS", 4))
+        self.base_delay = base_delay or float(os.getenv("HTTP_RETRY_BASE_DELAY", 0.5))
+        self.max_delay = max_delay or float(os.getenv("HTTP_RETRY_MAX_DELAY", 30))
+
+    def should_retry(self, attempt: int, status: Optional[int] = None, delay: float = 0.0) -> bool:
+        """
+        Whether to retry after ``attempt`` (1-based) failed with ``status``
+        (None for a connection error), waiting ``delay`` seconds first.
+        """
+        if attempt >= self.max_attempts or not fits_deadline(delay):
+            return False
+        return status is None or status in RETRYABLE_STATUSES
+
+    def backoff(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """Delay before the next attempt; a server-provided Retry-After wins."""
+        if retry_after is not None:
+            return min(retry_after, self.max_delay)
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** (attempt - 1))))
+
+
+def parse_retry_after(headers: Any) -> Optional[float]:
+    """Parse a Retry-After header given in seconds."""
+    value = headers.get("Retry-After")
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        return None
@@ -0,0 +1,59 @@
+# Deterministic Record IDs and Content Hashes
+
+import hashlib
+import json
+from typing import Any, Dict, Optional
+
+# Raw fields that identify a record of each type upstream. Types whose raw
+# records already carry an upstream ``id`` (APOD, launches, Mars photos,
+# Starlink) keep it; these keys cover the ones that do not.
+NATURAL_KEYS = {
+    "neo": ["name"],
+    "exoplanet": ["planet_name"],
+    "technology": ["project_id"],
+    "rocket": ["name"],
+    "capsule": ["serial"],
+    "crew": ["name"],
+    "payload": ["name"],
+    "launch": ["flight_number"],
+    "starlink": ["norad_cat_id"],  # OBJECT_NAME is reused across satellites
+}
+
+# Processed-record fields that change per run without the record changing
+VOLATILE_FIELDS = {"timestamp", "content_hash"}
+
+
+# Built once: json.dumps() with non-default options constructs an encoder per call
+_CANONICAL_ENCODER = json.JSONEncoder(sort_keys=True, separators=(",", ":"), default=str)
+
+
+def canonical_json(value: Any) -> str:
+    """Serialize a value the same way on every run and in every process."""
+    return _CANONICAL_ENCODER.encode(value)
+
+
+def _digest(payload: str, digest_size: int = 16) -> str:
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=digest_size).hexdigest()
+
+
+def stable_record_id(record_type: str, record: Dict[str, Any]) -> str:
+    """
+    Derive an id for a raw record that has no upstream ``id``.
+
+    Uses the type's natural key when all of its fields are present, otherwise
+    the whole record; either way the same record gets the same id in every
+    process (unlike ``hash()``, which Python salts per process).
+    """
+    key_fields = NATURAL_KEYS.get(record_type, [])
+    key_values = [record.get(field) for field in key_fields]
+    if key_fields and all(value is not None for value in key_values):
+        payload = canonical_json(key_values)
+    else:
+        payload = canonical_json(record)
+    return f"{record_type}_{_digest(payload)}"
+
+
+def content_hash(record: Dict[str, Any], exclude: Optional[set] = None) -> str:
+    """Hash a processed record's content, ignoring per-run fields like ``timestamp``."""
+    exclude = VOLATILE_FIELDS if exclude is None else exclude
+    return _digest(canonical_json({key: value for key, value in record.items() if key not in exclude}))
@@ -0,0 +1,265 @@
+# Indexed SQLite Record Store
+
+import json
+import sqlite3
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Set
+
+from app.core.record_ids import content_hash
+
+# Processed ``data`` field holding each type's date, for date-range slices
+RECORD_DATE_FIELDS = {
+    "apod": "date",
+    "mars_photo": "earth_date",
+    "launch": "date",
+    "starlink": "launch_date",
+}
+
+# Processed ``data`` field that names a record, for key lookups
+RECORD_KEY_FIELDS = {
+    "apod": "date",
+    "neo": "name",
+    "mars_photo": "image_url",
+    "exoplanet": "planet_name",
+    "technology": "title",
+    "launch": "flight_number",
+    "rocket": "name",
+    "capsule": "serial",
+    "crew": "name",
+    "payload": "name",
+    "starlink": "object_name",
+}
+
+# Ids per ``IN (...)`` lookup, under SQLite's default bound-parameter limit
+LOOKUP_BATCH_SIZE = 500
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS records (
+    id PRIMARY KEY,  -- untyped so upstream integer ids (Mars photos) round-trip as ints
+    record_group TEXT NOT NULL,
+    type TEXT,
+    source TEXT,
+    record_date TEXT,
+    natural_key TEXT,
+    content_hash TEXT,
+    timestamp TEXT,
+    data TEXT,
+    text_content TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_records_group ON records (record_group);
+CREATE INDEX IF NOT EXISTS idx_records_type_date ON records (type, record_date);
+CREATE INDEX IF NOT EXISTS idx_records_source ON records (source);
+CREATE INDEX IF NOT EXISTS idx_records_type_key ON records (type, natural_key);
+"""
+
+COLUMNS = ["id", "record_group", "type", "source", "record_date", "natural_key",
+           "content_hash", "timestamp", "data", "text_content"]
+
+UPSERT_SQL = (
+    f"INSERT INTO records ({', '.join(COLUMNS)}) VALUES ({', '.join('?' for _ in COLUMNS)}) "
+    "ON CONFLICT(id) DO UPDATE SET "
+    + ", ".join(f"{column} = excluded.{column}" for column in COLUMNS[1:])
+)
+
+
+def _row_values(group: str, record: Dict[str, Any]) -> tuple:
+    data = record.get("data") or {}
+    record_type = record.get("type")
+    record_date = data.get(RECORD_DATE_FIELDS.get(record_type, ""))
+    natural_key = data.get(RECORD_KEY_FIELDS.get(record_type, ""))
+    return (
+        record["id"],
+        group,
+        record_type,
+        record.get("source"),
+        str(record_date) if record_date is not None else None,
+        str(natural_key) if natural_key is not None else None,
+        record.get("content_hash") or content_hash(record),
+        record.get("timestamp"),
+        json.dumps(data, default=str),
+        record.get("text_content"),
+    )
+
+
+def _row_record(row: sqlite3.Row) -> Dict[str, Any]:
+    return {
+        "id": row["id"],
+        "type": row["type"],
+        "source": row["source"],
+        "timestamp": row["timestamp"],
+        "data": json.loads(row["data"]) if row["data"] else {},
+        "text_content": row["text_content"],
+        "content_hash": row["content_hash"],
+    }
+
+
+class RecordStore:
+    """
+    Embedded store of processed records (SQLite in WAL mode).
+
+    Records are grouped like the collected dataset (``nasa``/``spacex``) and
+    indexed by type, source, per-type date and natural key, so readers pull
+    the slice they need instead of loading the whole dataset. WAL mode lets
+    API readers query while an ingestion run is writing.
+    """
+
+    def __init__(self, data_dir: str = "training_data", filename: str = "records.db"):
+        self.data_dir = Path(data_dir)
+        self.data_dir.mkdir(parents=True, exist_ok=True)
+        self.path = self.data_dir / filename
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA synchronous=NORMAL")
+        try:
+            with conn:  # Commits on success, rolls back on error
+                yield conn
+        finally:
+            conn.close()
+
+    def upsert_records(self, group: str, records: List[Dict[str, Any]]) -> int:
+        """Insert or update records in one transaction."""
+        with self._connect() as conn:
+            conn.executemany(UPSERT_SQL, (_row_values(group, record) for record in records))
+        return len(records)
+
+    def delete_unseen(self, types: List[str], seen_ids: Set[Any]) -> int:
+        """Delete records of ``types`` whose id is not in ``seen_ids`` (types that were re-fetched in full)."""
+        if not types:
+            return 0
+        where, params = self._where(types=types)
+        with self._connect() as conn:
+            stale = [
+                (row["id"],) for row in conn.execute(f"SELECT id FROM records{where}", params)
+                if row["id"] not in seen_ids
+            ]
+            conn.executemany("DELETE FROM records WHERE id = ?", stale)
+        return len(stale)
+
+    def content_hashes(self, ids: List[Any]) -> Dict[Any, str]:
+        """Map those of ``ids`` that are stored to their content hash (for change detection without loading records)."""
+        hashes = {}
+        with self._connect() as conn:
+            for start in range(0, len(ids), LOOKUP_BATCH_SIZE):
+                batch = ids[start:start + LOOKUP_BATCH_SIZE]
+                placeholders = ", ".join("?" for _ in batch)
+                hashes.update(
+                    (row["id"], row["content_hash"])
+                    for row in conn.execute(f"SELECT id, content_hash FROM records WHERE id IN ({placeholders})", batch)
+                )
+        return hashes
+
+    def _where(
+        self,
+        group: Optional[str] = None,
+        types: Optional[List[str]] = None,
+        source: Optional[str] = None,
+        date_from: Optional[str] = None,
+        date_to: Optional[str] = None,
+        natural_key: Optional[str] = None,
+    ) -> tuple:
+        clauses, params = [], []
+        if group:
+            clauses.append("record_group = ?")
+            params.append(group)
+        if types:
+            clauses.append(f"type IN ({', '.join('?' for _ in types)})")
+            params.extend(types)
+        if source:
+            clauses.append("source = ?")
+            params.append(source)
+        if date_from:
+            clauses.append("record_date >= ?")
+            params.append(date_from)
+        if date_to:
+            clauses.append("record_date <= ?")
+            params.append(date_to)
+        if natural_key is not None:
+            clauses.append("natural_key = ?")
+            params.append(str(natural_key))
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        return where, params
+
+    def query(
+        self,
+        group: Optional[str] = None,
+        types: Optional[List[str]] = None,
+        source: Optional[str] = None,
+        date_from: Optional[str] = None,
+        date_to: Optional[str] = None,
+        natural_key: Optional[str] = None,
+        newest_first: bool = False,
+        limit: Optional[int] = None,
+        offset: int = 0,
+    ) -> List[Dict[str, Any]]:
+        """
+        Return a slice of records.
+
+        Date bounds compare against each type's date field as ISO strings;
+        ``newest_first`` orders by that date, otherwise insertion order is kept.
+        """
+        where, params = self._where(group, types, source, date_from, date_to, natural_key)
+        order = " ORDER BY record_date DESC" if newest_first else " ORDER BY rowid"
+        sql = f"SELECT * FROM records{where}{order}"
+        if limit is not None:
+            sql += " LIMIT ? OFFSET ?"
+            params += [limit, offset]
+        with self._connect() as conn:
+            return [_row_record(row) for row in conn.execute(sql, params)]
+
+    def iter_records(
+        self,
+        group: Optional[str] = None,
+        types: Optional[List[str]] = None,
+        batch_size: int = 1000,
+    ) -> Iterator[Dict[str, Any]]:
+        """Stream records in insertion order without loading them all at once."""
+        where, params = self._where(group, types)
+        with self._connect() as conn:
+            cursor = conn.execute(f"SELECT * FROM records{where} ORDER BY rowid", params)
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                for row in rows:
+                    yield _row_record(row)
+
+    def get(self, record_id: Any) -> Optional[Dict[str, Any]]:
+        with self._connect() as conn:
+            row = conn.execute("SELECT * FROM records WHERE id = ?", (record_id,)).fetchone()
+        return _row_record(row) if row else None
+
+    def count(
+        self,
+        group: Optional[str] = None,
+        types: Optional[List[str]] = None,
+        source: Optional[str] = None,
+    ) -> int:
+        where, params = self._where(group, types, source)
+        with self._connect() as conn:
+            return conn.execute(f"SELECT COUNT(*) FROM records{where}", params).fetchone()[0]
+
+    def counts_by_type(self, group: Optional[str] = None) -> Dict[str, int]:
+        where, params = self._where(group)
+        with self._connect() as conn:
+            return {
+                row["type"]: row["n"]
+                for row in conn.execute(f"SELECT type, COUNT(*) AS n FROM records{where} GROUP BY type", params)
+            }
+
+
+_record_stores: Dict[Path, RecordStore] = {}
+
+
+def get_record_store(data_dir: str = "training_data") -> RecordStore:
+    """Return the process-wide record store of ``data_dir`` (opened once, not per request)."""
+    key = Path(data_dir).resolve()
+    if key not in _record_stores:
+        _record_stores[key] = RecordStore(data_dir)
+    return _record_stores[key]
@@ -0,0 +1,96 @@
+# Resident Retrieval Service
+
+import asyncio
+import copy
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from app.core.vector_embeddings import VectorEmbeddingManager
+
+
+class RetrievalService:
+    """
+    Process-wide semantic search over the published embeddings build.
+
+    Holds one VectorEmbeddingManager, so the embedding model is loaded once
+    and the vectors, documents and FAISS index stay resident between
+    requests. Each search first reads the CURRENT pointer; when another
+    build has been published (by this process or another worker) it is
+    loaded into a fresh manager that then replaces the served one in a single
+    assignment, so searches already running finish on the build they started
+    with.
+    """
+
+    def __init__(self, data_dir: str = "training_data"):
+        self.data_dir = data_dir
+        self.manager: Optional[VectorEmbeddingManager] = None
+        self.loaded = False
+        self._attempted: Optional[Path] = None  # Build the last reload saw published
+        self._lock = asyncio.Lock()
+        self.stats = {"searches": 0, "reloads": 0}
+
+    async def start(self):
+        """Load the embedding model and the published build (called on app startup)."""
+        await self.refresh()
+
+    def new_manager(self) -> VectorEmbeddingManager:
+        """An empty manager sharing the service's embedding model, to build or load embeddings with."""
+        if self.manager is None:
+            return VectorEmbeddingManager(self.data_dir)
+        manager = copy.copy(self.manager)
+        manager.index, manager.documents, manager.metadata, manager.embeddings = None, [], None, None
+        manager.build_dir, manager.tfidf = None, None
+        return manager
+
+    def _is_stale(self) -> bool:
+        return self.manager is None or self.manager.artifacts.current() != self._attempted
+
+    def _reload(self):
+        manager = self.new_manager()
+        published = manager.artifacts.current()
+        loaded = manager.has_embeddings() and manager.load_embeddings()
+        # A build that fails to load leaves the previous one in service
+        if loaded or self.manager is None:
+            self.manager, self.loaded = manager, loaded
+        self._attempted = manager.build_dir if loaded else published
+        self.stats["reloads"] += 1
+        if loaded:
+            print(f"🔄 Retrieval service serving {len(manager.documents)} documents "
+                  f"({manager.build_dir.name if manager.build_dir else 'unversioned'})")
+
+    async def refresh(self, force: bool = False) -> bool:
+        """Load the published build if it is not the one being served; returns whether embeddings are loaded."""
+        if force or self._is_stale():
+            async with self._lock:
+                # Another request may have reloaded while this one waited
+                if force or self._is_stale():
+                    await asyncio.to_thread(self._reload)
+        return self.loaded
+
+    async def search(self, query: str, top_k: int = 5) -> List[Dict[str, Any]]:
+        """Search the current build; empty when no embeddings have been built."""
+        if not await self.refresh():
+            return []
+        self.stats["searches"] += 1
+        return await asyncio.to_thread(self.manager.search_similar, query, top_k)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get the served build and search/reload counts."""
+        manager = self.manager
+        return {
+            "loaded": self.loaded,
+            "build": manager.build_dir.name if manager is not None and manager.build_dir else None,
+            **self.stats,
+            "embeddings": manager.get_stats() if manager is not None else None,
+        }
+
+
+_retrieval_service: Optional[RetrievalService] = None
+
+
+def get_retrieval_service() -> RetrievalService:
+    """Return the process-wide retrieval service."""
+    global _retrieval_service
+    if _retrieval_service is None:
+        _retrieval_service = RetrievalService()
+    return _retrieval_service
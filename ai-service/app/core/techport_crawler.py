@@ -0,0 +1,193 @@
+# NASA TechPort Crawler
+
+import asyncio
+import json
+import os
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from app.core.http_client import get_http_client
+
+
+def map_techport_project(project_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Map a TechPort project detail payload to our raw record shape."""
+    return {
+        "type": "technology",
+        "project_id": project_data.get("projectId"),
+        "title": project_data.get("title"),
+        "description": project_data.get("description"),
+        "benefits": project_data.get("benefits"),
+        "status": project_data.get("statusDescription"),
+        "start_date": project_data.get("startDateString"),
+        "end_date": project_data.get("endDateString"),
+        "program": project_data.get("program"),
+        "source": "NASA TechPort"
+    }
+
+
+class TechPortCrawler:
+    """
+    Crawls the TechPort project list and fetches project details concurrently.
+
+    The project list endpoint returns every project id in one response, so the
+    crawler walks it in ascending ``projectId`` pages, fetches each page's
+    details with bounded concurrency and checkpoints the last crawled
+    ``projectId`` so an interrupted crawl resumes where it stopped. Projects
+    whose detail fetch failed are checkpointed too and retried first on the
+    next resumed crawl.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        api_key: str,
+        data_dir: str = "training_data",
+        concurrency: int = 8,
+        page_size: int = 100,
+    ):
+        self.base_url = base_url
+        self.api_key = api_key
+        self.data_dir = Path(data_dir)
+        self.state_path = self.data_dir / "state" / "techport_crawl.json"
+        self.concurrency = concurrency
+        self.page_size = page_size
+
+    def _load_state(self) -> Dict[str, Any]:
+        if not self.state_path.exists():
+            return {}
+        with open(self.state_path, "r") as f:
+            return json.load(f)
+
+    def load_cursor(self) -> Optional[int]:
+        """Return the last crawled projectId, if a previous crawl saved one."""
+        return self._load_state().get("last_project_id")
+
+    def load_failed(self) -> List[int]:
+        """Return the projectIds at or below the cursor whose detail fetch failed."""
+        return self._load_state().get("failed_project_ids", [])
+
+    def save_cursor(self, project_id: int, failed_ids: List[int]):
+        """Persist the last crawled projectId and the failed projectIds still to retry."""
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        # Write a temp file and swap it in, so a crash mid-write keeps the previous cursor
+        tmp_path = self.state_path.with_suffix(".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump({
+                "last_project_id": project_id,
+                "failed_project_ids": sorted(failed_ids),
+                "updated_at": datetime.now().isoformat(),
+            }, f)
+        os.replace(tmp_path, self.state_path)
+
+    def reset_cursor(self):
+        """Forget the saved cursor so the next crawl starts from the beginning."""
+        if self.state_path.exists():
+            self.state_path.unlink()
+
+    async def list_project_ids(self, updated_since: Optional[str] = None) -> List[int]:
+        """List all project ids, sorted ascending."""
+        params = {"api_key": self.api_key}
+        if updated_since:
+            params["updatedSince"] = updated_since
+
+        data = await get_http_client().get_json(f"{self.base_url}/techport/api/projects", params=params)
+        if data is None:
+            return []
+
+        return sorted(
+            project["projectId"] for project in data.get("projects", [])
+            if project.get("projectId") is not None
+        )
+
+    async def _fetch_detail(self, project_id: int, semaphore: asyncio.Semaphore) -> Optional[Dict]:
+        """Fetch and map a single project's details."""
+        async with semaphore:
+            try:
+                detail = await get_http_client().get_json(
+                    f"{self.base_url}/techport/api/projects/{project_id}",
+                    params={"api_key": self.api_key}
+                )
+            except Exception as e:
+                print(f"⚠️ TechPort project {project_id} failed: {e}")
+                return None
+        if detail is None:
+            return None
+        return map_techport_project(detail.get("project", {}))
+
+    async def crawl(
+        self,
+        max_projects: Optional[int] = None,
+        resume: bool = True,
+        updated_since: Optional[str] = None,
+        output_file: Optional[str] = None,
+        checkpoint: bool = True,
+    ) -> Dict[str, Any]:
+        """
+        Crawl project details.
+
+        With ``resume`` the crawl retries previously failed projects, then
+        continues after the saved cursor; without it the saved cursor is
+        reset and the crawl starts over. ``checkpoint=False`` neither reads
+        nor writes the cursor (for one-off samples). When ``output_file`` is
+        given, each completed page is appended to it as JSON lines. Returns
+        the crawled projects and crawl statistics.
+        """
+        start = time.perf_counter()
+        project_ids = await self.list_project_ids(updated_since)
+
+        resume = resume and checkpoint
+        if checkpoint and not resume:
+            self.reset_cursor()
+        cursor = self.load_cursor() if resume else None
+        retry_ids = set(self.load_failed()) if resume else set()
+        if cursor is not None:
+            # Failed projects sort before the cursor, so they are fetched first
+            project_ids = [
+                project_id for project_id in project_ids
+                if project_id > cursor or project_id in retry_ids
+            ]
+        if max_projects is not None:
+            project_ids = project_ids[:max_projects]
+
+        output_path = self.data_dir / output_file if output_file else None
+        if output_path:
+            output_path.parent.mkdir(parents=True, exist_ok=True)
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+        projects = []
+        failed = 0
+        # Failed projects not reached by this crawl (e.g. beyond max_projects) stay queued
+        pending_failed = retry_ids - set(project_ids)
+
+        for page_start in range(0, len(project_ids), self.page_size):
+            page_ids = project_ids[page_start:page_start + self.page_size]
+            details = await asyncio.gather(*[self._fetch_detail(project_id, semaphore) for project_id in page_ids])
+
+            page_projects = [detail for detail in details if detail is not None]
+            failed += len(details) - len(page_projects)
+            projects.extend(page_projects)
+            pending_failed.update(project_id for project_id, detail in zip(page_ids, details) if detail is None)
+
+            if output_path:
+                with open(output_path, "a") as f:
+                    for project in page_projects:
+                        f.write(json.dumps(project, default=str) + "\n")
+
+            if checkpoint:
+                self.save_cursor(max(page_ids[-1], cursor or page_ids[-1]), list(pending_failed))
+
+        elapsed = time.perf_counter() - start
+        return {
+            "projects": projects,
+            "stats": {
+                "resumed_from": cursor,
+                "retried_failed": len(retry_ids & set(project_ids)),
+                "projects_listed": len(project_ids),
+                "projects_fetched": len(projects),
+                "projects_failed": failed,
+                "elapsed_seconds": round(elapsed, 3),
+                "projects_per_sec": round(len(projects) / elapsed, 2) if elapsed > 0 else 0.0,
+            }
+        }
@@ -0,0 +1,124 @@
+# Sparse TF-IDF Index
+
+import json
+import re
+from collections import Counter
+from pathlib import Path
+from typing import List, Tuple
+
+import numpy as np
+
+try:
+    from scipy import sparse
+    SCIPY_AVAILABLE = True
+except ImportError:
+    SCIPY_AVAILABLE = False
+    print("⚠️ scipy not installed. TF-IDF search falls back to word overlap.")
+
+TOKEN_PATTERN = re.compile(r"\b\w+\b")
+
+# Files written by TfidfIndex.save(), next to the build's other artifacts
+TFIDF_FILES = ["tfidf.vocab.json", "tfidf.idf.npy", "tfidf.indptr.npy", "tfidf.indices.npy", "tfidf.data.npy"]
+
+
+def tokenize(text: str) -> List[str]:
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+class TfidfIndex:
+    """
+    TF-IDF document vectors held as a sparse CSR matrix, for semantic-ish
+    search when no sentence embedding model is available.
+
+    Rows are L2-normalized, so a query's cosine similarity with every
+    document is one sparse matrix-vector product. Document frequencies come
+    from the same single pass that counts terms; IDF is smoothed,
+    ``log((1 + N) / (1 + df)) + 1``, so terms present in every document
+    still count a little and no weight is negative.
+    """
+
+    def __init__(self, vocabulary: List[str], idf: np.ndarray, matrix: "sparse.csr_matrix"):
+        self.vocabulary = vocabulary
+        self.term_ids = {term: idx for idx, term in enumerate(vocabulary)}
+        self.idf = idf
+        self.matrix = matrix
+
+    @classmethod
+    def fit(cls, documents: List[str]) -> "TfidfIndex":
+        """Build the index in one pass over the documents."""
+        term_ids = {}
+        indptr = [0]
+        indices: List[int] = []
+        counts: List[int] = []
+        for doc in documents:
+            for term, count in Counter(tokenize(doc)).items():
+                indices.append(term_ids.setdefault(term, len(term_ids)))
+                counts.append(count)
+            indptr.append(len(indices))
+
+        index_dtype = np.int32 if len(indices) < np.iinfo(np.int32).max else np.int64
+        indptr = np.asarray(indptr, dtype=index_dtype)
+        indices = np.asarray(indices, dtype=index_dtype)
+        counts = np.asarray(counts, dtype=np.float32)
+
+        # Each term appears once per row it occurs in, so column counts are document frequencies
+        document_frequency = np.bincount(indices, minlength=len(term_ids))
+        idf = (np.log((1 + len(documents)) / (1 + document_frequency)) + 1).astype(np.float32)
+
+        rows = np.repeat(np.arange(len(documents)), np.diff(indptr))
+        doc_lengths = np.bincount(rows, weights=counts, minlength=len(documents)).astype(np.float32)
+        data = counts / doc_lengths[rows] * idf[indices]
+
+        matrix = sparse.csr_matrix((data, indices, indptr), shape=(len(documents), len(term_ids)))
+        return cls(list(term_ids), idf, cls._normalize_rows(matrix))
+
+    @staticmethod
+    def _normalize_rows(matrix: "sparse.csr_matrix") -> "sparse.csr_matrix":
+        norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+        norms[norms == 0] = 1
+        matrix.data /= np.repeat(norms, np.diff(matrix.indptr)).astype(matrix.data.dtype)
+        return matrix
+
+    def transform(self, text: str) -> np.ndarray:
+        """Dense, L2-normalized TF-IDF vector of ``text`` over this vocabulary (unknown terms are dropped)."""
+        vector = np.zeros(len(self.vocabulary), dtype=np.float32)
+        counts = Counter(term for term in tokenize(text) if term in self.term_ids)
+        total = sum(counts.values())
+        for term, count in counts.items():
+            term_id = self.term_ids[term]
+            vector[term_id] = count / total * self.idf[term_id]
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm > 0 else vector
+
+    def search(self, query: str, top_k: int) -> List[Tuple[int, float]]:
+        """Row indices and cosine similarities of the ``top_k`` best matching documents (scores above zero)."""
+        query_vector = self.transform(query)
+        if not query_vector.any():
+            return []
+        scores = self.matrix @ query_vector
+        top_k = min(top_k, len(scores))
+        top = np.argpartition(-scores, top_k - 1)[:top_k]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return [(int(idx), float(scores[idx])) for idx in top if scores[idx] > 0]
+
+    def save(self, directory: Path):
+        with open(directory / "tfidf.vocab.json", "w") as f:
+            json.dump(self.vocabulary, f)
+        np.save(directory / "tfidf.idf.npy", self.idf)
+        np.save(directory / "tfidf.indptr.npy", self.matrix.indptr)
+        np.save(directory / "tfidf.indices.npy", self.matrix.indices)
+        np.save(directory / "tfidf.data.npy", self.matrix.data)
+
+    @classmethod
+    def load(cls, directory: Path, use_mmap: bool = True) -> "TfidfIndex":
+        """Load a saved index; with ``use_mmap`` the matrix arrays are mapped read-only instead of copied."""
+        mmap_mode = "r" if use_mmap else None
+        with open(directory / "tfidf.vocab.json", "r") as f:
+            vocabulary = json.load(f)
+        arrays = [np.load(directory / f"tfidf.{name}.npy", mmap_mode=mmap_mode) for name in ("data", "indices", "indptr")]
+        matrix = sparse.csr_matrix(tuple(arrays), shape=(len(arrays[2]) - 1, len(vocabulary)), copy=False)
+        return cls(vocabulary, np.load(directory / "tfidf.idf.npy"), matrix)
+
+    @staticmethod
+    def exists(directory: Path) -> bool:
+        return all((directory / name).exists() for name in TFIDF_FILES)
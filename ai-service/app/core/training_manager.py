@@ -4,14 +4,59 @@ import json
 import os
 import pickle
 from datetime import datetime
+from itertools import islice
 from typing import List, Dict, Any, Optional
 import pandas as pd
 import numpy as np
 from pathlib import Path
+from pandas.api.types import infer_dtype
+
+from app.core.dataset_storage import DatasetWriter, read_arrow, read_dataset, write_arrow, write_dataset
+from app.core.record_store import get_record_store
+
+def _as_text(values: pd.Series) -> pd.Series:
+    """Values as they would appear in an f-string, skipping the conversion for string columns."""
+    return values if infer_dtype(values, skipna=False) == "string" else values.map(str)
+
 
 class TrainingDataManager:
     """Manages collection, storage, and preparation of training data."""
     
+    # Record type produced by each fan-out source
+    SOURCE_RECORD_TYPES = {
+        "NASA APOD": "apod",
+        "NASA NEO": "neo",
+        "NASA Mars": "mars_photo",
+        "NASA Exoplanets": "exoplanet",
+        "NASA TechPort": "technology",
+        "SpaceX Launches": "launch",
+        "SpaceX Rockets": "rocket",
+        "SpaceX Capsules": "capsule",
+        "SpaceX Crew": "crew",
+        "SpaceX Payloads": "payload",
+        "SpaceX Starlink": "starlink",
+    }
+    
+    # Incremental sources and the raw field their watermark tracks
+    WATERMARK_FIELDS = {
+        "NASA APOD": "date",
+        "SpaceX Launches": "date_utc",
+        "SpaceX Starlink": "epoch",
+    }
+    
+    # Training example columns
+    EXAMPLE_COLUMNS = ["input", "output", "type", "source", "data_type"]
+    
+    # Type-specific training example per record type, on top of the general
+    # one every record gets: (example type, input template, data field that
+    # fills the template and must be present, or None for a fixed input)
+    EXAMPLE_TEMPLATES = {
+        "launch": ("launch_specific", "What happened with the {} launch?", "name"),
+        "apod": ("astronomy_explanation", "Explain the astronomy picture {}", "title"),
+        "mars_photo": ("mars_mission", "Show me information about Mars rover photos", None),
+        "exoplanet": ("exoplanet_info", "Tell me about the exoplanet {}", "planet_name"),
+    }
+    
     def __init__(self, data_dir: str = "training_data"):
         self.data_dir = Path(data_dir)
         self.data_dir.mkdir(exist_ok=True)
@@ -21,124 +66,150 @@ class TrainingDataManager:
         (self.data_dir / "processed").mkdir(exist_ok=True)
         (self.data_dir / "embeddings").mkdir(exist_ok=True)
         (self.data_dir / "models").mkdir(exist_ok=True)
+        
+        # Indexed store of processed records that API readers query slices from (shared per data_dir)
+        self.store = get_record_store(str(self.data_dir))
     
-    async def collect_training_data(self) -> Dict[str, Any]:
-        """Collect comprehensive training data from all sources."""
+    async def collect_training_data(self, full_refresh: bool = False) -> Dict[str, Any]:
+        """
+        Collect comprehensive training data from all sources.
+        
+        Records stream from every source through the ingestion pipeline
+        (fetch → normalize → dedupe → write) into the record store; stored
+        records are compared batch by batch rather than loaded up front.
+        Incremental sources (APOD,
+        launches, Starlink) only fetch records past their persisted watermark;
+        the small reference collections are refreshed in full. Pass
+        ``full_refresh=True`` to ignore the watermarks and replace the stored
+        records of every source that is fetched successfully. A failed
+        source always keeps its stored records.
+        
+        Returns ``{"metadata": ...}`` with per-source reports, change counts
+        and per-stage pipeline stats; the records themselves are in
+        ``self.store``.
+        """
         print("🚀 Starting comprehensive data collection...")
         
         # Import data ingestion functions
         from app.api.endpoints.data_ingestion import (
             fetch_nasa_apod, fetch_nasa_neo, fetch_nasa_mars_data,
             fetch_nasa_exoplanets, fetch_nasa_techport,
-            fetch_spacex_launches, fetch_spacex_rockets, fetch_spacex_capsules,
-            fetch_spacex_crew, fetch_spacex_payloads, fetch_spacex_starlink,
-            process_nasa_data, process_spacex_data
+            iter_spacex_launches, fetch_spacex_rockets, fetch_spacex_capsules,
+            fetch_spacex_crew, iter_spacex_payloads, iter_spacex_starlink,
         )
+        from app.core.normalization import NASA_NORMALIZER, SPACEX_NORMALIZER
+        from app.core.pipeline import IngestionPipeline, stream_of
+        from app.core.watermarks import WatermarkStore
         
-        collected_data = {
-            "nasa": [],
-            "spacex": [],
-            "metadata": {
-                "collection_date": datetime.now().isoformat(),
-                "total_records": 0,
-                "sources": []
-            }
+        self._migrate_legacy_dataset()
+        watermarks = WatermarkStore(str(self.data_dir))
+        incremental = not full_refresh and self.store.count() > 0 and bool(watermarks.to_dict())
+        if not incremental:
+            # Nothing to build on: start a full collection from scratch
+            watermarks.reset()
+        since = {name: watermarks.get(name) for name in self.WATERMARK_FIELDS}
+        
+        metadata = {
+            "collection_date": datetime.now().isoformat(),
+            "total_records": 0,
+            "incremental": incremental,
+            "sources": []
         }
         
-        # Collect NASA data
-        print("📡 Collecting NASA data...")
-        try:
-            nasa_raw = []
-            
-            # NASA APOD - get more historical data
-            print("  - NASA APOD...")
-            apod_data = await fetch_nasa_apod(limit=200)  # 200 astronomy pictures
-            nasa_raw.extend(apod_data)
-            
-            # NASA NEO data
-            print("  - NASA Near-Earth Objects...")
-            neo_data = await fetch_nasa_neo()
-            nasa_raw.extend(neo_data)
-            
-            # NASA Mars data
-            print("  - NASA Mars rover data...")
-            mars_data = await fetch_nasa_mars_data()
-            nasa_raw.extend(mars_data)
-            
-            # NASA Exoplanets
-            print("  - NASA Exoplanet data...")
-            exoplanet_data = await fetch_nasa_exoplanets()
-            nasa_raw.extend(exoplanet_data)
-            
-            # NASA Technology
-            print("  - NASA Technology projects...")
-            tech_data = await fetch_nasa_techport()
-            nasa_raw.extend(tech_data)
-            
-            # Process NASA data
-            nasa_processed = await process_nasa_data(nasa_raw)
-            collected_data["nasa"] = nasa_processed
-            collected_data["metadata"]["sources"].append(f"NASA ({len(nasa_processed)} records)")
-            
-        except Exception as e:
-            print(f"⚠️ NASA data collection error: {e}")
-            # Use fallback data
-            collected_data["nasa"] = self._get_fallback_nasa_data()
-            collected_data["metadata"]["sources"].append("NASA (fallback data)")
+        nasa_sources = {
+            "NASA APOD": stream_of(lambda: fetch_nasa_apod(limit=200, since=since["NASA APOD"])),  # Last 200 days of pictures
+            "NASA NEO": stream_of(fetch_nasa_neo),
+            "NASA Mars": stream_of(fetch_nasa_mars_data),
+            "NASA Exoplanets": stream_of(fetch_nasa_exoplanets),
+            "NASA TechPort": stream_of(fetch_nasa_techport),
+        }
+        spacex_sources = {
+            "SpaceX Launches": lambda: iter_spacex_launches(since=since["SpaceX Launches"]),
+            "SpaceX Rockets": stream_of(fetch_spacex_rockets),
+            "SpaceX Capsules": stream_of(fetch_spacex_capsules),
+            "SpaceX Crew": stream_of(fetch_spacex_crew),
+            "SpaceX Payloads": lambda: iter_spacex_payloads(limit=50),  # Limited to 50 payloads
+            "SpaceX Starlink": lambda: iter_spacex_starlink(limit=50, since=since["SpaceX Starlink"]),  # Sample
+        }
+        sources = {
+            **{name: ("nasa", stream) for name, stream in nasa_sources.items()},
+            **{name: ("spacex", stream) for name, stream in spacex_sources.items()},
+        }
         
-        # Collect SpaceX data
-        print("🚀 Collecting SpaceX data...")
-        try:
-            spacex_raw = []
-            
-            # SpaceX Launches
-            print("  - SpaceX launches...")
-            launches = await fetch_spacex_launches()
-            spacex_raw.extend(launches)
-            
-            # SpaceX Rockets
-            print("  - SpaceX rockets...")
-            rockets = await fetch_spacex_rockets()
-            spacex_raw.extend(rockets)
-            
-            # SpaceX Capsules
-            print("  - SpaceX capsules...")
-            capsules = await fetch_spacex_capsules()
-            spacex_raw.extend(capsules)
-            
-            # SpaceX Crew
-            print("  - SpaceX crew...")
-            crew = await fetch_spacex_crew()
-            spacex_raw.extend(crew)
-            
-            # SpaceX Payloads (limit for performance)
-            print("  - SpaceX payloads...")
-            payloads = await fetch_spacex_payloads()
-            spacex_raw.extend(payloads[:100])  # Limit payloads
-            
-            # SpaceX Starlink (sample)
-            print("  - SpaceX Starlink...")
-            starlink = await fetch_spacex_starlink()
-            spacex_raw.extend(starlink[:50])  # Limit Starlink satellites
-            
-            # Process SpaceX data
-            spacex_processed = await process_spacex_data(spacex_raw)
-            collected_data["spacex"] = spacex_processed
-            collected_data["metadata"]["sources"].append(f"SpaceX ({len(spacex_processed)} records)")
-            
-        except Exception as e:
-            print(f"⚠️ SpaceX data collection error: {e}")
-            collected_data["spacex"] = []
+        # Stream every NASA and SpaceX source through the pipeline concurrently
+        print("📡 Collecting NASA and SpaceX data concurrently...")
+        pipeline = IngestionPipeline(self.store, {"nasa": NASA_NORMALIZER, "spacex": SPACEX_NORMALIZER})
+        result = await pipeline.run(sources, self.WATERMARK_FIELDS)
+        source_reports = result["source_reports"]
+        for name, report in source_reports.items():
+            print(f"  - {name}: {report['status']} ({report['records']} records, {report['latency_ms']}ms)")
+        for stage in result["stages"]:
+            print(f"  - Stage {stage['stage']}: {stage['records_out']} records, "
+                  f"{stage['records_per_sec']} rec/s, max queue depth {stage['max_queue_depth']}")
+        metadata["source_reports"] = source_reports
+        metadata["pipeline"] = result["stages"]
+        
+        # Drop stored records of types that were re-fetched in full but not seen again
+        # (every successful source on a full collection); failed sources keep theirs
+        succeeded = {name for name, report in source_reports.items() if report["status"] == "ok"}
+        replaced_types = {
+            self.SOURCE_RECORD_TYPES[name] for name in succeeded
+            if not incremental or name not in self.WATERMARK_FIELDS
+        }
+        removed = self.store.delete_unseen(sorted(replaced_types), result["seen_ids"])
+        
+        # Keep fallback records for any failed NASA source we have no stored data for
+        stored_types = self.store.counts_by_type(group="nasa")
+        fallback_types = {
+            self.SOURCE_RECORD_TYPES[name] for name in nasa_sources
+            if name not in succeeded and self.SOURCE_RECORD_TYPES[name] not in stored_types
+        }
+        if fallback_types:
+            print(f"⚠️ NASA sources failed, using fallback data: {', '.join(sorted(fallback_types))}")
+            self.store.upsert_records("nasa", [
+                record for record in self._get_fallback_nasa_data()
+                if record["type"] in fallback_types
+            ])
+        
+        for group, names in (("NASA", nasa_sources), ("SpaceX", spacex_sources)):
+            fetched = sum(source_reports[name]["records"] for name in names)
+            metadata["sources"].append(f"{group} ({fetched} new records)")
         
         # Calculate totals
-        total_records = len(collected_data["nasa"]) + len(collected_data["spacex"])
-        collected_data["metadata"]["total_records"] = total_records
+        changes = result["changes"]
+        total_records = self.store.count()
+        metadata["total_records"] = total_records
+        metadata["fetched_records"] = result["fetched_records"]
+        metadata["removed_records"] = removed
+        metadata["changes"] = changes
+        metadata["quality"] = result["quality"]
+        print(f"  - Data quality of fetched records: {result['quality']['quality_score']:.2%}")
         
-        # Save raw data
-        self._save_data(collected_data, "raw/complete_dataset.json")
+        # Move the watermarks past what was fetched (upcoming launches are re-checked)
+        for name in self.WATERMARK_FIELDS:
+            if name in succeeded:
+                watermarks.advance(name, [result["newest"].get(name)])
+        metadata["watermarks"] = watermarks.to_dict()
         
-        print(f"✅ Data collection complete: {total_records} total records")
-        return collected_data
+        # Records are already in the store; persist the watermarks last so a failed run is retried
+        self._save_data(metadata, "raw/collection_metadata.json")
+        watermarks.save()
+        
+        print(f"✅ Data collection complete: {total_records} total records "
+              f"({metadata['fetched_records']} fetched this run: "
+              f"{changes['new']} new, {changes['changed']} changed, {changes['unchanged']} unchanged)")
+        return {"metadata": metadata}
+    
+    def _migrate_legacy_dataset(self):
+        """Import a pre-record-store raw/complete_dataset.json into an empty record store."""
+        if self.store.count() > 0:
+            return
+        legacy = self.load_data("raw/complete_dataset.json")
+        if not legacy:
+            return
+        for group in ("nasa", "spacex"):
+            self.store.upsert_records(group, legacy.get(group, []))
+        print(f"📦 Imported {self.store.count()} records from raw/complete_dataset.json into the record store")
     
     def _get_fallback_nasa_data(self) -> List[Dict]:
         """Return comprehensive fallback NASA data for training."""
@@ -175,104 +246,152 @@ class TrainingDataManager:
             }
         ]
     
-    def prepare_training_dataset(self, data: Dict[str, Any]) -> pd.DataFrame:
-        """Prepare structured dataset for model training."""
+    def prepare_training_dataset(
+        self,
+        data: Optional[Dict[str, Any]] = None,
+        types: Optional[List[str]] = None,
+        chunk_size: int = 100_000
+    ) -> int:
+        """
+        Prepare structured dataset for model training.
+        
+        Without ``data``, records are streamed from the record store,
+        optionally restricted to ``types``. Records are turned into training
+        examples ``chunk_size`` at a time, and each chunk is written to the
+        Parquet dataset as soon as it is generated, so only one chunk is held
+        in memory. Returns the number of examples written; read the dataset
+        back with ``load_training_dataset``.
+        """
         print("📊 Preparing training dataset...")
         
         # Combine all data
-        all_records = data["nasa"] + data["spacex"]
+        if data is not None:
+            all_records = iter(data["nasa"] + data["spacex"])
+        else:
+            all_records = self.store.iter_records(types=types)
         
-        # Create training examples
-        training_examples = []
+        # Create training examples, saving each chunk (Parquet, partitioned by source and example type)
+        total_examples = 0
+        with DatasetWriter(self.data_dir / "processed" / "training_dataset.parquet") as writer:
+            while True:
+                records = list(islice(all_records, chunk_size))
+                if not records:
+                    break
+                examples = self._generate_training_examples(records)
+                writer.write(examples)
+                total_examples += len(examples)
+        for legacy in ("training_dataset.csv", "training_dataset.json"):
+            # Superseded by the Parquet dataset
+            (self.data_dir / "processed" / legacy).unlink(missing_ok=True)
         
-        for record in all_records:
-            # Create question-answer pairs
-            text_content = record.get("text_content", "")
-            data_type = record.get("type", "")
-            source = record.get("source", "")
-            
-            if text_content:
-                # Generate different types of training examples
-                examples = self._generate_training_examples(record, text_content, data_type, source)
-                training_examples.extend(examples)
-        
-        # Create DataFrame
-        df = pd.DataFrame(training_examples)
-        
-        # Save processed dataset
-        df.to_csv(self.data_dir / "processed" / "training_dataset.csv", index=False)
-        df.to_json(self.data_dir / "processed" / "training_dataset.json", orient="records", indent=2)
-        
-        print(f"✅ Training dataset prepared: {len(df)} training examples")
-        return df
+        print(f"✅ Training dataset prepared: {total_examples} training examples")
+        return total_examples
+    
+    def load_training_dataset(
+        self,
+        columns: Optional[List[str]] = None,
+        filters: Optional[Dict[str, Any]] = None
+    ) -> pd.DataFrame:
+        """Read the prepared training examples (or just ``columns``/``filters`` of them) as a DataFrame."""
+        dataset = self.load_data("processed/training_dataset.parquet", columns=columns, filters=filters)
+        return dataset if dataset is not None else pd.DataFrame(columns=columns or self.EXAMPLE_COLUMNS)
     
-    def _generate_training_examples(self, record: Dict, text_content: str, data_type: str, source: str) -> List[Dict]:
-        """Generate multiple training examples from a single record."""
-        examples = []
-        data_info = record.get("data", {})
+    def _generate_training_examples(self, records: List[Dict]) -> pd.DataFrame:
+        """
+        Generate training examples for a batch of records.
+        
+        Every record with text content gets a general example; record types
+        in ``EXAMPLE_TEMPLATES`` get a type-specific one as well. Inputs are
+        built column-wise per type rather than record by record, and each
+        record's examples stay together in record order.
+        """
+        records = [record for record in records if record.get("text_content")]
+        if not records:
+            return pd.DataFrame(columns=self.EXAMPLE_COLUMNS)
+        # One column at a time: per-record tuples would trip the cyclic GC on large batches
+        outputs = pd.Series([record["text_content"] for record in records], dtype=object)
+        sources = pd.Series([record.get("source", "") for record in records], dtype=object)
+        data_types = pd.Series([record.get("type", "") for record in records], dtype=object)
+        data_infos = pd.Series([record.get("data", {}) for record in records], dtype=object)
+        position = pd.RangeIndex(len(records))
         
         # Basic information example
-        examples.append({
-            "input": f"Tell me about {data_type} data from {source}",
-            "output": text_content,
+        parts = [pd.DataFrame({
+            "input": "Tell me about " + _as_text(data_types) + " data from " + _as_text(sources),
+            "output": outputs,
             "type": "general_info",
-            "source": source,
-            "data_type": data_type
-        })
+            "source": sources,
+            "data_type": data_types,
+            "order": position * 2,
+        })]
         
-        # Type-specific examples
-        if data_type == "launch":
-            if "name" in data_info:
-                examples.append({
-                    "input": f"What happened with the {data_info['name']} launch?",
-                    "output": text_content,
-                    "type": "launch_specific",
-                    "source": source
-                })
+        # Type-specific examples (these carry no data_type)
+        for data_type, (example_type, template, field) in self.EXAMPLE_TEMPLATES.items():
+            selected = data_types.to_numpy() == data_type
+            if not selected.any():
+                continue
+            infos = data_infos[selected]
+            if field is None:
+                inputs = pd.Series(template, index=infos.index)
+            else:
+                # The field must be present; a None value still fills the template
+                infos = infos[[isinstance(info, dict) and field in info for info in infos]]
+                values = pd.Series([info[field] for info in infos], index=infos.index, dtype=object)
+                prefix, suffix = template.split("{}")
+                inputs = prefix + _as_text(values) + suffix
+            parts.append(pd.DataFrame({
+                "input": inputs,
+                "output": outputs[inputs.index],
+                "type": example_type,
+                "source": sources[inputs.index],
+                "order": inputs.index * 2 + 1,
+            }))
         
-        elif data_type == "apod":
-            if "title" in data_info:
-                examples.append({
-                    "input": f"Explain the astronomy picture {data_info['title']}",
-                    "output": text_content,
-                    "type": "astronomy_explanation",
-                    "source": source
-                })
-        
-        elif data_type == "mars_photo":
-            examples.append({
-                "input": "Show me information about Mars rover photos",
-                "output": text_content,
-                "type": "mars_mission",
-                "source": source
-            })
-        
-        elif data_type == "exoplanet":
-            if "planet_name" in data_info:
-                examples.append({
-                    "input": f"Tell me about the exoplanet {data_info['planet_name']}",
-                    "output": text_content,
-                    "type": "exoplanet_info",
-                    "source": source
-                })
-        
-        return examples
+        examples = pd.concat(parts, ignore_index=True).sort_values("order", kind="stable")
+        return examples[self.EXAMPLE_COLUMNS].reset_index(drop=True)
     
     def _save_data(self, data: Any, filename: str):
-        """Save data to file."""
+        """
+        Save data to file (DataFrames as a partitioned ``.parquet`` dataset or
+        a memory-mappable ``.arrow`` file, arrays as ``.npy``).
+        """
         filepath = self.data_dir / filename
         
-        if filename.endswith('.json'):
+        if filename.endswith('.parquet'):
+            write_dataset(data, filepath)
+        elif filename.endswith('.arrow'):
+            write_arrow(data, filepath)
+        elif filename.endswith('.npy'):
+            np.save(filepath, data)
+        elif filename.endswith('.json'):
             with open(filepath, 'w') as f:
                 json.dump(data, f, indent=2, default=str)
         elif filename.endswith('.pkl'):
             with open(filepath, 'wb') as f:
                 pickle.dump(data, f)
     
-    def load_data(self, filename: str) -> Any:
-        """Load data from file."""
+    def load_data(
+        self,
+        filename: str,
+        columns: Optional[List[str]] = None,
+        filters: Optional[Dict[str, Any]] = None,
+        mmap: bool = False
+    ) -> Any:
+        """
+        Load data from file.
+        
+        For ``.parquet`` datasets only ``columns`` are read, and ``filters``
+        (e.g. ``{"source": "SpaceX API"}``) only open the matching partitions.
+        With ``mmap``, ``.npy`` arrays and ``.arrow`` files are memory-mapped
+        read-only instead of copied into memory, so every worker process
+        loading them shares one copy in the OS page cache; ``.arrow`` files
+        load as Arrow tables (``.to_pandas()`` for a DataFrame copy).
+        """
         filepath = self.data_dir / filename
         
+        if filename.endswith('.parquet'):
+            return read_dataset(filepath, columns=columns, filters=filters)
+        
         if not filepath.exists():
             return None
             
@@ -283,4 +402,8 @@ class TrainingDataManager:
             with open(filepath, 'rb') as f:
                 return pickle.load(f)
         elif filename.endswith('.csv'):
-            return pd.read_csv(filepath)
+            return pd.read_csv(filepath, usecols=columns)
+        elif filename.endswith('.npy'):
+            return np.load(filepath, mmap_mode='r' if mmap else None)
+        elif filename.endswith('.arrow'):
+            return read_arrow(filepath, columns=columns, memory_map=mmap)
@@ -1,8 +1,7 @@
 # Vector Embeddings and Semantic Search
 
 import numpy as np
-import json
-import pickle
+import os
 from typing import List, Dict, Any, Tuple, Optional
 from pathlib import Path
 import pandas as pd
@@ -22,6 +21,29 @@ except ImportError:
     FAISS_AVAILABLE = False
     print("⚠️ faiss not installed. Using basic similarity search.")
 
+from app.core.embedding_artifacts import EMBEDDINGS_VECTOR_DTYPE, DocumentMetadata, EmbeddingArtifactStore
+from app.core.tfidf_index import SCIPY_AVAILABLE, TfidfIndex
+
+# "mmap" maps stored vectors and documents read-only so worker processes share
+# them through the OS page cache; "memory" reads a private copy per process
+EMBEDDINGS_LOAD_MODE = os.getenv("EMBEDDINGS_LOAD_MODE", "mmap")
+
+
+def _read_index(path: Path, use_mmap: bool = True) -> "faiss.Index":
+    """
+    Read a persisted FAISS index, memory-mapped where the index type supports
+    it: flat indexes need IO_FLAG_MMAP_IFC (newer faiss), which maps their
+    vectors zero-copy instead of reading them into memory.
+    """
+    if not use_mmap:
+        return faiss.read_index(str(path))
+    flags = faiss.IO_FLAG_MMAP | faiss.IO_FLAG_READ_ONLY | getattr(faiss, "IO_FLAG_MMAP_IFC", 0)
+    try:
+        return faiss.read_index(str(path), flags)
+    except RuntimeError:
+        return faiss.read_index(str(path))
+
+
 class VectorEmbeddingManager:
     """Manages vector embeddings for semantic search over space data."""
     
@@ -34,7 +56,14 @@ class VectorEmbeddingManager:
         self.model = None
         self.index = None
         self.documents = []
+        self.metadata: Optional[DocumentMetadata] = None
         self.embeddings = None
+        self.tfidf: Optional[TfidfIndex] = None  # Sparse TF-IDF index when no embedding model is available
+        
+        # Versioned builds of vectors, documents and index
+        self.artifacts = EmbeddingArtifactStore(self.embeddings_dir)
+        self.build_dir: Optional[Path] = None
+        self.vector_dtype = EMBEDDINGS_VECTOR_DTYPE
         
         self._init_embedding_model()
     
@@ -49,7 +78,7 @@ class VectorEmbeddingManager:
                 print(f"⚠️ Failed to load SentenceTransformer: {e}")
                 self.model = None
         else:
-            print("📝 Using basic TF-IDF embeddings as fallback")
+            print("📝 Using sparse TF-IDF search as fallback")
     
     async def create_embeddings(self, training_data: pd.DataFrame) -> Dict[str, Any]:
         """Create vector embeddings from training data."""
@@ -74,16 +103,19 @@ class VectorEmbeddingManager:
             })
         
         self.documents = documents
+        self.metadata = DocumentMetadata.from_records(metadata)
         
         # Create embeddings
         if self.model and SENTENCE_TRANSFORMERS_AVAILABLE:
             print("  - Using SentenceTransformer embeddings...")
-            embeddings = self.model.encode(documents, show_progress_bar=True)
+            embeddings = self._encode_new_documents(documents)
             self.embeddings = embeddings
+            self.tfidf = None
         else:
-            print("  - Using TF-IDF fallback embeddings...")
-            embeddings = self._create_tfidf_embeddings(documents)
-            self.embeddings = embeddings
+            print("  - Using sparse TF-IDF fallback index...")
+            self.embeddings = None
+            self.index = None
+            self.tfidf = TfidfIndex.fit(documents) if SCIPY_AVAILABLE else None
         
         # Create FAISS index for fast similarity search
         if FAISS_AVAILABLE and self.embeddings is not None:
@@ -96,68 +128,103 @@ class VectorEmbeddingManager:
         
         # Save embeddings and metadata
         embedding_data = {
-            "embeddings": self.embeddings.tolist() if self.embeddings is not None else [],
             "documents": documents,
             "metadata": metadata,
             "created_at": datetime.now().isoformat(),
             "total_documents": len(documents),
-            "embedding_dimension": self.embeddings.shape[1] if self.embeddings is not None else 0
+            "embedding_dimension": self._dimension()
         }
-        
-        # Save to files
-        with open(self.embeddings_dir / "embeddings.json", "w") as f:
-            json.dump(embedding_data, f, indent=2)
-        
-        if self.embeddings is not None:
-            np.save(self.embeddings_dir / "embeddings.npy", self.embeddings)
-        
-        with open(self.embeddings_dir / "metadata.pkl", "wb") as f:
-            pickle.dump(metadata, f)
+        self._save_build(documents, metadata, embedding_data)
         
         print(f"✅ Created embeddings for {len(documents)} documents")
         return embedding_data
     
-    def _create_tfidf_embeddings(self, documents: List[str]) -> np.ndarray:
-        """Create TF-IDF embeddings as fallback."""
-        from collections import Counter
-        import re
-        
-        # Simple TF-IDF implementation
-        def tokenize(text):
-            return re.findall(r'\b\w+\b', text.lower())
-        
-        # Build vocabulary
-        vocab = set()
-        doc_tokens = []
-        for doc in documents:
-            tokens = tokenize(doc)
-            doc_tokens.append(tokens)
-            vocab.update(tokens)
+    def _save_build(self, documents: List[str], metadata: List[Dict], embedding_data: Dict[str, Any]) -> Path:
+        """Write vectors, documents, metadata and index as a new build and publish it."""
+        build_dir = self.artifacts.begin_build()
+        if self.embeddings is not None:
+            self.artifacts.save_vectors(build_dir, self.embeddings, self.vector_dtype)
+        self.artifacts.save_documents(build_dir, documents, metadata)
+        if self.tfidf is not None:
+            self.tfidf.save(build_dir)
+        if self.index is not None:
+            # Loading the built index is much cheaper than normalizing and re-adding every vector
+            faiss.write_index(self.index, str(build_dir / "index.faiss"))
         
-        vocab = sorted(list(vocab))
-        vocab_to_idx = {word: idx for idx, word in enumerate(vocab)}
+        self.artifacts.publish(build_dir, {
+            "created_at": embedding_data["created_at"],
+            "total_documents": embedding_data["total_documents"],
+            "embedding_dimension": int(embedding_data["embedding_dimension"]),
+            "vector_dtype": self.vector_dtype,
+            "model_type": "SentenceTransformer" if self.model else "TF-IDF",
+        })
+        self.artifacts.remove_legacy()
+        self.build_dir = build_dir
+        return build_dir
+    
+    def _load_stored(self, use_mmap: bool) -> Tuple[Optional[Path], Optional[np.ndarray], Any]:
+        """Build directory, vectors and document texts of the published build (or a legacy directory)."""
+        build_dir = self.artifacts.current()
+        if build_dir is not None:
+            return (
+                build_dir,
+                self.artifacts.load_vectors(build_dir, use_mmap),
+                self.artifacts.load_documents(build_dir, use_mmap),
+            )
+        if self.artifacts.has_legacy():
+            return (None, *self.artifacts.load_legacy(use_mmap))
+        raise FileNotFoundError(f"No embeddings built in {self.embeddings_dir}")
+    
+    def has_embeddings(self) -> bool:
+        """Whether embeddings have been built (in either layout)."""
+        return self.artifacts.current() is not None or self.artifacts.has_legacy()
+    
+    def _encode_new_documents(self, documents: List[str]) -> np.ndarray:
+        """
+        Encode documents, reusing stored vectors for documents whose text is
+        unchanged since the last run so only new or changed rows hit the model.
+        """
+        previous = {}
+        try:
+            if self.has_embeddings():
+                # Mapped: only the reused rows are read
+                _, stored_embeddings, stored_documents = self._load_stored(use_mmap=True)
+                if stored_embeddings is not None and len(stored_documents) == len(stored_embeddings):
+                    previous = {doc: idx for idx, doc in enumerate(stored_documents)}
+        except Exception as e:
+            print(f"⚠️ Could not reuse stored embeddings: {e}")
         
-        # Calculate TF-IDF
-        embeddings = np.zeros((len(documents), len(vocab)))
+        if not previous or not documents:
+            return self.model.encode(documents, show_progress_bar=True)
         
-        for doc_idx, tokens in enumerate(doc_tokens):
-            token_counts = Counter(tokens)
-            doc_length = len(tokens)
-            
-            for token, count in token_counts.items():
-                if token in vocab_to_idx:
-                    tf = count / doc_length
-                    # Simple approximation of IDF
-                    idf = np.log(len(documents) / (1 + sum(1 for doc_tokens_i in doc_tokens if token in doc_tokens_i)))
-                    embeddings[doc_idx, vocab_to_idx[token]] = tf * idf
+        missing = list(dict.fromkeys(doc for doc in documents if doc not in previous))
+        print(f"  - Encoding {len(missing)} new or changed documents, reusing the rest")
         
-        return embeddings
+        encoded = {}
+        if missing:
+            encoded = dict(zip(missing, self.model.encode(missing, show_progress_bar=True)))
+        return np.stack([
+            encoded[doc] if doc in encoded else np.asarray(stored_embeddings[previous[doc]], dtype=np.float32)
+            for doc in documents
+        ])
+    
+    def _dimension(self) -> int:
+        """Embedding dimension, or the TF-IDF vocabulary size for sparse builds."""
+        if self.embeddings is not None:
+            return self.embeddings.shape[1]
+        return len(self.tfidf.vocabulary) if self.tfidf is not None else 0
     
     def search_similar(self, query: str, top_k: int = 5) -> List[Dict[str, Any]]:
         """Search for similar documents using vector similarity."""
-        if not self.documents or self.embeddings is None:
+        if not self.documents:
             return []
         
+        # Builds made without an embedding model carry a sparse TF-IDF index instead of vectors
+        if self.embeddings is None:
+            if self.tfidf is not None:
+                return self._tfidf_search(query, top_k)
+            return self._simple_text_search(query, top_k)
+        
         # Create query embedding
         if self.model and SENTENCE_TRANSFORMERS_AVAILABLE:
             query_embedding = self.model.encode([query])
@@ -176,17 +243,14 @@ class VectorEmbeddingManager:
             results = []
             for i, (similarity, idx) in enumerate(zip(similarities[0], indices[0])):
                 if idx >= 0 and idx < len(self.documents):
-                    # Load metadata
-                    with open(self.embeddings_dir / "metadata.pkl", "rb") as f:
-                        metadata = pickle.load(f)
-                    
+                    metadata = self._hit_metadata(idx)
                     results.append({
                         "rank": i + 1,
                         "similarity": float(similarity),
                         "document": self.documents[idx],
-                        "metadata": metadata[idx] if idx < len(metadata) else {},
-                        "input": metadata[idx].get("input", "") if idx < len(metadata) else "",
-                        "output": metadata[idx].get("output", "") if idx < len(metadata) else ""
+                        "metadata": metadata,
+                        "input": metadata.get("input", ""),
+                        "output": metadata.get("output", "")
                     })
             
             return results
@@ -194,6 +258,27 @@ class VectorEmbeddingManager:
         # Fallback: compute similarities manually
         return self._manual_similarity_search(query_embedding[0], top_k)
     
+    def _hit_metadata(self, idx: int) -> Dict[str, Any]:
+        """Metadata of one document, read from the loaded metadata columns."""
+        if self.metadata is None or idx >= len(self.metadata):
+            return {}
+        return self.metadata.row(int(idx))
+    
+    def _tfidf_search(self, query: str, top_k: int) -> List[Dict[str, Any]]:
+        """Cosine similarity between the query's TF-IDF vector and every document's."""
+        results = []
+        for rank, (idx, similarity) in enumerate(self.tfidf.search(query, top_k)):
+            metadata = self._hit_metadata(idx)
+            results.append({
+                "rank": rank + 1,
+                "similarity": similarity,
+                "document": self.documents[idx],
+                "metadata": metadata,
+                "input": metadata.get("input", ""),
+                "output": metadata.get("output", "")
+            })
+        return results
+    
     def _simple_text_search(self, query: str, top_k: int) -> List[Dict[str, Any]]:
         """Simple text-based search fallback."""
         query_words = set(query.lower().split())
@@ -247,24 +332,34 @@ class VectorEmbeddingManager:
         
         return results
     
-    def load_embeddings(self) -> bool:
-        """Load existing embeddings from disk."""
+    def load_embeddings(self, mode: Optional[str] = None) -> bool:
+        """
+        Load the published embeddings build from disk.
+        
+        ``mode`` (default ``EMBEDDINGS_LOAD_MODE``) is ``"mmap"`` to map the
+        vectors and documents read-only, so concurrent workers share one copy
+        in the page cache, or ``"memory"`` to read them into this process.
+        """
+        use_mmap = (mode or EMBEDDINGS_LOAD_MODE) == "mmap"
         try:
-            # Load embeddings
-            embeddings_path = self.embeddings_dir / "embeddings.npy"
-            if embeddings_path.exists():
-                self.embeddings = np.load(embeddings_path)
-            
-            # Load documents and metadata
-            with open(self.embeddings_dir / "embeddings.json", "r") as f:
-                data = json.load(f)
-                self.documents = data.get("documents", [])
+            # Load embeddings, documents and metadata columns
+            self.build_dir, self.embeddings, self.documents = self._load_stored(use_mmap)
+            self.metadata = self.artifacts.load_metadata(self.build_dir, use_mmap)
+            self.tfidf = None
+            if SCIPY_AVAILABLE and self.build_dir is not None and TfidfIndex.exists(self.build_dir):
+                self.tfidf = TfidfIndex.load(self.build_dir, use_mmap)
             
-            # Recreate FAISS index if available
+            # Load the persisted FAISS index when it matches the manifest, else rebuild it
             if FAISS_AVAILABLE and self.embeddings is not None:
-                self.index = faiss.IndexFlatIP(self.embeddings.shape[1])
-                normalized_embeddings = self.embeddings / np.linalg.norm(self.embeddings, axis=1, keepdims=True)
-                self.index.add(normalized_embeddings.astype('float32'))
+                if self.build_dir is not None and self.artifacts.verify(self.build_dir, ["index.faiss"]):
+                    self.index = _read_index(self.build_dir / "index.faiss", use_mmap)
+                else:
+                    if self.build_dir is not None and (self.build_dir / "index.faiss").exists():
+                        print("⚠️ Embeddings files do not match manifest.json; rebuilding the FAISS index")
+                    vectors = np.asarray(self.embeddings, dtype=np.float32)
+                    self.index = faiss.IndexFlatIP(vectors.shape[1])
+                    normalized_embeddings = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+                    self.index.add(normalized_embeddings)
             
             print(f"✅ Loaded embeddings for {len(self.documents)} documents")
             return True
@@ -277,7 +372,7 @@ class VectorEmbeddingManager:
         """Get embedding statistics."""
         return {
             "total_documents": len(self.documents),
-            "embedding_dimension": self.embeddings.shape[1] if self.embeddings is not None else 0,
+            "embedding_dimension": self._dimension(),
             "model_type": "SentenceTransformer" if self.model else "TF-IDF",
             "faiss_available": FAISS_AVAILABLE,
             "index_created": self.index is not None
@@ -0,0 +1,57 @@
+# Per-source Ingestion Watermarks
+
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional
+
+
+class WatermarkStore:
+    """
+    Persists the newest value seen per incremental source (e.g. the latest
+    launch ``date_utc`` or APOD date) so the next ingestion run only asks
+    upstream for records past it.
+
+    Values are ISO-8601 strings, which order correctly as plain strings.
+    """
+
+    def __init__(self, data_dir: str = "training_data"):
+        self.path = Path(data_dir) / "state" / "watermarks.json"
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._watermarks: Dict[str, Dict[str, Any]] = self._load()
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        if not self.path.exists():
+            return {}
+        with open(self.path, "r") as f:
+            return json.load(f)
+
+    def get(self, source: str) -> Optional[str]:
+        """Return the watermark for a source, or None if it has never been ingested."""
+        entry = self._watermarks.get(source)
+        return entry["value"] if entry else None
+
+    def advance(self, source: str, values: Iterable[Optional[str]]) -> Optional[str]:
+        """Move a source's watermark forward to the newest of ``values``."""
+        newest = max((value for value in values if value), default=None)
+        current = self.get(source)
+        if newest and (current is None or newest > current):
+            self._watermarks[source] = {"value": newest, "updated_at": datetime.now().isoformat()}
+        return self.get(source)
+
+    def reset(self, source: Optional[str] = None):
+        """Forget one source's watermark, or all of them."""
+        if source is None:
+            self._watermarks = {}
+        else:
+            self._watermarks.pop(source, None)
+
+    def save(self):
+        tmp_path = self.path.with_suffix(".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(self._watermarks, f, indent=2)
+        os.replace(tmp_path, self.path)
+
+    def to_dict(self) -> Dict[str, Optional[str]]:
+        return {source: entry["value"] for source, entry in self._watermarks.items()}
@@ -0,0 +1,123 @@
+# Benchmark: training dataset storage formats
+#
+# Builds the training dataset from synthetic normalized records and compares
+# the old double write (CSV + indented JSON) with the partitioned zstd Parquet
+# dataset: bytes on disk, write time, full load time and the time to load two
+# columns of one source.
+#
+# Usage (from ai-service/):
+#   python benchmarks/bench_dataset_storage.py --records 100000
+#   python benchmarks/bench_dataset_storage.py --json results.json   # keep numbers for comparison
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable
+
+import pandas as pd
+
+# Add the service root to the path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.dataset_storage import PYARROW_AVAILABLE, read_dataset, write_dataset
+from app.core.normalization import NASA_NORMALIZER, SPACEX_NORMALIZER
+from app.core.training_manager import TrainingDataManager
+from bench_normalization import raw_record_factories
+
+
+def disk_bytes(path: Path) -> int:
+    if path.is_file():
+        return path.stat().st_size
+    return sum(child.stat().st_size for child in path.rglob("*") if child.is_file())
+
+
+def load_csv_projection(path: Path, source: str) -> pd.DataFrame:
+    frame = pd.read_csv(path, usecols=["input", "output", "source"])
+    return frame.loc[frame["source"] == source, ["input", "output"]]
+
+
+def timed(fn: Callable[[], Any], repeat: int) -> float:
+    """Best-of-``repeat`` wall time."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark training dataset storage formats")
+    parser.add_argument("--records", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement (best is reported)")
+    parser.add_argument("--json", help="Also write the results to this JSON file")
+    args = parser.parse_args()
+
+    if not PYARROW_AVAILABLE:
+        sys.exit("pyarrow is not installed")
+
+    factories = raw_record_factories()
+    types = list(factories)
+    raw = [factories[types[i % len(types)]](i) for i in range(args.records)]
+    random.Random(7).shuffle(raw)
+    nasa_types = set(NASA_NORMALIZER.specs)
+    data = {
+        "nasa": NASA_NORMALIZER.normalize([record for record in raw if record["type"] in nasa_types]),
+        "spacex": SPACEX_NORMALIZER.normalize([record for record in raw if record["type"] not in nasa_types]),
+    }
+
+    with tempfile.TemporaryDirectory() as tmp:
+        manager = TrainingDataManager(tmp)
+        manager.prepare_training_dataset(data)
+        frame = manager.load_training_dataset()
+        source = frame["source"].value_counts().index[0]
+        projection = {"columns": ["input", "output"], "filters": {"source": source}}
+
+        csv_path = Path(tmp) / "training_dataset.csv"
+        json_path = Path(tmp) / "training_dataset.json"
+        parquet_path = Path(tmp) / "training_dataset.parquet"
+
+        def write_legacy():
+            frame.to_csv(csv_path, index=False)
+            frame.to_json(json_path, orient="records", indent=2)
+
+        results = [
+            {
+                "format": "csv + indented json",
+                "bytes": None,
+                "write_seconds": timed(write_legacy, args.repeat),
+                "load_seconds": timed(lambda: pd.read_csv(csv_path), args.repeat),
+                "projected_load_seconds": timed(lambda: load_csv_projection(csv_path, source), args.repeat),
+            },
+            {
+                "format": "parquet (zstd, partitioned)",
+                "bytes": None,
+                "write_seconds": timed(lambda: write_dataset(frame, parquet_path), args.repeat),
+                "load_seconds": timed(lambda: read_dataset(parquet_path), args.repeat),
+                "projected_load_seconds": timed(lambda: read_dataset(parquet_path, **projection), args.repeat),
+            },
+        ]
+        results[0]["bytes"] = disk_bytes(csv_path) + disk_bytes(json_path)
+        results[1]["bytes"] = disk_bytes(parquet_path)
+
+    print(f"{len(frame)} training examples from {args.records} records; projection: 2 columns of '{source}'")
+    print(f"{'format':30} {'MB':>8} {'write s':>9} {'load s':>9} {'projected s':>12}")
+    print("-" * 72)
+    for row in results:
+        for key in ("write_seconds", "load_seconds", "projected_load_seconds"):
+            row[key] = round(row[key], 4)
+        print(f"{row['format']:30} {row['bytes'] / 1e6:>8.2f} {row['write_seconds']:>9} "
+              f"{row['load_seconds']:>9} {row['projected_load_seconds']:>12}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"args": vars(args), "training_examples": len(frame), "results": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+# Benchmark: embedding artifact formats
+#
+# Writes the same synthetic embeddings (vectors, documents and metadata) in
+# the old unversioned layout (embeddings.json with indent=2 holding every
+# vector, documents and metadata, plus embeddings.npy and metadata.pkl) and as
+# versioned builds with float32 and float16 vectors, then reports write time,
+# bytes on disk and VectorEmbeddingManager.load_embeddings() time for each.
+#
+# Usage (from ai-service/):
+#   python benchmarks/bench_embedding_artifacts.py --documents 100000 --dim 384
+#   python benchmarks/bench_embedding_artifacts.py --json results.json   # keep numbers for comparison
+
+import argparse
+import json
+import os
+import pickle
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+import numpy as np
+
+# Add the service root to the path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.vector_embeddings import FAISS_AVAILABLE, VectorEmbeddingManager
+
+
+def disk_bytes(path: Path) -> int:
+    return sum(child.stat().st_size for child in path.rglob("*") if child.is_file())
+
+
+def timed(fn: Callable[[], Any]) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def write_legacy(manager: VectorEmbeddingManager, documents: List[str], metadata: List[Dict[str, Any]]):
+    """The files create_embeddings() wrote before builds were versioned."""
+    embedding_data = {
+        "embeddings": manager.embeddings.tolist(),
+        "documents": documents,
+        "metadata": metadata,
+        "created_at": datetime.now().isoformat(),
+        "total_documents": len(documents),
+        "embedding_dimension": manager.embeddings.shape[1],
+    }
+    with open(manager.embeddings_dir / "embeddings.json", "w") as f:
+        json.dump(embedding_data, f, indent=2)
+    np.save(manager.embeddings_dir / "embeddings.npy", manager.embeddings)
+    with open(manager.embeddings_dir / "metadata.pkl", "wb") as f:
+        pickle.dump(metadata, f)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark embedding artifact formats")
+    parser.add_argument("--documents", type=int, default=100_000)
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--json", help="Also write the results to this JSON file")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(7)
+    vectors = rng.standard_normal((args.documents, args.dim), dtype=np.float32)
+    metadata = [
+        {"input": f"Tell me about the exoplanet Kepler-{i} b", "output": f"Exoplanet Kepler-{i} b orbits its star "
+         f"every {i % 400 + 1} days", "type": "exoplanet_info", "source": "NASA Exoplanet Archive", "data_type": None}
+        for i in range(args.documents)
+    ]
+    documents = [f"{row['input']} {row['output']}" for row in metadata]
+    summary = {"created_at": datetime.now().isoformat(), "total_documents": args.documents,
+               "embedding_dimension": args.dim}
+
+    results = []
+    for layout in ("legacy json", "build float32", "build float16"):
+        with tempfile.TemporaryDirectory() as tmp:
+            manager = VectorEmbeddingManager(tmp)
+            manager.embeddings = vectors
+            manager.index = None  # Formats are compared without the FAISS index
+            if layout == "legacy json":
+                write_seconds = timed(lambda: write_legacy(manager, documents, metadata))
+            else:
+                manager.vector_dtype = layout.split()[1]
+                write_seconds = timed(lambda: manager._save_build(documents, metadata, summary))
+            size = disk_bytes(manager.embeddings_dir)
+
+            loads = {}
+            for mode in ("memory", "mmap"):
+                reader = VectorEmbeddingManager(tmp)
+                loads[mode] = timed(lambda: reader.load_embeddings(mode))
+            results.append({
+                "layout": layout,
+                "mb": round(size / 1e6, 1),
+                "write_seconds": round(write_seconds, 3),
+                "load_seconds_memory": round(loads["memory"], 3),
+                "load_seconds_mmap": round(loads["mmap"], 3),
+            })
+
+    print(f"{args.documents} documents x {args.dim} dims (FAISS index rebuilt on load: "
+          f"{FAISS_AVAILABLE})")
+    print(f"{'layout':15} {'MB':>8} {'write s':>9} {'load s (memory)':>16} {'load s (mmap)':>14}")
+    print("-" * 66)
+    for row in results:
+        print(f"{row['layout']:15} {row['mb']:>8} {row['write_seconds']:>9} "
+              f"{row['load_seconds_memory']:>16} {row['load_seconds_mmap']:>14}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"args": vars(args), "results": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
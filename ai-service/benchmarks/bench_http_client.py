@@ -0,0 +1,77 @@
+# Benchmark: per-call ClientSession vs shared pooled HTTP client
+#
+# Usage (from ai-service/):
+#   python benchmarks/bench_http_client.py --requests 200
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+import aiohttp
+from aiohttp import web
+
+# Add the service root to the path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.http_client import SpaceHTTPClient
+
+
+async def start_stub_server(port: int) -> web.AppRunner:
+    """Start a local stub that answers every GET with a small JSON array."""
+    async def handler(request):
+        return web.json_response([{"id": i, "name": f"record {i}"} for i in range(10)])
+
+    app = web.Application()
+    app.router.add_get("/{tail:.*}", handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", port).start()
+    return runner
+
+
+async def per_call_sessions(url: str, count: int) -> float:
+    """Old behaviour: one ClientSession (and connector) per fetch."""
+    start = time.perf_counter()
+    for _ in range(count):
+        async with aiohttp.ClientSession() as session:
+            async with session.get(url) as response:
+                await response.json()
+    return time.perf_counter() - start
+
+
+async def pooled_client(url: str, count: int) -> float:
+    """New behaviour: every fetch reuses the app-scoped pooled client."""
+    client = SpaceHTTPClient()
+    await client.start()
+    start = time.perf_counter()
+    for _ in range(count):
+        await client.get_json(url)
+    elapsed = time.perf_counter() - start
+    await client.close()
+    return elapsed
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Compare per-call sessions with the pooled HTTP client")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    runner = await start_stub_server(args.port)
+    url = f"http://127.0.0.1:{args.port}/v4/launches"
+    try:
+        before = await per_call_sessions(url, args.requests)
+        after = await pooled_client(url, args.requests)
+    finally:
+        await runner.cleanup()
+
+    print(f"requests:            {args.requests}")
+    print(f"per-call sessions:   {before:.3f}s ({before / args.requests * 1000:.2f} ms/request)")
+    print(f"pooled client:       {after:.3f}s ({after / args.requests * 1000:.2f} ms/request)")
+    print(f"speedup:             {before / after:.1f}x")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,234 @@
+# Benchmark: ingestion fetchers and collect_training_data against the upstream simulator
+#
+# Starts benchmarks/upstream_simulator.py in a subprocess, points the service
+# at it and reports records/sec, p50/p99 fetch latency and peak RSS per fetcher
+# and for collect_training_data end to end.
+#
+# Usage (from ai-service/):
+#   python benchmarks/bench_ingestion.py --iterations 5 --latency-ms 30 --size starlink=10000
+#   python benchmarks/bench_ingestion.py --json results.json   # keep numbers for comparison
+
+import argparse
+import asyncio
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+import numpy as np
+
+SERVICE_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SIMULATOR = os.path.join(SERVICE_ROOT, "benchmarks", "upstream_simulator.py")
+
+# Add the service root to the path for imports
+sys.path.append(SERVICE_ROOT)
+
+# Process memory sampling (optional dependency)
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+
+
+class PeakRSSSampler:
+    """Tracks peak resident memory while a benchmark section runs."""
+
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self.peak = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def __enter__(self) -> "PeakRSSSampler":
+        if PSUTIL_AVAILABLE:
+            process = psutil.Process()
+            self.peak = process.memory_info().rss
+
+            def sample():
+                while not self._stop.is_set():
+                    self.peak = max(self.peak, process.memory_info().rss)
+                    time.sleep(self.interval)
+
+            self._thread = threading.Thread(target=sample, daemon=True)
+            self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+        else:
+            # Without psutil only the process-lifetime peak is known (KiB on Linux)
+            self.peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def start_simulator(args: argparse.Namespace) -> subprocess.Popen:
+    """Run the simulator in its own process so its memory is not counted."""
+    command = [
+        sys.executable, SIMULATOR,
+        "--port", str(args.port),
+        "--latency-ms", str(args.latency_ms),
+        "--jitter-ms", str(args.jitter_ms),
+        "--error-rate", str(args.error_rate),
+    ]
+    for size in args.size:
+        command += ["--size", size]
+    if args.record_dir:
+        command += ["--record-dir", os.path.abspath(args.record_dir)]
+    process = subprocess.Popen(command, stdout=subprocess.DEVNULL)
+
+    deadline = time.time() + 15
+    while time.time() < deadline:
+        try:
+            urllib.request.urlopen(f"http://127.0.0.1:{args.port}/__stats", timeout=1)
+            return process
+        except OSError:
+            time.sleep(0.1)
+    process.terminate()
+    raise RuntimeError("Upstream simulator did not start")
+
+
+async def measure(
+    name: str,
+    run: Callable[[], Awaitable[int]],
+    iterations: int,
+) -> Dict[str, Any]:
+    """
+    Run ``run`` (returning a record count) ``iterations`` times and summarize it.
+    A run that returns no records fails the benchmark rather than timing an empty fetch.
+    """
+    latencies: List[float] = []
+    records = 0
+    with PeakRSSSampler() as rss:
+        for _ in range(iterations):
+            start = time.perf_counter()
+            count = await run()
+            latencies.append(time.perf_counter() - start)
+            if count == 0:
+                raise RuntimeError(f"{name} returned no records; check the simulator serves what it requests")
+            records += count
+
+    total = sum(latencies)
+    return {
+        "name": name,
+        "iterations": iterations,
+        "records": records // iterations,
+        "records_per_sec": round(records / total, 1) if total > 0 else 0.0,
+        "p50_ms": round(float(np.percentile(latencies, 50)) * 1000, 2),
+        "p99_ms": round(float(np.percentile(latencies, 99)) * 1000, 2),
+        "peak_rss_mb": round(rss.peak / (1024 * 1024), 1),
+    }
+
+
+def count_of(fetch: Callable[[], Awaitable[List]]) -> Callable[[], Awaitable[int]]:
+    async def run() -> int:
+        return len(await fetch())
+    return run
+
+
+async def run_benchmarks(args: argparse.Namespace) -> List[Dict[str, Any]]:
+    # Imported after the environment points the service at the simulator
+    from app.api.endpoints import data_ingestion as ingestion
+    from app.core.http_client import close_http_client
+    from app.core.training_manager import TrainingDataManager
+
+    fetchers: Dict[str, Callable[[], Awaitable[List]]] = {
+        "fetch_nasa_apod": ingestion.fetch_nasa_apod,
+        "fetch_nasa_neo": ingestion.fetch_nasa_neo,
+        "fetch_nasa_mars_data": ingestion.fetch_nasa_mars_data,
+        "fetch_nasa_exoplanets": ingestion.fetch_nasa_exoplanets,
+        "fetch_nasa_techport": ingestion.fetch_nasa_techport,
+        "fetch_spacex_launches": ingestion.fetch_spacex_launches,
+        "fetch_spacex_rockets": ingestion.fetch_spacex_rockets,
+        "fetch_spacex_capsules": ingestion.fetch_spacex_capsules,
+        "fetch_spacex_crew": ingestion.fetch_spacex_crew,
+        "fetch_spacex_payloads": ingestion.fetch_spacex_payloads,
+        "fetch_spacex_starlink": ingestion.fetch_spacex_starlink,
+        # Full-collection variants exercise the bulk paths
+        "fetch_nasa_exoplanets (all)": lambda: ingestion.fetch_nasa_exoplanets(limit=None),
+        "fetch_spacex_payloads (all)": lambda: ingestion.fetch_spacex_payloads(limit=None),
+        "fetch_spacex_starlink (all)": lambda: ingestion.fetch_spacex_starlink(limit=None),
+    }
+
+    results = []
+    try:
+        for name, fetch in fetchers.items():
+            if args.only and not any(selected in name for selected in args.only):
+                continue
+            results.append(await measure(name, count_of(fetch), args.iterations))
+
+        if not args.skip_collect:
+            manager = TrainingDataManager()
+
+            async def collect() -> int:
+                data = await manager.collect_training_data(full_refresh=True)
+                empty = [name for name, report in data["metadata"]["source_reports"].items() if report["records"] == 0]
+                if empty:
+                    raise RuntimeError(f"collect_training_data fetched no records from: {', '.join(empty)}")
+                return data["metadata"]["total_records"]
+
+            results.append(await measure("collect_training_data", collect, args.collect_iterations))
+    finally:
+        await close_http_client()
+    return results
+
+
+def print_table(results: List[Dict[str, Any]]):
+    header = f"{'benchmark':32} {'records':>8} {'rec/s':>10} {'p50 ms':>9} {'p99 ms':>9} {'peak RSS MB':>12}"
+    print(header)
+    print("-" * len(header))
+    for row in results:
+        print(f"{row['name']:32} {row['records']:>8} {row['records_per_sec']:>10} "
+              f"{row['p50_ms']:>9} {row['p99_ms']:>9} {row['peak_rss_mb']:>12}")
+
+
+def main():
+    from upstream_simulator import add_simulator_arguments
+
+    parser = argparse.ArgumentParser(description="Benchmark ingestion fetchers against the offline upstream simulator")
+    add_simulator_arguments(parser)
+    parser.add_argument("--iterations", type=int, default=5, help="Runs per fetcher")
+    parser.add_argument("--collect-iterations", type=int, default=2, help="Runs of collect_training_data")
+    parser.add_argument("--only", action="append", help="Only run fetchers whose name contains this (repeatable)")
+    parser.add_argument("--skip-collect", action="store_true", help="Skip the end-to-end collect_training_data run")
+    parser.add_argument("--json", help="Also write the results to this JSON file")
+    args = parser.parse_args()
+
+    base = f"http://127.0.0.1:{args.port}"
+    os.environ.update({
+        "NASA_BASE_URL": base,
+        "SPACEX_BASE_URL": f"{base}/v4",
+        "EXOPLANET_TAP_URL": f"{base}/TAP/sync",
+        # Measure the fetch path itself, not the response cache or the NASA quota
+        "HTTP_CACHE_MODE": "off",
+        "NASA_RATE_LIMIT_PER_HOUR": os.environ.get("NASA_RATE_LIMIT_PER_HOUR", "1000000000"),
+    })
+    json_path = os.path.abspath(args.json) if args.json else None
+
+    simulator = start_simulator(args)
+    workdir = tempfile.mkdtemp(prefix="bench_ingestion_")
+    os.chdir(workdir)  # Keep training_data/ output out of the source tree
+    try:
+        results = asyncio.run(run_benchmarks(args))
+    finally:
+        simulator.terminate()
+        simulator.wait()
+
+    print()
+    print(f"latency: {args.latency_ms}±{args.jitter_ms} ms, error rate: {args.error_rate}, "
+          f"sizes: {', '.join(args.size) or 'defaults'}, psutil: {PSUTIL_AVAILABLE}")
+    print_table(results)
+    if json_path:
+        with open(json_path, "w") as f:
+            json.dump({"args": vars(args), "results": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
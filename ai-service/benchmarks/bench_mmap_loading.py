@@ -0,0 +1,140 @@
+# Benchmark: embedding load modes across worker processes
+#
+# Publishes a synthetic embeddings build (vectors.npy + documents.arrow),
+# then starts N worker processes that each load it with
+# VectorEmbeddingManager.load_embeddings() and answer one query, like uvicorn
+# workers serving search. Reports per-worker startup time and the memory the
+# loaded data costs across all workers, as RSS (counts shared pages once per
+# process) and PSS (shared pages split between the processes mapping them),
+# for the "memory" and "mmap" load modes.
+#
+# Usage (from ai-service/):
+#   python benchmarks/bench_mmap_loading.py --documents 100000 --dim 384 --workers 1 2 4
+#   python benchmarks/bench_mmap_loading.py --json results.json   # keep numbers for comparison
+
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+import numpy as np
+
+# Add the service root to the path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.dataset_storage import PYARROW_AVAILABLE
+from app.core.embedding_artifacts import EmbeddingArtifactStore
+import app.core.vector_embeddings as vector_embeddings
+from app.core.vector_embeddings import FAISS_AVAILABLE, VectorEmbeddingManager
+
+
+def memory_kb() -> Dict[str, int]:
+    """RSS and PSS of this process, from /proc (Linux)."""
+    usage = {}
+    with open("/proc/self/smaps_rollup") as f:
+        for line in f:
+            key, _, value = line.partition(":")
+            if key in ("Rss", "Pss"):
+                usage[key.lower()] = int(value.split()[0])
+    return usage
+
+
+def write_corpus(data_dir: Path, documents: int, dim: int) -> Path:
+    """Publish a build of random vectors, short documents and (with faiss) the index; returns its directory."""
+    store = EmbeddingArtifactStore(data_dir / "embeddings")
+    build_dir = store.begin_build()
+    vectors = np.random.default_rng(7).standard_normal((documents, dim), dtype=np.float32)
+    store.save_vectors(build_dir, vectors)
+    if FAISS_AVAILABLE:
+        index = vector_embeddings.faiss.IndexFlatIP(dim)
+        index.add(vectors / np.linalg.norm(vectors, axis=1, keepdims=True))
+        vector_embeddings.faiss.write_index(index, str(build_dir / "index.faiss"))
+    texts = [f"Tell me about apod data from NASA APOD Astronomy picture {i} of a distant galaxy" for i in range(documents)]
+    metadata = [{"input": text, "output": text, "type": "general_info", "source": "NASA APOD", "data_type": "apod"}
+                for text in texts]
+    store.save_documents(build_dir, texts, metadata)
+    store.publish(build_dir, {"total_documents": documents, "embedding_dimension": dim})
+    return build_dir
+
+
+def worker(data_dir: str, mode: str, results, release):
+    before = memory_kb()
+    start = time.perf_counter()
+    manager = VectorEmbeddingManager(data_dir)
+    manager.load_embeddings(mode)
+    # One full scan, like a search over every vector, so all pages are resident
+    query = np.ones(manager.embeddings.shape[1], dtype=np.float32)
+    top = int(np.argmax(manager.embeddings @ query))
+    _ = manager.documents[top]
+    startup = time.perf_counter() - start
+    after = memory_kb()
+    results.put({
+        "startup_seconds": startup,
+        "rss_kb": after["rss"] - before["rss"],
+        "pss_kb": after["pss"] - before["pss"],
+    })
+    # Hold the mapping until every worker has measured, as live workers would
+    release.wait()
+    # PSS splits shared pages between live mappings, so re-measure once all are loaded
+    results.put({"pss_kb_all_loaded": memory_kb()["pss"] - before["pss"]})
+
+
+def run_workers(data_dir: Path, mode: str, workers: int) -> Dict[str, Any]:
+    context = multiprocessing.get_context("spawn")
+    results = context.Queue()
+    release = context.Event()
+    processes = [context.Process(target=worker, args=(str(data_dir), mode, results, release)) for _ in range(workers)]
+    for process in processes:
+        process.start()
+    loaded = [results.get() for _ in processes]
+    release.set()
+    shared = [results.get()["pss_kb_all_loaded"] for _ in processes]
+    for process in processes:
+        process.join()
+    return {
+        "mode": mode,
+        "workers": workers,
+        "startup_seconds_mean": round(float(np.mean([row["startup_seconds"] for row in loaded])), 3),
+        "rss_mb_total": round(sum(row["rss_kb"] for row in loaded) / 1024, 1),
+        "pss_mb_total": round(sum(shared) / 1024, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark embedding load modes across worker processes")
+    parser.add_argument("--documents", type=int, default=100_000)
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--json", help="Also write the results to this JSON file")
+    args = parser.parse_args()
+
+    if not PYARROW_AVAILABLE:
+        sys.exit("pyarrow is not installed")
+
+    results: List[Dict[str, Any]] = []
+    with tempfile.TemporaryDirectory() as tmp:
+        write_corpus(Path(tmp), args.documents, args.dim)
+        for workers in args.workers:
+            for mode in ("memory", "mmap"):
+                results.append(run_workers(Path(tmp), mode, workers))
+
+    vectors_mb = args.documents * args.dim * 4 / 1e6
+    print(f"{args.documents} documents x {args.dim} float32 ({vectors_mb:.0f} MB of vectors)")
+    print(f"{'mode':8} {'workers':>8} {'startup s':>10} {'RSS MB':>9} {'PSS MB':>9}")
+    print("-" * 48)
+    for row in results:
+        print(f"{row['mode']:8} {row['workers']:>8} {row['startup_seconds_mean']:>10} "
+              f"{row['rss_mb_total']:>9} {row['pss_mb_total']:>9}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"args": vars(args), "results": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+# Benchmark: table-driven record normalization throughput
+#
+# Normalizes a batch of synthetic raw records (mixed types, in fetch order) and
+# reports records/sec overall and per record type, then compares inline and
+# process-pool normalize_async() on the mixed batch: wall time and the longest
+# event loop stall a concurrent request would have seen.
+#
+# Usage (from ai-service/):
+#   python benchmarks/bench_normalization.py --records 100000
+#   NORMALIZE_WORKERS=4 python benchmarks/bench_normalization.py --records 100000
+#   python benchmarks/bench_normalization.py --json results.json   # keep numbers for comparison
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+from typing import Any, Callable, Dict, List
+
+# Add the service root to the path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.api.endpoints.data_ingestion import map_spacex_payload, map_spacex_starlink
+from app.core.mars_crawler import map_mars_photo
+from app.core.normalization import (
+    NASA_NORMALIZER, NORMALIZE_WORKERS, SPACEX_NORMALIZER, RecordNormalizer, shutdown_process_pool,
+)
+from app.core.techport_crawler import map_techport_project
+from upstream_simulator import (
+    synth_apod, synth_capsule, synth_crew, synth_exoplanet, synth_launch, synth_mars_photo,
+    synth_neo, synth_payload, synth_rocket, synth_starlink, synth_techport,
+)
+
+
+def raw_record_factories() -> Dict[str, Callable[[int], Dict[str, Any]]]:
+    """Build raw records shaped like the fetchers' output, per record type."""
+    def apod(i):
+        item = synth_apod(i)
+        return {"type": "apod", "id": f"apod_{item['date']}", "title": item["title"], "explanation": item["explanation"],
+                "date": item["date"], "url": item["url"], "media_type": item["media_type"], "source": "NASA APOD"}
+
+    def neo(i):
+        item = synth_neo(i)
+        return {"type": "neo", "name": item["name"], "nasa_jpl_url": item["nasa_jpl_url"],
+                "absolute_magnitude": item["absolute_magnitude_h"], "estimated_diameter": item["estimated_diameter"],
+                "potentially_hazardous": item["is_potentially_hazardous_asteroid"], "orbital_data": item["orbital_data"],
+                "source": "NASA NEO"}
+
+    def exoplanet(i):
+        item = synth_exoplanet(i)
+        return {"type": "exoplanet", "planet_name": item["pl_name"], "host_star": item["hostname"],
+                "discovery_year": item["disc_year"], "orbital_period": item["pl_orbper"], "planet_radius": item["pl_rade"],
+                "planet_mass": item["pl_masse"], "stellar_distance": item["sy_dist"], "source": "NASA Exoplanet Archive"}
+
+    def launch(i):
+        item = synth_launch(i)
+        return {"type": "launch", **{key: item[key] for key in (
+            "id", "name", "date_utc", "success", "details", "rocket", "payloads", "flight_number", "upcoming")},
+            "source": "SpaceX API"}
+
+    def rocket(i):
+        item = synth_rocket(i)
+        return {"type": "rocket", **{key: item[key] for key in (
+            "name", "description", "height", "diameter", "mass", "cost_per_launch", "success_rate_pct")},
+            "source": "SpaceX API"}
+
+    def capsule(i):
+        item = synth_capsule(i)
+        return {"type": "capsule", "serial": item["serial"], "status": item["status"], "capsule_type": item["type"],
+                "reuse_count": item["reuse_count"], "water_landings": item["water_landings"],
+                "land_landings": item["land_landings"], "source": "SpaceX API"}
+
+    def crew(i):
+        item = synth_crew(i)
+        return {"type": "crew", **{key: item[key] for key in ("name", "agency", "status", "launches")}, "source": "SpaceX API"}
+
+    return {
+        "apod": apod,
+        "neo": neo,
+        "mars_photo": lambda i: map_mars_photo(synth_mars_photo(i, "curiosity", i // 25)),
+        "exoplanet": exoplanet,
+        "technology": lambda i: map_techport_project(synth_techport(i)),
+        "launch": launch,
+        "rocket": rocket,
+        "capsule": capsule,
+        "crew": crew,
+        "payload": lambda i: map_spacex_payload(synth_payload(i)),
+        "starlink": lambda i: map_spacex_starlink(synth_starlink(i)),
+    }
+
+
+def time_normalize(normalizer: RecordNormalizer, records: List[Dict[str, Any]], repeat: int) -> float:
+    """Best-of-``repeat`` wall time for one normalize() call."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        normalizer.normalize(records)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+async def time_normalize_async(
+    normalizers: List[RecordNormalizer],
+    batches: List[List[Dict[str, Any]]],
+    threshold: int,
+) -> Dict[str, float]:
+    """Wall time of normalize_async() and the longest event loop stall while it runs."""
+    interval = 0.005
+    stalls: List[float] = []
+    done = asyncio.Event()
+
+    async def probe():
+        # Stands in for a concurrent request: how late does each wake-up fire?
+        while not done.is_set():
+            start = time.perf_counter()
+            await asyncio.sleep(interval)
+            stalls.append(time.perf_counter() - start - interval)
+
+    probe_task = asyncio.create_task(probe())
+    await asyncio.sleep(interval * 2)
+    start = time.perf_counter()
+    for normalizer, batch in zip(normalizers, batches):
+        await normalizer.normalize_async(batch, threshold=threshold)
+    elapsed = time.perf_counter() - start
+    done.set()
+    await probe_task
+    return {"seconds": round(elapsed, 4), "max_loop_stall_ms": round(max(stalls, default=0.0) * 1000, 1)}
+
+
+async def compare_execution_modes(nasa: List[Dict[str, Any]], spacex: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    normalizers = [NASA_NORMALIZER, SPACEX_NORMALIZER]
+    rows = [{"mode": "inline", **await time_normalize_async(normalizers, [nasa, spacex], threshold=10 ** 12)}]
+    if NORMALIZE_WORKERS > 1:
+        await time_normalize_async(normalizers, [nasa[:10], spacex[:10]], threshold=0)  # Start the workers
+        rows.append({
+            "mode": f"process pool ({NORMALIZE_WORKERS} workers)",
+            **await time_normalize_async(normalizers, [nasa, spacex], threshold=0),
+        })
+        shutdown_process_pool()
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark table-driven record normalization")
+    parser.add_argument("--records", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement (best is reported)")
+    parser.add_argument("--json", help="Also write the results to this JSON file")
+    args = parser.parse_args()
+
+    factories = raw_record_factories()
+    nasa_types = set(NASA_NORMALIZER.specs)
+
+    # Mixed batch in shuffled order, split like collect_training_data splits NASA and SpaceX
+    rng = random.Random(7)
+    types = list(factories)
+    mixed = [factories[types[i % len(types)]](i) for i in range(args.records)]
+    rng.shuffle(mixed)
+    nasa = [record for record in mixed if record["type"] in nasa_types]
+    spacex = [record for record in mixed if record["type"] not in nasa_types]
+
+    results = []
+    elapsed = time_normalize(NASA_NORMALIZER, nasa, args.repeat) + time_normalize(SPACEX_NORMALIZER, spacex, args.repeat)
+    results.append({"batch": "mixed", "records": len(mixed), "seconds": round(elapsed, 4),
+                    "records_per_sec": round(len(mixed) / elapsed)})
+
+    for record_type, factory in factories.items():
+        normalizer = NASA_NORMALIZER if record_type in nasa_types else SPACEX_NORMALIZER
+        records = [factory(i) for i in range(args.records)]
+        elapsed = time_normalize(normalizer, records, args.repeat)
+        results.append({"batch": record_type, "records": len(records), "seconds": round(elapsed, 4),
+                        "records_per_sec": round(len(records) / elapsed)})
+
+    print(f"{'batch':12} {'records':>9} {'seconds':>9} {'records/sec':>12}")
+    print("-" * 45)
+    for row in results:
+        print(f"{row['batch']:12} {row['records']:>9} {row['seconds']:>9} {row['records_per_sec']:>12}")
+
+    modes = asyncio.run(compare_execution_modes(nasa, spacex))
+    print()
+    print(f"{'mode':28} {'seconds':>9} {'max loop stall ms':>18}")
+    print("-" * 57)
+    for row in modes:
+        print(f"{row['mode']:28} {row['seconds']:>9} {row['max_loop_stall_ms']:>18}")
+    if NORMALIZE_WORKERS < 2:
+        print("(set NORMALIZE_WORKERS>=2 to compare the process pool)")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"args": vars(args), "results": results, "execution_modes": modes}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
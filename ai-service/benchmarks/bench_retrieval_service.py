@@ -0,0 +1,112 @@
+# Benchmark: per-request embedding loads vs. the resident retrieval service
+#
+# Publishes a synthetic embeddings build, then times a query the way the
+# trained-model endpoints used to run it (a new VectorEmbeddingManager,
+# load_embeddings(), one FAISS search) against RetrievalService, which keeps
+# the build loaded and only checks the CURRENT pointer per query. Also times
+# the reload after a second build is published. The FAISS search stands in
+# for search_similar() so the numbers do not depend on sentence-transformers;
+# with it installed the per-request path also reloads the model every time.
+#
+# Usage (from ai-service/):
+#   python benchmarks/bench_retrieval_service.py --documents 100000 --dim 384 --queries 20
+#   python benchmarks/bench_retrieval_service.py --json results.json   # keep numbers for comparison
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List
+
+import numpy as np
+
+# Add the service root to the path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.retrieval import RetrievalService
+from app.core.vector_embeddings import FAISS_AVAILABLE, VectorEmbeddingManager
+from bench_mmap_loading import write_corpus
+
+
+def faiss_query(manager: VectorEmbeddingManager):
+    manager.index.search(np.ones((1, manager.index.d), dtype=np.float32), 3)
+
+
+def per_request(data_dir: Path, queries: int) -> List[float]:
+    latencies = []
+    for _ in range(queries):
+        start = time.perf_counter()
+        manager = VectorEmbeddingManager(str(data_dir))
+        manager.load_embeddings()
+        faiss_query(manager)
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+async def resident(data_dir: Path, queries: int) -> Dict[str, float]:
+    service = RetrievalService(str(data_dir))
+    start = time.perf_counter()
+    await service.start()
+    startup = time.perf_counter() - start
+
+    latencies = []
+    for _ in range(queries):
+        start = time.perf_counter()
+        await service.refresh()
+        faiss_query(service.manager)
+        latencies.append(time.perf_counter() - start)
+
+    # Another process publishes a new build; the next query picks it up
+    write_corpus(data_dir, len(service.manager.documents), service.manager.index.d)
+    start = time.perf_counter()
+    await service.refresh()
+    faiss_query(service.manager)
+    reload = time.perf_counter() - start
+    return {"startup": startup, "latencies": latencies, "reload": reload}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the resident retrieval service")
+    parser.add_argument("--documents", type=int, default=100_000)
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--queries", type=int, default=20)
+    parser.add_argument("--json", help="Also write the results to this JSON file")
+    args = parser.parse_args()
+
+    if not FAISS_AVAILABLE:
+        sys.exit("faiss is not installed")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        write_corpus(Path(tmp), args.documents, args.dim)
+        cold = per_request(Path(tmp), args.queries)
+        warm = asyncio.run(resident(Path(tmp), args.queries))
+
+    results = [
+        {"path": "per-request load", "startup_ms": 0.0, "median_ms": np.median(cold) * 1e3,
+         "p95_ms": np.percentile(cold, 95) * 1e3, "reload_ms": None},
+        {"path": "resident service", "startup_ms": warm["startup"] * 1e3, "median_ms": np.median(warm["latencies"]) * 1e3,
+         "p95_ms": np.percentile(warm["latencies"], 95) * 1e3, "reload_ms": warm["reload"] * 1e3},
+    ]
+    for row in results:
+        for key, value in row.items():
+            if isinstance(value, float):
+                row[key] = round(float(value), 2)
+
+    print(f"{args.documents} documents x {args.dim} dims, {args.queries} queries")
+    print(f"{'path':18} {'startup ms':>11} {'median ms':>10} {'p95 ms':>9} {'reload ms':>10}")
+    print("-" * 62)
+    for row in results:
+        print(f"{row['path']:18} {row['startup_ms']:>11} {row['median_ms']:>10} {row['p95_ms']:>9} "
+              f"{row['reload_ms'] if row['reload_ms'] is not None else '-':>10}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"args": vars(args), "results": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
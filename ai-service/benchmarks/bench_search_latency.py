@@ -0,0 +1,118 @@
+# Benchmark: search_similar() latency as the corpus grows
+#
+# Publishes synthetic embeddings builds of growing size and times top-k
+# queries through VectorEmbeddingManager.search_similar(), whose hits read
+# their metadata from the loaded metadata columns, against the previous hit
+# loop that re-opened and unpickled metadata.pkl once per returned result.
+# A fixed random query vector stands in for the SentenceTransformer encoder
+# so the numbers do not depend on sentence-transformers being installed.
+#
+# Usage (from ai-service/):
+#   python benchmarks/bench_search_latency.py --sizes 10000 50000 200000 --dim 384 --top-k 5
+#   python benchmarks/bench_search_latency.py --json results.json   # keep numbers for comparison
+
+import argparse
+import json
+import os
+import pickle
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+import numpy as np
+
+# Add the service root to the path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app.core.vector_embeddings as vector_embeddings
+from app.core.vector_embeddings import FAISS_AVAILABLE, VectorEmbeddingManager
+from bench_mmap_loading import write_corpus
+
+
+class FixedQueryEncoder:
+    """Returns the same query vector for every query."""
+
+    def __init__(self, dim: int):
+        self.vector = np.random.default_rng(11).standard_normal((1, dim), dtype=np.float32)
+
+    def encode(self, texts: List[str], **kwargs) -> np.ndarray:
+        return np.repeat(self.vector, len(texts), axis=0)
+
+
+def pickled_metadata_search(manager: VectorEmbeddingManager, metadata_path: Path, top_k: int) -> List[Dict[str, Any]]:
+    """The hit loop search_similar() ran before metadata was held in columns."""
+    query = manager.model.encode(["query"])
+    query = query / np.linalg.norm(query, axis=1, keepdims=True)
+    similarities, indices = manager.index.search(query.astype("float32"), top_k)
+    results = []
+    for i, (similarity, idx) in enumerate(zip(similarities[0], indices[0])):
+        with open(metadata_path, "rb") as f:
+            metadata = pickle.load(f)
+        results.append({"rank": i + 1, "similarity": float(similarity), "document": manager.documents[idx],
+                        "metadata": metadata[idx], "input": metadata[idx].get("input", ""),
+                        "output": metadata[idx].get("output", "")})
+    return results
+
+
+def latencies(fn: Callable[[], Any], queries: int) -> List[float]:
+    times = []
+    for _ in range(queries):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark search_similar() latency against corpus size")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 50_000, 200_000])
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--top-k", type=int, default=5)
+    parser.add_argument("--queries", type=int, default=20)
+    parser.add_argument("--json", help="Also write the results to this JSON file")
+    args = parser.parse_args()
+
+    if not FAISS_AVAILABLE:
+        sys.exit("faiss is not installed")
+    vector_embeddings.SENTENCE_TRANSFORMERS_AVAILABLE = True
+
+    results: List[Dict[str, Any]] = []
+    for size in args.sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            build_dir = write_corpus(Path(tmp), size, args.dim)
+            manager = VectorEmbeddingManager(tmp)
+            manager.load_embeddings()
+            manager.model = FixedQueryEncoder(args.dim)
+
+            metadata_path = build_dir / "metadata.pkl"
+            with open(metadata_path, "wb") as f:
+                pickle.dump([manager.metadata.row(i) for i in range(size)], f)
+
+            rows = {
+                "pickled metadata": latencies(lambda: pickled_metadata_search(manager, metadata_path, args.top_k),
+                                              args.queries),
+                "metadata columns": latencies(lambda: manager.search_similar("query", args.top_k), args.queries),
+            }
+            for path, times in rows.items():
+                results.append({
+                    "documents": size,
+                    "path": path,
+                    "median_ms": round(float(np.median(times)) * 1e3, 2),
+                    "p95_ms": round(float(np.percentile(times, 95)) * 1e3, 2),
+                })
+
+    print(f"top_k={args.top_k}, {args.dim} dims, {args.queries} queries per row")
+    print(f"{'documents':>10} {'path':18} {'median ms':>10} {'p95 ms':>9}")
+    print("-" * 50)
+    for row in results:
+        print(f"{row['documents']:>10} {row['path']:18} {row['median_ms']:>10} {row['p95_ms']:>9}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"args": vars(args), "results": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
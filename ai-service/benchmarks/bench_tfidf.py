@@ -0,0 +1,149 @@
+# Benchmark: sparse TF-IDF index vs. the dense TF-IDF fallback
+#
+# Builds the fallback search index (used when sentence-transformers is not
+# installed) over synthetic training documents of growing size and reports
+# build time, index size and query latency. The sparse CSR TfidfIndex is
+# compared with the dense len(documents) x len(vocab) float64 matrix the
+# fallback used to build, whose IDF rescanned every document per term, and
+# with the word-overlap (Jaccard) search queries fell back to; the dense
+# build only runs up to --dense-limit documents.
+#
+# Usage (from ai-service/):
+#   python benchmarks/bench_tfidf.py --sizes 2000 20000 100000 --dense-limit 2000
+#   python benchmarks/bench_tfidf.py --json results.json   # keep numbers for comparison
+
+import argparse
+import json
+import os
+import re
+import sys
+import time
+from collections import Counter
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+# Add the service root to the path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.tfidf_index import SCIPY_AVAILABLE, TfidfIndex
+
+
+def synthetic_documents(count: int, vocabulary: int = 50_000, words: int = 30) -> List[str]:
+    """Training-example-like texts whose words follow a Zipf distribution."""
+    rng = np.random.default_rng(7)
+    ranks = np.minimum(rng.zipf(1.2, size=(count, words)), vocabulary)
+    return [f"Tell me about mission {i} " + " ".join(f"w{rank}" for rank in row) for i, row in enumerate(ranks)]
+
+
+def dense_tfidf(documents: List[str]) -> np.ndarray:
+    """The dense fallback create_embeddings() built before the sparse index."""
+    def tokenize(text):
+        return re.findall(r'\b\w+\b', text.lower())
+
+    vocab = set()
+    doc_tokens = []
+    for doc in documents:
+        tokens = tokenize(doc)
+        doc_tokens.append(tokens)
+        vocab.update(tokens)
+
+    vocab = sorted(list(vocab))
+    vocab_to_idx = {word: idx for idx, word in enumerate(vocab)}
+    embeddings = np.zeros((len(documents), len(vocab)))
+    for doc_idx, tokens in enumerate(doc_tokens):
+        token_counts = Counter(tokens)
+        doc_length = len(tokens)
+        for token, count in token_counts.items():
+            tf = count / doc_length
+            idf = np.log(len(documents) / (1 + sum(1 for doc_tokens_i in doc_tokens if token in doc_tokens_i)))
+            embeddings[doc_idx, vocab_to_idx[token]] = tf * idf
+    return embeddings
+
+
+def jaccard_search(documents: List[str], query: str, top_k: int):
+    """The word-overlap search queries fell back to without an embedding model."""
+    query_words = set(query.lower().split())
+    scores = []
+    for i, doc in enumerate(documents):
+        doc_words = set(doc.lower().split())
+        union = len(query_words | doc_words)
+        scores.append((len(query_words & doc_words) / union if union > 0 else 0, i))
+    scores.sort(reverse=True)
+    return scores[:top_k]
+
+
+def timed(fn: Callable[[], Any]) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def median_ms(fn: Callable[[], Any], queries: int) -> float:
+    return round(float(np.median([timed(fn) for _ in range(queries)])) * 1e3, 2)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the sparse TF-IDF fallback index")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[2_000, 20_000, 100_000])
+    parser.add_argument("--dense-limit", type=int, default=2_000, help="Largest size the dense build runs at")
+    parser.add_argument("--top-k", type=int, default=5)
+    parser.add_argument("--queries", type=int, default=10)
+    parser.add_argument("--json", help="Also write the results to this JSON file")
+    args = parser.parse_args()
+
+    if not SCIPY_AVAILABLE:
+        sys.exit("scipy is not installed")
+
+    query = "Tell me about mission w3 w17 w250"
+    results: List[Dict[str, Any]] = []
+    for size in args.sizes:
+        documents = synthetic_documents(size)
+
+        holder: Dict[str, Optional[Any]] = {}
+        sparse_build = timed(lambda: holder.update(index=TfidfIndex.fit(documents)))
+        index = holder["index"]
+        matrix = index.matrix
+        results.append({
+            "documents": size,
+            "vocabulary": len(index.vocabulary),
+            "engine": "sparse csr",
+            "build_seconds": round(sparse_build, 3),
+            "index_mb": round((matrix.data.nbytes + matrix.indices.nbytes + matrix.indptr.nbytes) / 1e6, 1),
+            "query_ms": median_ms(lambda: index.search(query, args.top_k), args.queries),
+        })
+
+        jaccard = {
+            "documents": size,
+            "vocabulary": len(index.vocabulary),
+            "engine": "jaccard (no index)",
+            "build_seconds": None,
+            "index_mb": None,
+            "query_ms": median_ms(lambda: jaccard_search(documents, query, args.top_k), args.queries),
+        }
+        if size <= args.dense_limit:
+            dense_build = timed(lambda: holder.update(dense=dense_tfidf(documents)))
+            results.append({
+                **jaccard,
+                "engine": "dense + jaccard",
+                "build_seconds": round(dense_build, 3),
+                "index_mb": round(holder.pop("dense").nbytes / 1e6, 1),
+            })
+        else:
+            results.append(jaccard)
+
+    print(f"top_k={args.top_k}, query {query!r}")
+    print(f"{'documents':>10} {'vocab':>7} {'engine':20} {'build s':>9} {'index MB':>9} {'query ms':>9}")
+    print("-" * 70)
+    for row in results:
+        print(f"{row['documents']:>10} {row['vocabulary']:>7} {row['engine']:20} "
+              f"{row['build_seconds'] if row['build_seconds'] is not None else '-':>9} "
+              f"{row['index_mb'] if row['index_mb'] is not None else '-':>9} {row['query_ms']:>9}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"args": vars(args), "results": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
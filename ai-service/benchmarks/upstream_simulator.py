@@ -0,0 +1,565 @@
+# Offline stand-in for the NASA, SpaceX and Exoplanet Archive APIs
+#
+# Serves every endpoint the ingestion fetchers use, with configurable latency,
+# error rate and collection sizes. Items are synthesized, or built from
+# responses recorded in the HTTP cache when --record-dir is given.
+#
+# Usage (from ai-service/):
+#   python benchmarks/upstream_simulator.py --port 8900 --latency-ms 40 --size starlink=10000
+#
+# Then point the service at it:
+#   NASA_BASE_URL=http://127.0.0.1:8900
+#   SPACEX_BASE_URL=http://127.0.0.1:8900/v4
+#   EXOPLANET_TAP_URL=http://127.0.0.1:8900/TAP/sync
+
+import argparse
+import asyncio
+import json
+import math
+import random
+import re
+from collections import Counter
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import pandas as pd
+from aiohttp import web
+
+# Default number of items per collection
+DEFAULT_SIZES = {
+    "apod": 2000,
+    "neo": 200,
+    "mars_photos_per_sol": 100,
+    "mars_sols": 4000,
+    "techport": 500,
+    "exoplanets": 5600,
+    "launches": 200,
+    "rockets": 4,
+    "capsules": 30,
+    "crew": 30,
+    "payloads": 230,
+    "starlink": 5000,
+}
+
+MARS_PAGE_SIZE = 25
+ROVERS = ["curiosity", "opportunity", "spirit", "perseverance"]
+FILLER = (
+    "Observations from this mission add to a growing record of the solar system, "
+    "from the surface of Mars to the outer planets and the stars beyond. "
+)
+
+
+def filler(i: int, sentences: int = 3) -> str:
+    return f"Item {i}. " + FILLER * sentences
+
+
+def synth_apod(i: int) -> Dict[str, Any]:
+    # Item 0 is today's picture (UTC, as the fetcher computes its start_date), so date ranges ending today hit the archive
+    return {
+        "date": (datetime.utcnow().date() - timedelta(days=i)).isoformat(),
+        "title": f"Astronomy Picture {i}",
+        "explanation": filler(i, 6),
+        "url": f"https://apod.nasa.gov/apod/image/{i}.jpg",
+        "media_type": "image",
+        "service_version": "v1",
+    }
+
+
+def synth_neo(i: int) -> Dict[str, Any]:
+    return {
+        "id": str(2000000 + i),
+        "name": f"({2000 + i} XY{i % 99})",
+        "nasa_jpl_url": f"https://ssd.jpl.nasa.gov/sbdb.cgi?sstr={2000000 + i}",
+        "absolute_magnitude_h": 18 + (i % 100) / 10,
+        "estimated_diameter": {"kilometers": {"estimated_diameter_min": 0.1, "estimated_diameter_max": 0.3}},
+        "is_potentially_hazardous_asteroid": i % 10 == 0,
+        "orbital_data": {"orbit_id": str(i % 300), "eccentricity": "0.21", "inclination": "7.1"},
+    }
+
+
+def synth_mars_photo(i: int, rover: str, sol: int) -> Dict[str, Any]:
+    return {
+        "id": i,
+        "sol": sol,
+        "camera": {"id": 20, "name": "FHAZ", "full_name": "Front Hazard Avoidance Camera"},
+        "img_src": f"https://mars.nasa.gov/msl-raw-images/{rover}/{sol}/{i}.JPG",
+        "earth_date": (date(2012, 8, 6) + timedelta(days=int(sol * 1.0275))).isoformat(),
+        "rover": {"id": 5, "name": rover.title(), "landing_date": "2012-08-06", "status": "active"},
+    }
+
+
+def synth_techport(i: int) -> Dict[str, Any]:
+    return {
+        "projectId": 1000 + i,
+        "title": f"Technology Project {i}",
+        "description": filler(i, 4),
+        "benefits": filler(i, 1),
+        "statusDescription": "Active" if i % 3 else "Completed",
+        "startDateString": "Oct 2020",
+        "endDateString": "Sep 2025",
+        "program": {"title": "Game Changing Development"},
+    }
+
+
+def synth_exoplanet(i: int) -> Dict[str, Any]:
+    return {
+        "pl_name": f"Kepler-{i} b",
+        "hostname": f"Kepler-{i}",
+        "disc_year": 1995 + i % 30,
+        "discoverymethod": "Transit" if i % 4 else "Radial Velocity",
+        "pl_orbper": round(1 + (i * 7.31) % 400, 4),
+        "pl_rade": round(0.5 + (i * 0.37) % 15, 3) if i % 9 else None,
+        "pl_masse": round(0.1 + (i * 3.1) % 900, 3) if i % 5 else None,
+        "pl_eqt": 200 + i % 1500,
+        "sy_dist": round(10 + (i * 1.7) % 3000, 2),
+    }
+
+
+def synth_launch(i: int) -> Dict[str, Any]:
+    launch_date = date(2006, 3, 24) + timedelta(days=i * 14)
+    return {
+        "id": f"launch{i:06d}",
+        "name": f"Mission {i}",
+        "date_utc": f"{launch_date.isoformat()}T12:00:00.000Z",
+        "date_unix": i,
+        "success": i % 12 != 0,
+        "details": filler(i, 2),
+        "rocket": "5e9d0d95eda69973a809d1ec",
+        "payloads": [f"payload{i:06d}"],
+        "launchpad": "5e9e4502f509094188566f88",
+        "flight_number": i + 1,
+        "upcoming": launch_date > date.today(),
+        "links": {"patch": {"small": f"https://images2.imgbox.com/{i}.png"}, "webcast": f"https://youtu.be/{i}"},
+        "cores": [{"core": f"core{i}", "flight": 1, "reused": False, "landing_success": True}],
+        "fairings": {"reused": False, "recovery_attempt": False},
+    }
+
+
+def synth_rocket(i: int) -> Dict[str, Any]:
+    return {
+        "id": f"rocket{i:04d}",
+        "name": f"Falcon {i}",
+        "description": filler(i, 3),
+        "height": {"meters": 70, "feet": 229.6},
+        "diameter": {"meters": 3.7, "feet": 12},
+        "mass": {"kg": 549054, "lb": 1207920},
+        "cost_per_launch": 50000000,
+        "success_rate_pct": 98,
+        "first_stage": {"engines": 9, "fuel_amount_tons": 385},
+        "second_stage": {"engines": 1, "fuel_amount_tons": 90},
+        "engines": {"number": 9, "type": "merlin"},
+        "flickr_images": [f"https://farm1.staticflickr.com/{i}/{n}.jpg" for n in range(5)],
+    }
+
+
+def synth_capsule(i: int) -> Dict[str, Any]:
+    return {
+        "id": f"capsule{i:04d}",
+        "serial": f"C{100 + i}",
+        "status": "retired" if i % 2 else "active",
+        "type": "Dragon 2.0",
+        "reuse_count": i % 5,
+        "water_landings": i % 4,
+        "land_landings": 0,
+        "last_update": filler(i, 1),
+        "launches": [f"launch{i:06d}"],
+    }
+
+
+def synth_crew(i: int) -> Dict[str, Any]:
+    return {
+        "id": f"crew{i:04d}",
+        "name": f"Astronaut {i}",
+        "agency": "NASA" if i % 3 else "ESA",
+        "status": "active",
+        "launches": [f"launch{i:06d}"],
+        "image": f"https://imgur.com/{i}.png",
+        "wikipedia": f"https://en.wikipedia.org/wiki/Astronaut_{i}",
+    }
+
+
+def synth_payload(i: int) -> Dict[str, Any]:
+    return {
+        "id": f"payload{i:06d}",
+        "name": f"Payload {i}",
+        "type": "Satellite",
+        "mass_kg": 500 + i % 5000,
+        "orbit": "LEO" if i % 3 else "GTO",
+        "customers": [f"Customer {i % 40}"],
+        "manufacturers": ["SpaceX"],
+        "nationalities": ["United States"],
+        "norad_ids": [40000 + i],
+        "semi_major_axis_km": 6900.0,
+        "eccentricity": 0.0001,
+        "inclination_deg": 53.0,
+    }
+
+
+def synth_starlink(i: int) -> Dict[str, Any]:
+    epoch = date(2019, 5, 24) + timedelta(days=i % 1800)
+    return {
+        "id": f"starlink{i:06d}",
+        "version": "v1.0",
+        "launch": f"launch{i // 60:06d}",
+        "longitude": round((i * 13.7) % 360 - 180, 3),
+        "latitude": round((i * 7.3) % 106 - 53, 3),
+        "height_km": 540 + i % 30,
+        "velocity_kms": 7.59,
+        "spaceTrack": {
+            "OBJECT_NAME": f"STARLINK-{i}",
+            "OBJECT_ID": f"2019-029{chr(65 + i % 26)}",
+            "EPOCH": f"{epoch.isoformat()}T{i % 24:02d}:00:00",
+            "LAUNCH_DATE": (epoch - timedelta(days=30)).isoformat(),
+            "MEAN_MOTION": 15.06,
+            "ECCENTRICITY": 0.0001,
+            "INCLINATION": 53.0,
+            "RA_OF_ASC_NODE": 120.0,
+            "ARG_OF_PERICENTER": 90.0,
+            "MEAN_ANOMALY": 270.0,
+            "NORAD_CAT_ID": 44000 + i,
+            "TLE_LINE1": "1 44235U 19029A   21" + "0" * 50,
+            "TLE_LINE2": "2 44235  53.0 " + "0" * 50,
+        },
+    }
+
+
+SPACEX_SYNTHESIZERS: Dict[str, Callable[[int], Dict[str, Any]]] = {
+    "launches": synth_launch,
+    "rockets": synth_rocket,
+    "capsules": synth_capsule,
+    "crew": synth_crew,
+    "payloads": synth_payload,
+    "starlink": synth_starlink,
+}
+
+# Fields that must stay unique when an item is built from a recorded template
+UNIQUE_FIELDS = {
+    "apod": ["date", "title"],
+    "neo": ["id", "name"],
+    "techport": ["projectId"],
+    "launches": ["id", "name", "date_utc", "flight_number", "upcoming"],
+    "rockets": ["id", "name"],
+    "capsules": ["id", "serial"],
+    "crew": ["id", "name"],
+    "payloads": ["id", "name"],
+    "starlink": ["id", "spaceTrack"],
+}
+
+# Recorded request URL -> collection, and where its items live in the body
+RECORDED_ENDPOINTS = [
+    (re.compile(r"/planetary/apod"), "apod", None),
+    (re.compile(r"/neo/rest/v1/neo/browse"), "neo", "near_earth_objects"),
+    (re.compile(r"/techport/api/projects/\d+"), "techport", "project"),
+    (re.compile(r"/v4/(launches|rockets|capsules|crew|payloads|starlink)/query"), None, "docs"),
+    (re.compile(r"/v4/(launches|rockets|capsules|crew|payloads|starlink)$"), None, None),
+]
+
+
+def load_recorded_templates(cache_dir: str) -> Dict[str, List[Dict[str, Any]]]:
+    """Collect recorded items per collection from an HTTP response cache directory."""
+    templates: Dict[str, List[Dict[str, Any]]] = {}
+    root = Path(cache_dir)
+    for index_path in (root / "index").glob("*.json"):
+        with open(index_path, "r") as f:
+            entry = json.load(f)
+        for pattern, collection, items_key in RECORDED_ENDPOINTS:
+            match = pattern.search(entry["url"])
+            if not match:
+                continue
+            collection = collection or match.group(1)
+            object_path = root / "objects" / entry["content_hash"][:2] / entry["content_hash"]
+            try:
+                with open(object_path, "rb") as f:
+                    body = json.loads(f.read())
+            except (OSError, ValueError):
+                break
+            items = body.get(items_key) if items_key and isinstance(body, dict) else body
+            if isinstance(items, dict):
+                items = [items]
+            if isinstance(items, list):
+                templates.setdefault(collection, []).extend(item for item in items if isinstance(item, dict))
+            break
+    return templates
+
+
+def project(doc: Dict[str, Any], select: Optional[List[str]]) -> Dict[str, Any]:
+    """Apply a v4 query ``select`` projection (dotted paths supported)."""
+    if not select:
+        return doc
+    result: Dict[str, Any] = {"id": doc.get("id")}
+    for path in select:
+        source, target = doc, result
+        parts = path.split(".")
+        for part in parts[:-1]:
+            source = source.get(part) if isinstance(source, dict) else None
+            target = target.setdefault(part, {})
+        if isinstance(source, dict) and parts[-1] in source:
+            target[parts[-1]] = source[parts[-1]]
+    return result
+
+
+def lookup(doc: Dict[str, Any], path: str) -> Any:
+    for part in path.split("."):
+        doc = doc.get(part) if isinstance(doc, dict) else None
+    return doc
+
+
+def sort_docs(docs: List[Dict[str, Any]], sort: Optional[Dict[str, str]]) -> List[Dict[str, Any]]:
+    """Apply a v4 query ``sort`` (``{path: "asc" | "desc"}``); missing values sort first, as in MongoDB."""
+    for path, direction in reversed(list((sort or {}).items())):
+        docs = sorted(
+            docs,
+            key=lambda doc: (lookup(doc, path) is not None, lookup(doc, path)),
+            reverse=str(direction).lower() in ("desc", "descending", "-1"),
+        )
+    return docs
+
+
+def matches(doc: Dict[str, Any], query: Dict[str, Any]) -> bool:
+    """Evaluate the subset of MongoDB query syntax the fetchers send."""
+    for key, condition in query.items():
+        if key == "$and":
+            if not all(matches(doc, sub) for sub in condition):
+                return False
+        elif key == "$or":
+            if not any(matches(doc, sub) for sub in condition):
+                return False
+        elif isinstance(condition, dict):
+            value = lookup(doc, key)
+            for op, operand in condition.items():
+                if value is None:
+                    return False
+                if op == "$gt" and not value > operand:
+                    return False
+                if op == "$gte" and not value >= operand:
+                    return False
+                if op == "$lt" and not value < operand:
+                    return False
+                if op == "$lte" and not value <= operand:
+                    return False
+        elif lookup(doc, key) != condition:
+            return False
+    return True
+
+
+class UpstreamSimulator:
+    """aiohttp application standing in for every upstream API the fetchers call."""
+
+    def __init__(
+        self,
+        latency_ms: float = 0.0,
+        jitter_ms: float = 0.0,
+        error_rate: float = 0.0,
+        sizes: Optional[Dict[str, int]] = None,
+        templates: Optional[Dict[str, List[Dict[str, Any]]]] = None,
+        seed: int = 42,
+    ):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.sizes = {**DEFAULT_SIZES, **(sizes or {})}
+        self.templates = templates or {}
+        self.random = random.Random(seed)
+        self.requests: Counter = Counter()
+        self._collections: Dict[str, List[Dict[str, Any]]] = {}
+        self._exoplanets: Optional[pd.DataFrame] = None
+
+    def collection(self, name: str, synthesize: Callable[[int], Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Build (once) the items of a collection, from recorded templates when available."""
+        if name not in self._collections:
+            templates = self.templates.get(name)
+            items = []
+            for i in range(self.sizes[name]):
+                item = synthesize(i)
+                if templates:
+                    template = templates[i % len(templates)]
+                    item = {**template, **{field: item[field] for field in UNIQUE_FIELDS.get(name, []) if field in item}}
+                items.append(item)
+            self._collections[name] = items
+        return self._collections[name]
+
+    def exoplanets(self) -> pd.DataFrame:
+        if self._exoplanets is None:
+            self._exoplanets = pd.DataFrame([synth_exoplanet(i) for i in range(self.sizes["exoplanets"])])
+        return self._exoplanets
+
+    @web.middleware
+    async def middleware(self, request: web.Request, handler):
+        self.requests[request.match_info.route.resource.canonical if request.match_info.route.resource else "?"] += 1
+        if self.latency_ms or self.jitter_ms:
+            delay = max(0.0, self.random.gauss(self.latency_ms, self.jitter_ms)) / 1000
+            await asyncio.sleep(delay)
+        if self.error_rate and self.random.random() < self.error_rate:
+            return web.Response(status=503, text="simulated upstream error")
+        return await handler(request)
+
+    async def apod(self, request: web.Request) -> web.Response:
+        items = self.collection("apod", synth_apod)
+        if "start_date" in request.query:
+            start = request.query["start_date"]
+            end = request.query.get("end_date", "9999-12-31")
+            return web.json_response(sorted(
+                (item for item in items if start <= item["date"] <= end), key=lambda item: item["date"]
+            ))
+        count = int(request.query.get("count", 1))
+        return web.json_response(self.random.sample(items, min(count, len(items))))
+
+    async def neo_browse(self, request: web.Request) -> web.Response:
+        return web.json_response({"near_earth_objects": self.collection("neo", synth_neo)})
+
+    async def mars_manifest(self, request: web.Request) -> web.Response:
+        per_sol = self.sizes["mars_photos_per_sol"]
+        return web.json_response({"photo_manifest": {
+            "name": request.match_info["rover"].title(),
+            "max_sol": self.sizes["mars_sols"] - 1,
+            "photos": [{"sol": sol, "total_photos": per_sol} for sol in range(self.sizes["mars_sols"])],
+        }})
+
+    async def mars_photos(self, request: web.Request) -> web.Response:
+        rover = request.match_info["rover"]
+        sol = int(request.query.get("sol", 0))
+        page = int(request.query.get("page", 1))
+        per_sol = self.sizes["mars_photos_per_sol"] if sol < self.sizes["mars_sols"] else 0
+        first = (page - 1) * MARS_PAGE_SIZE
+        base = (ROVERS.index(rover) if rover in ROVERS else 0) * 10_000_000 + sol * per_sol
+        photos = [
+            synth_mars_photo(base + n, rover, sol)
+            for n in range(first, min(first + MARS_PAGE_SIZE, per_sol))
+        ]
+        return web.json_response({"photos": photos})
+
+    async def techport_list(self, request: web.Request) -> web.Response:
+        items = self.collection("techport", synth_techport)
+        return web.json_response({"projects": [
+            {"projectId": item["projectId"], "lastUpdated": "2024-01-01"} for item in items
+        ]})
+
+    async def techport_detail(self, request: web.Request) -> web.Response:
+        items = self.collection("techport", synth_techport)
+        index = int(request.match_info["project_id"]) - 1000
+        if not 0 <= index < len(items):
+            return web.Response(status=404)
+        return web.json_response({"project": items[index]})
+
+    async def tap(self, request: web.Request) -> web.Response:
+        query = request.query.get("query", "")
+        frame = self.exoplanets()
+        if "count(*)" in query:
+            return web.Response(text=f"row_count\n{len(frame)}\n", content_type="text/csv")
+        top = re.search(r"top (\d+)", query)
+        offset = re.search(r"offset (\d+)", query)
+        start = int(offset.group(1)) if offset else 0
+        stop = start + int(top.group(1)) if top else len(frame)
+        return web.Response(text=frame.iloc[start:stop].to_csv(index=False), content_type="text/csv")
+
+    async def spacex_all(self, request: web.Request) -> web.Response:
+        name = request.match_info["collection"]
+        if name not in SPACEX_SYNTHESIZERS:
+            return web.Response(status=404)
+        return web.json_response(self.collection(name, SPACEX_SYNTHESIZERS[name]))
+
+    async def spacex_query(self, request: web.Request) -> web.Response:
+        name = request.match_info["collection"]
+        if name not in SPACEX_SYNTHESIZERS:
+            return web.Response(status=404)
+        body = await request.json()
+        options = body.get("options", {})
+        docs = [doc for doc in self.collection(name, SPACEX_SYNTHESIZERS[name]) if matches(doc, body.get("query") or {})]
+        docs = sort_docs(docs, options.get("sort"))
+
+        if options.get("pagination") is False:
+            limit, page, total_pages = len(docs) or 1, 1, 1
+        else:
+            limit = int(options.get("limit", 10))
+            page = int(options.get("page", 1))
+            total_pages = max(1, math.ceil(len(docs) / limit))
+        page_docs = docs[(page - 1) * limit: page * limit]
+        return web.json_response({
+            "docs": [project(doc, options.get("select")) for doc in page_docs],
+            "totalDocs": len(docs),
+            "limit": limit,
+            "totalPages": total_pages,
+            "page": page,
+            "hasNextPage": page < total_pages,
+        })
+
+    async def stats(self, request: web.Request) -> web.Response:
+        return web.json_response(dict(self.requests))
+
+    def build_app(self) -> web.Application:
+        app = web.Application(middlewares=[self.middleware], client_max_size=16 * 1024 * 1024)
+        app.router.add_get("/__stats", self.stats)
+        app.router.add_get("/planetary/apod", self.apod)
+        app.router.add_get("/neo/rest/v1/neo/browse", self.neo_browse)
+        app.router.add_get("/mars-photos/api/v1/manifests/{rover}", self.mars_manifest)
+        app.router.add_get("/mars-photos/api/v1/rovers/{rover}/photos", self.mars_photos)
+        app.router.add_get("/techport/api/projects", self.techport_list)
+        app.router.add_get("/techport/api/projects/{project_id}", self.techport_detail)
+        app.router.add_get("/TAP/sync", self.tap)
+        app.router.add_get("/v4/{collection}", self.spacex_all)
+        app.router.add_post("/v4/{collection}/query", self.spacex_query)
+        return app
+
+
+async def start_simulator(simulator: UpstreamSimulator, host: str = "127.0.0.1", port: int = 8900) -> web.AppRunner:
+    """Start the simulator in the running event loop."""
+    runner = web.AppRunner(simulator.build_app(), access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, host, port).start()
+    return runner
+
+
+def parse_sizes(values: List[str]) -> Dict[str, int]:
+    """Parse repeated ``name=count`` options."""
+    sizes = {}
+    for value in values:
+        name, _, count = value.partition("=")
+        if name not in DEFAULT_SIZES:
+            raise argparse.ArgumentTypeError(f"Unknown collection '{name}', expected one of {sorted(DEFAULT_SIZES)}")
+        sizes[name] = int(count)
+    return sizes
+
+
+def add_simulator_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Mean added latency per request")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="Standard deviation of the added latency")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with 503")
+    parser.add_argument("--size", action="append", default=[], metavar="NAME=COUNT",
+                        help=f"Collection size override, e.g. starlink=10000 (collections: {', '.join(DEFAULT_SIZES)})")
+    parser.add_argument("--record-dir", help="HTTP cache directory whose recorded responses are used as item templates")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Offline stand-in for the NASA, SpaceX and Exoplanet Archive APIs")
+    add_simulator_arguments(parser)
+    args = parser.parse_args()
+
+    templates = load_recorded_templates(args.record_dir) if args.record_dir else {}
+    simulator = UpstreamSimulator(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        sizes=parse_sizes(args.size),
+        templates=templates,
+    )
+    runner = await start_simulator(simulator, port=args.port)
+    base = f"http://127.0.0.1:{args.port}"
+    print(f"🛰️  Upstream simulator listening on {base}")
+    if templates:
+        print(f"   Recorded templates: {', '.join(f'{name} ({len(items)})' for name, items in templates.items())}")
+    print(f"   NASA_BASE_URL={base}")
+    print(f"   SPACEX_BASE_URL={base}/v4")
+    print(f"   EXOPLANET_TAP_URL={base}/TAP/sync")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await runner.cleanup()
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
@@ -1,10 +1,18 @@
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from dotenv import load_dotenv
+import asyncio
 import os
 import uvicorn
 
+# Load environment variables before app modules read their configuration
+load_dotenv()
+
 from app.api.endpoints import analysis, recommendations, health, chat
+from app.core.http_client import get_http_client, close_http_client
+from app.core.normalization import shutdown_process_pool
+from app.core.record_store import get_record_store
+from app.core.retrieval import get_retrieval_service
 # Import training modules
 try:
     from app.api.endpoints import data_ingestion, model_training
@@ -14,9 +22,6 @@ except ImportError:
     DATA_INGESTION_AVAILABLE = False
     MODEL_TRAINING_AVAILABLE = False
 
-# Load environment variables
-load_dotenv()
-
 # Create FastAPI app
 app = FastAPI(
     title="AI Space Data Explorer - AI Service",
@@ -35,6 +40,32 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.on_event("startup")
+async def startup_http_client():
+    """Open the shared pooled HTTP client used by all upstream fetchers."""
+    await get_http_client().start()
+
+@app.on_event("startup")
+async def startup_record_store():
+    """Open the shared record store (WAL setup and schema) off the event loop."""
+    await asyncio.to_thread(get_record_store)
+
+@app.on_event("startup")
+async def startup_retrieval_service():
+    """Load the embedding model and published embeddings once, before the first query."""
+    app.state.retrieval = get_retrieval_service()
+    await app.state.retrieval.start()
+
+@app.on_event("shutdown")
+async def shutdown_http_client():
+    """Close the shared HTTP client and its keep-alive connections."""
+    await close_http_client()
+
+@app.on_event("shutdown")
+async def shutdown_normalization_pool():
+    """Stop the worker processes used to normalize large ingest batches."""
+    shutdown_process_pool()
+
 # Include routers
 app.include_router(health.router, prefix="/health", tags=["Health"])
 app.include_router(analysis.router, prefix="/api/analysis", tags=["Analysis"])